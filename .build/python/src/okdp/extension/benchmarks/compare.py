@@ -0,0 +1,81 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import sys
+import json
+import argparse
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.2
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """ Relative change of the median: 0.25 means 25% slower """
+        return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+
+    def is_regression(self, threshold: float) -> bool:
+        return self.change > threshold
+
+def compare(baseline: dict, current: dict, stat: str = "median") -> list[Comparison]:
+    """ Compare the benchmarks present in both results """
+    baseline_benchmarks = baseline.get("benchmarks", {})
+    return [Comparison(name, baseline_benchmarks[name][stat], result[stat])
+            for name, result in current.get("benchmarks", {}).items() if name in baseline_benchmarks]
+
+def report(comparisons: list[Comparison], threshold: float) -> str:
+    lines = [f"{'benchmark':<60} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison.is_regression(threshold) else ""
+        lines.append(f"{comparison.name:<60} {comparison.baseline:>10.4f} {comparison.current:>10.4f} {comparison.change:>+8.1%}{flag}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+  logging.basicConfig(level=logging.INFO)
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument(
+        "--baseline",
+        required=True,
+        help="The JSON baseline written by okdp.extension.benchmarks.suite",
+    )
+  arg_parser.add_argument(
+        "--current",
+        required=True,
+        help="The JSON results to compare with the baseline",
+    )
+  arg_parser.add_argument(
+        "--threshold",
+        required=False,
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fail when a benchmark is slower than the baseline by more than this ratio (0.2 = 20%%)",
+    )
+  args = arg_parser.parse_args()
+
+  comparisons = compare(json.loads(Path(args.baseline).read_text()), json.loads(Path(args.current).read_text()))
+  print(report(comparisons, args.threshold))
+  regressions = [comparison.name for comparison in comparisons if comparison.is_regression(args.threshold)]
+  if regressions:
+    LOGGER.error(f"Performance regressions above {args.threshold:.0%}: {regressions}")
+    sys.exit(1)
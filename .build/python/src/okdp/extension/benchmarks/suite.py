@@ -0,0 +1,255 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import gc
+import json
+import time
+import yaml
+import argparse
+import logging
+import platform
+import statistics
+import tempfile
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from types import SimpleNamespace
+
+from okdp.extension.matrix.constants import *
+from okdp.extension.matrix.compatibility_solver import CompatibilitySolver
+from okdp.extension.matrix.utils.matrix_utils import group_on, group_versions_by, ignore_invalid_versions, join_versions, normalize_matrix, normalize_scala_version, remove_duplicates
+from okdp.extension.matrix.version_compatibility_matrix import VersionCompatibilityMatrix
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_ROUNDS = 5
+
+PYTHON_VERSIONS = ["3.9", "3.10", "3.11", "3.12"]
+JAVA_VERSIONS = ["11", "17"]
+SCALA_VERSIONS = ["2.12", "2.13"]
+# Number of combinations of one synthetic compatibility entry per spark version
+COMBINATIONS_PER_SPARK_VERSION = len(PYTHON_VERSIONS) * len(JAVA_VERSIONS) * len(SCALA_VERSIONS)
+
+# Canned outputs of the commands run by the taggers: command -> (seconds, output)
+# The latencies are in the order of magnitude of a docker exec (the JVM based ones are slower)
+CANNED_COMMANDS = {
+    "spark-submit --version": (0.050, "\n".join([
+        "Welcome to",
+        "      ____              __",
+        "     / __/__  ___ _____/ /__",
+        "    _\\ \\/ _ \\/ _ `/ __/  '_/",
+        "   /___/ .__/\\_,_/_/ /_/\\_\\   version 3.5.6",
+        "      /_/",
+        "",
+        "Using Scala version 2.13.8, OpenJDK 64-Bit Server VM, 17.0.16",
+    ])),
+    "java --version": (0.030, "openjdk 17.0.16 2025-07-15"),
+    "python --version": (0.010, "Python 3.11.13"),
+    "jupyterhub --version": (0.015, "5.3.0"),
+    "jupyter-lab --version": (0.015, "4.4.5"),
+    "R --version": (0.020, "R version 4.4.3 (2025-02-28)"),
+    "cat /etc/os-release": (0.005, 'NAME="Ubuntu"\nVERSION_ID="24.04"'),
+}
+
+class FakeContainer:
+    """ A container answering the tagger commands with canned outputs after a canned latency """
+
+    def __init__(self, commands: dict[str, tuple[float, str]] = CANNED_COMMANDS, latency_scale: float = 1.0):
+        self.name = "fake-container"
+        self.commands = commands
+        self.latency_scale = latency_scale
+        self.exec_count = 0
+
+    def exec_run(self, cmd: str) -> SimpleNamespace:
+        self.exec_count += 1
+        for command, (latency, output) in self.commands.items():
+            if command in cmd:
+                time.sleep(latency * self.latency_scale)
+                return SimpleNamespace(exit_code=0, output=output.encode())
+        return SimpleNamespace(exit_code=1, output=f"{cmd}: not found".encode())
+
+def synthetic_compatibility_matrix(combinations: int, spark_versions_per_entry: int = 50) -> list[dict]:
+    """ A normalized compatibility matrix expanding to (at least) the requested number of combinations """
+    spark_versions = [f"{3 + i // 10000}.{i // 100 % 100}.{i % 100}" for i in range(-(-combinations // COMBINATIONS_PER_SPARK_VERSION))]
+    return [{
+        PYTHON_VERSION: PYTHON_VERSIONS,
+        SPARK_VERSION: spark_versions[i:i + spark_versions_per_entry],
+        JAVA_VERSION: JAVA_VERSIONS,
+        SCALA_VERSION: SCALA_VERSIONS,
+        HADOOP_VERSION: ["3"],
+        SPARK_DOWNLOAD_URL: ["https://archive.apache.org/dist/spark/"],
+    } for i in range(0, len(spark_versions), spark_versions_per_entry)]
+
+def matrix_utils_pipeline(compatibility_matrix: list[dict], build_matrix: dict) -> list[dict]:
+    """ The matrix_utils pipeline (before the compatibility solver) """
+    return remove_duplicates(normalize_matrix(ignore_invalid_versions(join_versions(group_versions_by(compatibility_matrix, group_on), build_matrix))))
+
+def solver_pipeline(compatibility_matrix: list[dict], build_matrix: dict) -> list[dict]:
+    """ The indexed compatibility solver used by VersionCompatibilityMatrix """
+    return list(CompatibilitySolver(compatibility_matrix).solve(build_matrix))
+
+@dataclass
+class Benchmark:
+    name: str
+    # Returns the function to time (the setup is not timed)
+    setup: Callable[[], Callable[[], object]]
+    rounds: int = DEFAULT_ROUNDS
+    # Also measure the peak traced memory, in an extra untimed round
+    memory: bool = False
+
+    def run(self) -> dict:
+        timings = []
+        for _ in range(self.rounds):
+            func = self.setup()
+            gc.collect()
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        result = {
+            "rounds": self.rounds,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        }
+        if self.memory:
+            func = self.setup()
+            gc.collect()
+            tracemalloc.start()
+            try:
+                func()
+                (_, peak) = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            result["peak_memory_mb"] = round(peak / 1024 / 1024, 1)
+        return result
+
+@cache
+def _compatibility_matrix(size: int) -> list[dict]:
+    return synthetic_compatibility_matrix(size)
+
+@cache
+def _version_compatibility_matrix(size: int) -> VersionCompatibilityMatrix:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / ".versions.yml"
+        path.write_text(yaml.safe_dump({"compatibility-matrix": _compatibility_matrix(size)}))
+        return VersionCompatibilityMatrix(str(path), "main")
+
+def matrix_benchmarks(sizes: list[int], rounds: int) -> Iterator[Benchmark]:
+    def normalize(size: int) -> Callable[[], object]:
+        (spark_matrix, _) = _version_compatibility_matrix(size).generate_matrix()
+        return lambda: normalize_scala_version(spark_matrix)
+
+    def pipeline(func: Callable[[list[dict], dict], list[dict]], size: int) -> Callable[[], Callable[[], object]]:
+        return lambda: (lambda: func(_compatibility_matrix(size), {}))
+
+    for size in sizes:
+        yield Benchmark(f"matrix.generate_matrix[{size}]", lambda size=size: _version_compatibility_matrix(size).generate_matrix, rounds)
+        yield Benchmark(f"matrix.normalize_scala_version[{size}]", lambda size=size: normalize(size), rounds)
+        yield Benchmark(f"matrix.solver[{size}]", pipeline(solver_pipeline, size), rounds, memory=True)
+        yield Benchmark(f"matrix.matrix_utils[{size}]", pipeline(matrix_utils_pipeline, size), rounds, memory=True)
+
+def tagging_benchmarks(rounds: int, latency_scale: float) -> Iterator[Benchmark]:
+    # The tagging modules create a docker client when imported
+    from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+    from okdp.extension.tagging.images_hierarchy import ALL_IMAGES
+    from okdp.extension.tagging.taggers import _get_program_version
+    from okdp.extension.tagging.tag_plan_compiler import CompiledTagPlan
+
+    def resolve_all_images() -> None:
+        for image in ALL_IMAGES:
+            get_taggers_and_manifests(image)
+
+    def tag_values(image: str) -> Callable[[], Callable[[], object]]:
+        # The commit sha taggers run git on the host, not in the container
+        (taggers, _) = get_taggers_and_manifests(image)
+        taggers = [tagger for tagger in taggers if "commit_sha_tagger" not in map(lambda t: t.__name__, tagger.taggers)]
+        def setup() -> Callable[[], object]:
+            # A new container per round: the program versions are memoized per container
+            container = FakeContainer(latency_scale=latency_scale)
+            return lambda: [tagger.tag_value(container) for tagger in taggers]
+        return setup
+
+    def compiled_tag_values(image: str) -> Callable[[], Callable[[], object]]:
+        (taggers, _) = get_taggers_and_manifests(image)
+        plan = CompiledTagPlan.compile([tagger for tagger in taggers if "commit_sha_tagger" not in map(lambda t: t.__name__, tagger.taggers)])
+        def setup() -> Callable[[], object]:
+            container = FakeContainer(latency_scale=latency_scale)
+            return lambda: plan.evaluate(container)
+        return setup
+
+    yield Benchmark("tagging.get_taggers_and_manifests", lambda: resolve_all_images, rounds)
+    yield Benchmark("tagging.LongTagger.tag_value[pyspark-notebook]", tag_values("pyspark-notebook"), rounds)
+    yield Benchmark("tagging.LongTagger.tag_value[all-spark-notebook]", tag_values("all-spark-notebook"), rounds)
+    yield Benchmark("tagging.CompiledTagPlan.evaluate[pyspark-notebook]", compiled_tag_values("pyspark-notebook"), rounds)
+    _get_program_version.cache_clear()
+
+def run_suite(sizes: list[int] = DEFAULT_SIZES, rounds: int = DEFAULT_ROUNDS, latency_scale: float = 1.0, benchmark_filter: str = "") -> dict:
+    """ Run the benchmarks whose name contains benchmark_filter """
+    results = {}
+    for benchmark in [*matrix_benchmarks(sizes, rounds), *tagging_benchmarks(rounds, latency_scale)]:
+        if benchmark_filter in benchmark.name:
+            LOGGER.info(f"Running benchmark: {benchmark.name}")
+            results[benchmark.name] = benchmark.run()
+    _version_compatibility_matrix.cache_clear()
+    _compatibility_matrix.cache_clear()
+    return {
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "benchmarks": results,
+    }
+
+if __name__ == "__main__":
+  logging.basicConfig(level=logging.INFO)
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument(
+        "--output",
+        required=True,
+        help="The JSON results file (ex.: the baseline)",
+    )
+  arg_parser.add_argument(
+        "--sizes",
+        required=False,
+        nargs="*",
+        type=int,
+        default=DEFAULT_SIZES,
+        help="The number of combinations of the synthetic compatibility matrices",
+    )
+  arg_parser.add_argument(
+        "--rounds",
+        required=False,
+        type=int,
+        default=DEFAULT_ROUNDS,
+        help="The number of timed runs per benchmark",
+    )
+  arg_parser.add_argument(
+        "--latency-scale",
+        required=False,
+        type=float,
+        default=1.0,
+        help="Scale the canned command latencies of the fake container",
+    )
+  arg_parser.add_argument(
+        "--filter",
+        required=False,
+        default="",
+        help="Only run the benchmarks whose name contains the filter",
+    )
+  args = arg_parser.parse_args()
+
+  results = run_suite(args.sizes, args.rounds, args.latency_scale, args.filter)
+  Path(args.output).write_text(json.dumps(results, indent=2))
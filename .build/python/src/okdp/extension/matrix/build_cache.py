@@ -0,0 +1,143 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import argparse
+import hashlib
+import json
+import logging
+from pathlib import Path
+from okdp.extension.matrix.constants import *
+from okdp.extension.matrix.delta_matrix import BASE_IMAGES, DATASCIENCE_IMAGES, SPARK_IMAGES, image_dirs
+
+LOGGER = logging.getLogger(__name__)
+
+# Annotation holding the build fingerprint in the OCI image layout index
+FINGERPRINT_ANNOTATION = "org.okdp.build.fingerprint"
+
+# Row fields which are not build inputs (the dev tags depend on the git branch)
+NON_INPUT_FIELDS = (SPARK_DEV_TAG, PYTHON_DEV_TAG, FINGERPRINT, SKIP, DIGEST)
+
+PYTHON_BUILD_INPUTS = image_dirs(BASE_IMAGES + DATASCIENCE_IMAGES)
+SPARK_BUILD_INPUTS = image_dirs(SPARK_IMAGES)
+
+def hash_inputs(repository_root: Path, paths: list[str]) -> dict[str, str]:
+    """ sha256 of every file found under the paths (missing paths are ignored) """
+    digests = {}
+    for path in paths:
+        root = repository_root / path
+        files = sorted(root.rglob("*")) if root.is_dir() else [root] if root.is_file() else []
+        for file in files:
+            if file.is_file():
+                digests[file.relative_to(repository_root).as_posix()] = hashlib.sha256(file.read_bytes()).hexdigest()
+    return digests
+
+def row_fingerprint(row: dict, inputs: dict[str, str], parent_digest: str) -> str:
+    """ Content address of a matrix row: its versions, the files it consumes and its parent image """
+    payload = {
+        "versions": {k: v for k, v in row.items() if k not in NON_INPUT_FIELDS},
+        "inputs": inputs,
+        "parent": parent_digest,
+    }
+    return "sha256:" + hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class BuildCacheIndex:
+    """ fingerprint -> pushed image digest
+
+        The index is loaded either from a json file ({"<fingerprint>": "<digest>"}) or
+        from an OCI image layout directory whose index.json manifests are annotated with
+        the build fingerprint (local registry stand-in).
+    """
+
+    def __init__(self, digests: dict[str, str] | None = None):
+        self.digests = digests if digests else {}
+
+    @staticmethod
+    def load(location: str) -> "BuildCacheIndex":
+        path = Path(location)
+        if path.is_dir():
+            with open(path / "index.json", "r") as file:
+                manifests = json.load(file).get("manifests", [])
+            return BuildCacheIndex({
+                m["annotations"][FINGERPRINT_ANNOTATION]: m["digest"]
+                for m in manifests if FINGERPRINT_ANNOTATION in m.get("annotations", {})
+            })
+        if path.is_file():
+            with open(path, "r") as file:
+                return BuildCacheIndex(json.load(file))
+        LOGGER.info(f"Build cache index {location} not found, starting with an empty index")
+        return BuildCacheIndex()
+
+    def save(self, location: str) -> None:
+        with open(location, "w") as file:
+            json.dump(self.digests, file, indent=2, sort_keys=True)
+
+    def get(self, fingerprint: str) -> str | None:
+        return self.digests.get(fingerprint)
+
+    def record(self, fingerprint: str, digest: str) -> None:
+        self.digests[fingerprint] = digest
+
+class BuildCache:
+    """ Mark the matrix rows whose fingerprint was already built and pushed """
+
+    def __init__(self, index: BuildCacheIndex, repository_root: Path, base_image_digest: str = ""):
+        self.index = index
+        self.base_image_digest = base_image_digest
+        self.python_inputs = hash_inputs(repository_root, PYTHON_BUILD_INPUTS)
+        self.spark_inputs = hash_inputs(repository_root, SPARK_BUILD_INPUTS)
+
+    def annotate(self, spark_matrix: list[dict], python_matrix: list[dict]) -> None:
+        """ Add fingerprint/skip/digest to every row
+            The spark images are built on top of their python image: the python row fingerprint
+            stands for the parent digest, as it is known before the parent is built
+        """
+        python_fingerprints = {}
+        for row in python_matrix:
+            fingerprint = row_fingerprint(row, self.python_inputs, self.base_image_digest)
+            python_fingerprints[row.get(PYTHON_DEV_TAG)] = fingerprint
+            self._mark(row, fingerprint)
+        for row in spark_matrix:
+            parent_digest = python_fingerprints.get(row.get(PYTHON_DEV_TAG), "")
+            self._mark(row, row_fingerprint(row, self.spark_inputs, parent_digest))
+
+    def _mark(self, row: dict, fingerprint: str) -> None:
+        digest = self.index.get(fingerprint)
+        row |= {FINGERPRINT: fingerprint, SKIP: digest is not None, DIGEST: digest if digest else ""}
+
+if __name__ == "__main__":
+
+  logging.basicConfig(level=logging.INFO)
+  arg_parser = argparse.ArgumentParser(description="Record a pushed image digest into the build cache index")
+  arg_parser.add_argument(
+      "--build-cache-index",
+      required=True,
+      help="The build cache index (json file)",
+  )
+  arg_parser.add_argument(
+      "--fingerprint",
+      required=True,
+      help="The matrix row fingerprint",
+  )
+  arg_parser.add_argument(
+      "--digest",
+      required=True,
+      help="The pushed image digest",
+  )
+  args = arg_parser.parse_args()
+  index = BuildCacheIndex.load(args.build_cache_index)
+  index.record(args.fingerprint, args.digest)
+  index.save(args.build_cache_index)
+  LOGGER.info(f"Recorded {args.fingerprint} -> {args.digest} into {args.build_cache_index}")
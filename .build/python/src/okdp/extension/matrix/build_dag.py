@@ -0,0 +1,155 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from okdp.extension.matrix.constants import *
+from okdp.extension.matrix.job_packer import history_key
+
+BASE_STAGE = "base"
+DATASCIENCE_STAGE = "datascience"
+SPARK_STAGE = "spark"
+
+# (image, parent image, stage) built for every python version
+# c.f. .github/workflows/build-base-images-template.yml and build-datascience-images-template.yml
+PYTHON_IMAGES = [
+    ("docker-stacks-foundation", None, BASE_STAGE),
+    ("base-notebook", "docker-stacks-foundation", BASE_STAGE),
+    ("minimal-notebook", "base-notebook", BASE_STAGE),
+    ("scipy-notebook", "minimal-notebook", BASE_STAGE),
+    ("r-notebook", "minimal-notebook", DATASCIENCE_STAGE),
+    ("datascience-notebook", "scipy-notebook", DATASCIENCE_STAGE),
+]
+# (image, parent image) built for every spark combination on top of scipy-notebook
+# c.f. .github/workflows/build-spark-images-template.yml
+SPARK_IMAGES = [
+    ("pyspark-notebook", "scipy-notebook"),
+    ("all-spark-notebook", "pyspark-notebook"),
+]
+
+@dataclass
+class BuildNode:
+    id: str
+    image: str
+    stage: str
+    # Branch independent key of the build job of the node, used to look up its duration (c.f. BuildHistory)
+    key: str
+    parent: str | None = None
+    build_args: dict = field(default_factory=dict)
+    level: int = 0
+
+@dataclass(frozen=True)
+class BuildEdge:
+    parent: str
+    child: str
+    stage: str
+    # The parent image is passed to the child build as BASE_IMAGE build-arg
+    build_arg: str = "BASE_IMAGE"
+
+class BuildDag:
+    """ The image builds of the matrix and their parent -> child dependencies
+
+        The python rows produce the base and datascience images per python version,
+        the spark rows produce the pyspark/all-spark images on top of their python
+        scipy-notebook image (linked through python_dev_tag).
+    """
+
+    def __init__(self, spark_matrix: list[dict], python_matrix: list[dict]):
+        self.nodes: dict[str, BuildNode] = {}
+        for row in python_matrix:
+            python_dev_tag = row.get(PYTHON_DEV_TAG)
+            for image, parent, stage in PYTHON_IMAGES:
+                self._add(BuildNode(
+                    id=f"{image}:{python_dev_tag}",
+                    image=image,
+                    stage=stage,
+                    key=f"{stage}-python{row.get(PYTHON_VERSION)}",
+                    parent=f"{parent}:{python_dev_tag}" if parent else None,
+                    build_args={"PYTHON_VERSION": row.get(PYTHON_VERSION)} if parent is None else {},
+                ))
+        for row in spark_matrix:
+            spark_dev_tag = row.get(SPARK_DEV_TAG)
+            for image, parent in SPARK_IMAGES:
+                parent_tag = row.get(PYTHON_DEV_TAG) if parent == "scipy-notebook" else spark_dev_tag
+                self._add(BuildNode(
+                    id=f"{image}:{spark_dev_tag}",
+                    image=image,
+                    stage=SPARK_STAGE,
+                    key=history_key(row),
+                    parent=f"{parent}:{parent_tag}",
+                    build_args=self.spark_build_args(row) if image == "pyspark-notebook" else {},
+                ))
+        # A parent outside of the dag was already built (ex.: unchanged python image in delta mode)
+        self.edges = [BuildEdge(node.parent, node.id, node.stage) for node in self.nodes.values() if node.parent in self.nodes]
+        for node in self.nodes.values():
+            node.level = self._level(node)
+
+    @staticmethod
+    def spark_build_args(row: dict) -> dict:
+        return {
+            "spark_download_url": row.get(SPARK_DOWNLOAD_URL),
+            "spark_version": row.get(SPARK_VERSION),
+            "openjdk_version": row.get(JAVA_VERSION),
+            "scala_version": row.get(SCALA_VERSION),
+            "hadoop_version": row.get(HADOOP_VERSION),
+        }
+
+    def _add(self, node: BuildNode) -> None:
+        self.nodes.setdefault(node.id, node)
+
+    def _level(self, node: BuildNode) -> int:
+        level = 0
+        while node.parent in self.nodes:
+            node = self.nodes[node.parent]
+            level += 1
+        return level
+
+    def levels(self) -> list[dict]:
+        """ The nodes per level: every node of a level can be built in parallel once the previous level is done """
+        levels: dict[int, list[str]] = {}
+        for node in self.nodes.values():
+            levels.setdefault(node.level, []).append(node.id)
+        return [{"level": level, "parallelism": len(levels[level]), "nodes": levels[level]} for level in sorted(levels)]
+
+    def critical_path(self, durations: dict[str, float] | None = None, default_duration: float = 1.0) -> dict:
+        """ The longest chain of dependent builds
+            durations: the build job durations by node key (default_duration when missing), split evenly
+            over the images built by the job:
+            * spark nodes: the spark job of the row, keyed by history_key as recorded in BuildHistory
+            * python nodes: the base or datascience job of the python version (ex.: base-python3.11),
+              not recorded in BuildHistory (spark rows only) so default_duration unless given
+        """
+        durations = durations if durations else {}
+        images_per_job = Counter(node.key for node in self.nodes.values())
+        finish: dict[str, float] = {}
+        for node in sorted(self.nodes.values(), key=lambda n: n.level):
+            start = finish.get(node.parent, 0.0)
+            finish[node.id] = start + durations.get(node.key, default_duration) / images_per_job[node.key]
+        if not finish:
+            return {"nodes": [], "duration": 0.0}
+
+        path = [max(finish, key=finish.get)]
+        while self.nodes[path[-1]].parent in self.nodes:
+            path.append(self.nodes[path[-1]].parent)
+        return {"nodes": list(reversed(path)), "duration": round(finish[path[0]], 1)}
+
+    def to_dict(self, durations: dict[str, float] | None = None, default_duration: float = 1.0) -> dict:
+        return {
+            "nodes": [asdict(node) for node in self.nodes.values()],
+            "edges": [asdict(edge) for edge in self.edges],
+            "levels": self.levels(),
+            "critical_path": self.critical_path(durations, default_duration),
+        }
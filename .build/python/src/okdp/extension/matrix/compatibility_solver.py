@@ -0,0 +1,87 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections.abc import Callable, Iterator
+import itertools
+from okdp.extension.matrix.constants import *
+from okdp.extension.matrix.utils.matrix_utils import group_on as default_group_on
+
+# Axes that must resolve to at least one value for a combination to be buildable
+REQUIRED_AXES = (SPARK_VERSION, JAVA_VERSION, SCALA_VERSION, HADOOP_VERSION, SPARK_DOWNLOAD_URL)
+
+class CompatibilitySolver:
+    """ Enumerate the valid version combinations of a compatibility matrix
+
+        The compatibility entries are indexed once per axis (value -> bitmask of the entries
+        containing that value). Solving a build-matrix intersects the per-axis masks to find the
+        candidate entries, and only those entries are expanded, lazily, into matrix rows.
+
+        The result is the same as the list passes group_versions_by -> join_versions ->
+        ignore_invalid_versions -> normalize_matrix, except that the values of the
+        constrained axes keep the compatibility-matrix order instead of a set order.
+    """
+
+    def __init__(self, compatibility_matrix: list[dict], group_on: Callable = default_group_on):
+        self.entries = sorted(compatibility_matrix, key=group_on)
+        self.all_entries = (1 << len(self.entries)) - 1
+        self.index: dict[str, dict[str, int]] = {}
+        self.present: dict[str, int] = {}
+        for position, entry in enumerate(self.entries):
+            bit = 1 << position
+            for axis, values in entry.items():
+                axis_index = self.index.setdefault(axis, {})
+                self.present[axis] = self.present.get(axis, 0) | bit
+                for value in values:
+                    axis_index[value] = axis_index.get(value, 0) | bit
+
+    def candidates(self, build_matrix: dict) -> int:
+        """ Bitmask of the entries compatible with every axis of the build matrix
+            An entry without a constrained axis is kept: it inherits the build matrix values
+        """
+        mask = self.all_entries
+        for axis, values in build_matrix.items():
+            axis_index = self.index.get(axis, {})
+            axis_mask = self.all_entries & ~self.present.get(axis, 0)
+            for value in values:
+                axis_mask |= axis_index.get(value, 0)
+            mask &= axis_mask
+            if not mask:
+                break
+        return mask
+
+    def solve(self, build_matrix: dict) -> Iterator[dict]:
+        """ Lazily yield one row per valid combination, in compatibility-matrix order """
+        allowed = {axis: set(values) for axis, values in build_matrix.items()}
+        mask = self.candidates(build_matrix)
+        while mask:
+            lowest = mask & -mask
+            mask ^= lowest
+            yield from self._expand(self.entries[lowest.bit_length() - 1], build_matrix, allowed)
+
+    def _expand(self, entry: dict, build_matrix: dict, allowed: dict[str, set]) -> Iterator[dict]:
+        axes = {}
+        for axis, values in entry.items():
+            if axis in allowed:
+                values = [v for v in dict.fromkeys(values) if v in allowed[axis]]
+            axes[axis] = values
+        for axis, values in build_matrix.items():
+            axes.setdefault(axis, values)
+
+        if not all(axes.get(axis) for axis in REQUIRED_AXES):
+            return
+        keys = tuple(axes.keys())
+        for combination in itertools.product(*axes.values()):
+            yield dict(zip(keys, combination))
@@ -24,3 +24,6 @@ SPARK_DOWNLOAD_URL = "spark_download_url"
 SPARK_DEV_TAG = "spark_dev_tag"
 PYTHON_DEV_TAG = "python_dev_tag"
 
+FINGERPRINT = "fingerprint"
+SKIP = "skip"
+DIGEST = "digest"
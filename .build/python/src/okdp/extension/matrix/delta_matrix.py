@@ -0,0 +1,77 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from dataclasses import dataclass, field
+
+# Images built by the python stage (build-base) and used as parents by the spark images
+BASE_IMAGES = ("docker-stacks-foundation", "base-notebook", "minimal-notebook", "scipy-notebook")
+# Images built by the python stage (build-datascience) only
+DATASCIENCE_IMAGES = ("r-notebook", "datascience-notebook")
+# Images built by the spark stage (build-spark)
+SPARK_IMAGES = ("pyspark-notebook", "all-spark-notebook")
+
+@dataclass(frozen=True)
+class DeltaMatrix:
+    """ The rows to (re)build and the rows whose inputs did not change (re-tag only) """
+    spark: list[dict] = field(default_factory=list)
+    python: list[dict] = field(default_factory=list)
+    spark_unchanged: list[dict] = field(default_factory=list)
+    python_unchanged: list[dict] = field(default_factory=list)
+
+def image_dirs(images: tuple[str, ...]) -> list[str]:
+    """ The directories an image is built from: upstream sources, okdp patchs and okdp override layer """
+    dirs = []
+    for image in images:
+        dirs += [f"docker-stacks/images/{image}", f".build/python/src/okdp/patch/images/{image}", image]
+    return dirs
+
+def touches_images(changed_paths: list[str], images: tuple[str, ...]) -> bool:
+    """ Whether a changed path belongs to one of the directories the images are built from
+        Ex.: pyspark-notebook/requirements.txt, docker-stacks/images/pyspark-notebook/Dockerfile
+        or .build/python/src/okdp/patch/images/pyspark-notebook/setup_spark.py
+    """
+    prefixes = tuple(f"{directory}/" for directory in image_dirs(images))
+    return any(path.removeprefix("./").startswith(prefixes) for path in changed_paths)
+
+def row_key(row: dict) -> tuple:
+    return tuple(sorted(row.items()))
+
+def split_rows(rows: list[dict], previous_rows: list[dict], rebuild_all: bool) -> tuple[list[dict], list[dict]]:
+    """ Split the rows into (changed, unchanged) compared to the previous rows """
+    if rebuild_all:
+        return rows, []
+    previous_keys = {row_key(row) for row in previous_rows}
+    changed, unchanged = [], []
+    for row in rows:
+        (unchanged if row_key(row) in previous_keys else changed).append(row)
+    return changed, unchanged
+
+def diff_matrices(spark_matrix: list[dict], python_matrix: list[dict],
+                  previous_spark_matrix: list[dict], previous_python_matrix: list[dict],
+                  changed_paths: list[str]) -> DeltaMatrix:
+    """ Keep only the combinations whose inputs changed since the previous revision
+
+        A row is changed when it is new or when one of its versions or its spark_download_url changed.
+        Touching a base image rebuilds everything, a datascience image the python rows
+        and a spark image the spark rows.
+    """
+    base_changed = touches_images(changed_paths, BASE_IMAGES)
+    python_changed = base_changed or touches_images(changed_paths, DATASCIENCE_IMAGES)
+    spark_changed = base_changed or touches_images(changed_paths, SPARK_IMAGES)
+
+    spark, spark_unchanged = split_rows(spark_matrix, previous_spark_matrix, spark_changed)
+    python, python_unchanged = split_rows(python_matrix, previous_python_matrix, python_changed)
+    return DeltaMatrix(spark=spark, python=python, spark_unchanged=spark_unchanged, python_unchanged=python_unchanged)
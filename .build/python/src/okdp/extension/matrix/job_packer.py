@@ -0,0 +1,116 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import heapq
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from okdp.extension.matrix.constants import *
+
+LOGGER = logging.getLogger(__name__)
+
+# https://docs.github.com/en/actions/using-jobs/using-a-matrix-for-your-jobs
+# A matrix can generate a maximum of 256 jobs per workflow run
+GITHUB_MAX_MATRIX_JOBS = 256
+# Estimated duration (seconds) of a combination never built before, when the history is empty
+DEFAULT_BUILD_DURATION = 1800.0
+
+def history_key(row: dict) -> str:
+    """ Branch independent key of a spark row. Ex.: spark3.5.6-python3.11-java17-scala2.13
+        The scala version is blank for the default dist (c.f. normalize_scala_version): 2.12 before spark 4, 2.13 since
+    """
+    spark_major = int(row.get(SPARK_VERSION).split(".")[0]) if row.get(SPARK_VERSION) else 0
+    scala_version = row.get(SCALA_VERSION) if row.get(SCALA_VERSION) else "2.13" if spark_major >= 4 else "2.12"
+    return f"spark{row.get(SPARK_VERSION)}-python{row.get(PYTHON_VERSION)}-java{row.get(JAVA_VERSION)}-scala{scala_version}"
+
+class BuildHistory:
+    """ Historical build durations (seconds) per matrix row
+
+        Loaded either from a json file: {"spark3.5.6-python3.11-java17-scala2.13": 1520.0, ...}
+        or from a SQLite database with a build_durations(row_key, duration) table.
+        Several durations for the same row are averaged.
+    """
+
+    def __init__(self, durations: dict[str, float] | None = None):
+        self.durations = durations if durations else {}
+        self.mean_duration = sum(self.durations.values()) / len(self.durations) if self.durations else DEFAULT_BUILD_DURATION
+
+    @staticmethod
+    def load(location: str) -> "BuildHistory":
+        path = Path(location)
+        if not path.is_file():
+            LOGGER.info(f"Build history {location} not found, using the default build duration")
+            return BuildHistory()
+        if path.suffix in (".db", ".sqlite", ".sqlite3"):
+            with closing(sqlite3.connect(path)) as connection:
+                rows = connection.execute("SELECT row_key, AVG(duration) FROM build_durations GROUP BY row_key").fetchall()
+            return BuildHistory({key: float(duration) for key, duration in rows})
+        with open(path, "r") as file:
+            return BuildHistory({key: float(duration) for key, duration in json.load(file).items()})
+
+    def estimate(self, row: dict) -> float:
+        """ The row duration, or the mean known duration for a new combination """
+        return self.durations.get(history_key(row), self.mean_duration)
+
+@dataclass
+class Shard:
+    index: int
+    rows: list[dict] = field(default_factory=list)
+    duration: float = 0.0
+
+    def to_matrix(self) -> dict:
+        return {"shard": self.index, "rows": self.rows, "expected_duration": round(self.duration, 1)}
+
+def pack_rows(rows: list[dict], history: BuildHistory, shards: int | None = None,
+              max_jobs: int = GITHUB_MAX_MATRIX_JOBS) -> list[Shard]:
+    """ Balance the rows over the shards (longest processing time first)
+
+        Each row goes, from the longest to the shortest, to the least loaded shard.
+        By default, there is one shard per row up to max_jobs.
+    """
+    if max_jobs < 1:
+        raise ValueError(f"The job ceiling must be positive, got {max_jobs}")
+    nb_shards = min(shards if shards else len(rows), max_jobs, len(rows))
+    if nb_shards < 1:
+        return []
+
+    result = [Shard(index) for index in range(nb_shards)]
+    loads = [(0.0, index) for index in range(nb_shards)]
+    estimated = sorted(((history.estimate(row), position, row) for position, row in enumerate(rows)),
+                       key=lambda e: (-e[0], e[1]))
+    for duration, _, row in estimated:
+        load, index = heapq.heappop(loads)
+        result[index].rows.append(row)
+        result[index].duration = load + duration
+        heapq.heappush(loads, (load + duration, index))
+    return result
+
+def makespan_report(shards: list[Shard], history: BuildHistory) -> dict:
+    """ Expected end-to-end time of the spark stage compared to its lower bound """
+    durations = [history.estimate(row) for shard in shards for row in shard.rows]
+    total = sum(durations)
+    lower_bound = max(total / len(shards), max(durations)) if shards else 0.0
+    return {
+        "shards": len(shards),
+        "rows": len(durations),
+        "makespan": round(max((shard.duration for shard in shards), default=0.0), 1),
+        "lower_bound": round(lower_bound, 1),
+        "total_build_time": round(total, 1),
+        "shard_durations": [round(shard.duration, 1) for shard in shards],
+    }
@@ -0,0 +1,147 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import sys
+import json
+import hashlib
+import argparse
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from okdp.extension.matrix.matrix_query import Condition, MatrixIndex, build_indexes, parse_conditions
+LOGGER = logging.getLogger(__name__)
+
+MATRICES = ("spark", "python")
+
+def versions_sha256(versions_matrix_path: str, tarball_index_path: str | None = None) -> str:
+    """ The hash of .versions.yml content (and of the tarball index the spark_version selectors are resolved against) """
+    sha256 = hashlib.sha256(Path(versions_matrix_path).read_bytes())
+    if tarball_index_path and Path(tarball_index_path).is_file():
+        sha256.update(Path(tarball_index_path).read_bytes())
+    return sha256.hexdigest()
+
+def normalize_branch(git_branch: str) -> str:
+    # Handle branches like: feature/my-feature (c.f. VersionCompatibilityMatrix)
+    return git_branch.replace("/", "-")
+
+@dataclass
+class CompiledMatrix:
+    """ The expanded matrix and its indexes, stored as JSON lines keyed by the .versions.yml content hash and the git branch:
+          {"versions_sha256": ..., "git_branch": ..., "indexes": {"spark": {key: {value: [row positions]}}, ...}}
+          {"matrix": "spark", "row": {...}}
+          {"matrix": "python", "row": {...}}
+        Only the standard library is used (no PyYAML) so that the jobs reading the matrix start instantly.
+    """
+    versions_sha256: str
+    git_branch: str
+    matrices: dict[str, list[dict]]
+    indexes: dict[str, dict[str, dict[str, list[int]]]]
+
+    @staticmethod
+    def compile(versions_sha256: str, git_branch: str, spark_matrix: list[dict], python_matrix: list[dict]) -> "CompiledMatrix":
+        matrices = {"spark": spark_matrix, "python": python_matrix}
+        return CompiledMatrix(versions_sha256, normalize_branch(git_branch), matrices,
+                              {name: build_indexes(rows) for name, rows in matrices.items()})
+
+    def save(self, path: str) -> None:
+        lines = [json.dumps({"versions_sha256": self.versions_sha256, "git_branch": self.git_branch, "indexes": self.indexes}, separators=(",", ":"))]
+        for name in MATRICES:
+            lines.extend(json.dumps({"matrix": name, "row": row}, separators=(",", ":")) for row in self.matrices[name])
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text("\n".join(lines) + "\n")
+
+    @staticmethod
+    def load(path: str, versions_sha256: str, git_branch: str) -> "CompiledMatrix | None":
+        """ The compiled matrix if it was compiled from the same .versions.yml content and git branch """
+        if not Path(path).is_file():
+            return None
+        with open(path) as file:
+            header = json.loads(file.readline() or "{}")
+            if header.get("versions_sha256") != versions_sha256 or header.get("git_branch") != normalize_branch(git_branch):
+                LOGGER.info(f"The compiled matrix {path} is outdated")
+                return None
+            matrices: dict[str, list[dict]] = {name: [] for name in MATRICES}
+            for line in file:
+                entry = json.loads(line)
+                matrices[entry["matrix"]].append(entry["row"])
+        return CompiledMatrix(header["versions_sha256"], header["git_branch"], matrices, header["indexes"])
+
+    def index(self, matrix: str) -> MatrixIndex:
+        return MatrixIndex(self.matrices[matrix], self.indexes[matrix])
+
+    def select(self, matrix: str, conditions: list[Condition] | None = None) -> list[dict]:
+        """ The rows of the matrix matching all the conditions """
+        return self.index(matrix).query(conditions or [])
+
+def load_or_compile(versions_matrix_path: str, git_branch: str, compiled_matrix_path: str, tarball_index_path: str | None = None) -> CompiledMatrix:
+    """ Answer from the compiled matrix, (re)compile it from .versions.yml on a cache miss """
+    sha256 = versions_sha256(versions_matrix_path, tarball_index_path)
+    compiled = CompiledMatrix.load(compiled_matrix_path, sha256, git_branch)
+    if compiled is None:
+        # Slow path: PyYAML and the solver are only imported on a cache miss
+        from okdp.extension.matrix.tarball_index import TarballIndex
+        from okdp.extension.matrix.version_compatibility_matrix import VersionCompatibilityMatrix
+        tarball_index = TarballIndex(tarball_index_path) if tarball_index_path else None
+        (spark_matrix, python_matrix) = VersionCompatibilityMatrix(versions_matrix_path, git_branch, tarball_index).generate_matrix()
+        compiled = CompiledMatrix.compile(sha256, git_branch, spark_matrix, python_matrix)
+        compiled.save(compiled_matrix_path)
+        LOGGER.info(f"Compiled matrix written to {compiled_matrix_path}")
+    return compiled
+
+if __name__ == "__main__":
+  logging.basicConfig(level=logging.INFO)
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument(
+      "--versions-matrix-path",
+      required=True,
+      help="The matrix path location containing the versions to build",
+  )
+  arg_parser.add_argument(
+      "--git-branch",
+      required=True,
+      help="The current git branch",
+  )
+  arg_parser.add_argument(
+      "--compiled-matrix-path",
+      required=True,
+      help="The compiled matrix (JSON lines), written on a cache miss",
+  )
+  arg_parser.add_argument(
+      "--tarball-index",
+      required=False,
+      help="The cached tarball index (json file) the spark_version selectors are resolved against",
+  )
+  arg_parser.add_argument(
+      "--matrix",
+      required=False,
+      nargs="*",
+      choices=MATRICES,
+      default=list(MATRICES),
+      help="The matrices to output",
+  )
+  arg_parser.add_argument(
+      "--where",
+      required=False,
+      nargs="*",
+      default=[],
+      help="Only output the rows matching all the conditions (c.f. okdp.extension.matrix.matrix_query). Ex.: --where spark_dev_tag=spark3.5.6-python3.11-java17-scala2.13-main-latest",
+  )
+  args = arg_parser.parse_args()
+
+  compiled = load_or_compile(args.versions_matrix_path, args.git_branch, args.compiled_matrix_path, args.tarball_index)
+  conditions = parse_conditions(args.where)
+  for name in args.matrix:
+    print(f"{name}={json.dumps(compiled.select(name, conditions))}", file=sys.stdout)
@@ -0,0 +1,159 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import re
+import sys
+import json
+import bisect
+import argparse
+import logging
+from dataclasses import dataclass
+LOGGER = logging.getLogger(__name__)
+
+CONDITION_PATTERN = re.compile(r"^(\w+)\s*(==|=|>=|<=|>|<)\s*(.*)$")
+
+def version_key(version: str) -> tuple[int, ...]:
+    """ Comparable version. Ex.: '3.5.6' => (3, 5, 6), '2.13' => (2, 13), '' => () """
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split(".")) if version else ()
+
+@dataclass(frozen=True)
+class Condition:
+    key: str
+    operator: str
+    value: str
+
+    @staticmethod
+    def parse(condition: str) -> "Condition":
+        """ Ex.: 'spark_version=3.5.6', 'spark_version>=3.4', 'python_version<3.12' """
+        match = CONDITION_PATTERN.match(condition)
+        if not match:
+            raise ValueError(f"Invalid condition '{condition}', expected <key><operator><value> with operator in =, >=, <=, >, <")
+        (key, operator, value) = match.groups()
+        return Condition(key, "=" if operator == "==" else operator, value.strip())
+
+def parse_conditions(conditions: list[str]) -> list[Condition]:
+    return [Condition.parse(condition) for condition in conditions]
+
+class MatrixIndex:
+    """ Per-field indexes over the rows of an expanded matrix
+
+        Equality conditions are answered from hash indexes (value -> row positions),
+        version range conditions by bisection over the rows sorted by version (built on first use).
+    """
+
+    def __init__(self, rows: list[dict], indexes: dict[str, dict[str, list[int]]] | None = None):
+        self.rows = rows
+        self.indexes = indexes if indexes is not None else build_indexes(rows)
+        self._sorted: dict[str, tuple[list[tuple[int, ...]], list[int]]] = {}
+
+    def _sorted_index(self, key: str) -> tuple[list[tuple[int, ...]], list[int]]:
+        if key not in self._sorted:
+            entries = sorted((version_key(value), position) for value, positions in self.indexes.get(key, {}).items() for position in positions)
+            self._sorted[key] = ([version for (version, _) in entries], [position for (_, position) in entries])
+        return self._sorted[key]
+
+    def positions(self, condition: Condition) -> set[int]:
+        if condition.operator == "=":
+            return set(self.indexes.get(condition.key, {}).get(condition.value, []))
+        (versions, positions) = self._sorted_index(condition.key)
+        version = version_key(condition.value)
+        if condition.operator in (">", ">="):
+            start = bisect.bisect_right(versions, version) if condition.operator == ">" else bisect.bisect_left(versions, version)
+            return set(positions[start:])
+        end = bisect.bisect_left(versions, version) if condition.operator == "<" else bisect.bisect_right(versions, version)
+        return set(positions[:end])
+
+    def query(self, conditions: list[Condition]) -> list[dict]:
+        """ The rows matching all the conditions, in the matrix order """
+        if not conditions:
+            return list(self.rows)
+        matching = None
+        # The most selective (equality) conditions first
+        for condition in sorted(conditions, key=lambda c: c.operator != "="):
+            positions = self.positions(condition)
+            matching = positions if matching is None else matching & positions
+            if not matching:
+                return []
+        return [self.rows[position] for position in sorted(matching)]
+
+    def distinct(self, key: str, conditions: list[Condition]) -> list[str]:
+        """ The distinct values of key among the rows matching the conditions. Ex.: the java versions paired with spark 4.0.1 """
+        return list(dict.fromkeys(row[key] for row in self.query(conditions) if key in row))
+
+def build_indexes(rows: list[dict]) -> dict[str, dict[str, list[int]]]:
+    """ key -> value -> positions of the rows having this value """
+    indexes: dict[str, dict[str, list[int]]] = {}
+    for position, row in enumerate(rows):
+        for key, value in row.items():
+            if isinstance(value, str):
+                indexes.setdefault(key, {}).setdefault(value, []).append(position)
+    return indexes
+
+if __name__ == "__main__":
+  logging.basicConfig(level=logging.INFO)
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument(
+      "--versions-matrix-path",
+      required=True,
+      help="The matrix path location containing the versions to build",
+  )
+  arg_parser.add_argument(
+      "--git-branch",
+      required=True,
+      help="The current git branch",
+  )
+  arg_parser.add_argument(
+      "--compiled-matrix-path",
+      required=False,
+      help="Answer from the compiled matrix (JSON lines), written on a cache miss",
+  )
+  arg_parser.add_argument(
+      "--tarball-index",
+      required=False,
+      help="The cached tarball index (json file) the spark_version selectors are resolved against",
+  )
+  arg_parser.add_argument(
+      "--matrix",
+      required=False,
+      choices=["spark", "python"],
+      default="spark",
+      help="The matrix to query",
+  )
+  arg_parser.add_argument(
+      "--where",
+      required=False,
+      nargs="*",
+      default=[],
+      help="The conditions the rows must match. Ex.: --where spark_version=3.5.6 python_version=3.11 or --where 'spark_version>=3.4' 'spark_version<4'",
+  )
+  arg_parser.add_argument(
+      "--distinct",
+      required=False,
+      help="Only output the distinct values of this key. Ex.: --distinct java_version",
+  )
+  args = arg_parser.parse_args()
+
+  if args.compiled_matrix_path:
+    from okdp.extension.matrix.matrix_cache import load_or_compile
+    index = load_or_compile(args.versions_matrix_path, args.git_branch, args.compiled_matrix_path, args.tarball_index).index(args.matrix)
+  else:
+    from okdp.extension.matrix.tarball_index import TarballIndex
+    from okdp.extension.matrix.version_compatibility_matrix import VersionCompatibilityMatrix
+    tarball_index = TarballIndex(args.tarball_index) if args.tarball_index else None
+    index = VersionCompatibilityMatrix(args.versions_matrix_path, args.git_branch, tarball_index).index(args.matrix)
+  conditions = parse_conditions(args.where)
+  result = index.distinct(args.distinct, conditions) if args.distinct else index.query(conditions)
+  print(json.dumps(result), file=sys.stdout)
@@ -0,0 +1,155 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import re
+import json
+import argparse
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from okdp.extension.matrix.matrix_query import Condition, version_key
+LOGGER = logging.getLogger(__name__)
+
+LATEST_PATCH = "latest-patch"
+# Same pattern as setup_spark.get_latest_spark_version (pyspark-notebook), extended to the tarball names:
+# spark-3.5.6/ (apache archive) or spark-3.5.6-bin-hadoop3.tgz (github release assets). The previews are ignored.
+SPARK_REF_PATTERN = re.compile(r"(?:^|/)spark-(\d+\.\d+\.\d+)(?:/|-bin-)")
+GITHUB_RELEASE_PATTERN = re.compile(r"^https://github\.com/([^/]+)/([^/]+)/releases/download/([^/]+)/?$")
+HREF_PATTERN = re.compile(r"""href=["']([^"']+)["']""")
+EXACT_VERSION_PATTERN = re.compile(r"^\d+(\.\d+)*$")
+
+def is_selector(version: str) -> bool:
+    """ 3.5.6 is an exact version, 3.5.x, >=3.4,<4 and latest-patch are selectors """
+    return not EXACT_VERSION_PATTERN.match(version)
+
+def versions_from_refs(refs: list[str]) -> list[str]:
+    """ The spark versions of an archive listing or of release asset names, sorted """
+    versions = {match.group(1) for ref in refs if (match := SPARK_REF_PATTERN.search(ref))}
+    return sorted(versions, key=version_key)
+
+def fetch_refs(spark_download_url: str) -> list[str]:
+    """ The links of the apache archive listing or the asset names of a github release (network I/O) """
+    import requests
+
+    github_release = GITHUB_RELEASE_PATTERN.match(spark_download_url)
+    if github_release:
+        (owner, repository, tag) = github_release.groups()
+        response = requests.get(f"https://api.github.com/repos/{owner}/{repository}/releases/tags/{tag}", timeout=30)
+        response.raise_for_status()
+        return [asset["name"] for asset in response.json().get("assets", [])]
+    response = requests.get(spark_download_url, timeout=30)
+    response.raise_for_status()
+    return HREF_PATTERN.findall(response.text)
+
+def resolve_selectors(selectors: list[str], available: list[str]) -> list[str]:
+    """ Resolve the spark_version values of a compatibility entry against the available versions
+        Ex.: ["3.5.x"], [">=3.4,<4"], [">=3.4,<4", "latest-patch"], ["3.5.1", "3.5.2"]
+        latest-patch keeps the latest patch of every major.minor of the other values (of all the available versions if alone)
+    """
+    versions = []
+    for selector in selectors:
+        if selector == LATEST_PATCH:
+            continue
+        if not is_selector(selector):
+            versions.append(selector)
+        elif selector.endswith(".x"):
+            prefix = selector[:-1]
+            versions.extend(version for version in available if version.startswith(prefix))
+        else:
+            conditions = [Condition.parse(f"spark_version{condition.strip()}") for condition in selector.split(",")]
+            versions.extend(version for version in available if all(matches(version, condition) for condition in conditions))
+    if LATEST_PATCH in selectors:
+        latest = {}
+        for version in sorted(versions or available, key=version_key):
+            latest[version_key(version)[:2]] = version
+        versions = list(latest.values())
+    return list(dict.fromkeys(versions))
+
+def matches(version: str, condition: Condition) -> bool:
+    (left, right) = (version_key(version), version_key(condition.value))
+    return {"=": left == right, ">=": left >= right, "<=": left <= right, ">": left > right, "<": left < right}[condition.operator]
+
+class TarballIndex:
+    """ The spark versions available per spark_download_url, cached locally (json file)
+
+        The matrix generation only reads the cached index (offline), the index is refreshed explicitly:
+        python -m okdp.extension.matrix.tarball_index --tarball-index <path> --refresh --spark-download-url <url>
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: dict[str, dict] = json.loads(Path(path).read_text()) if Path(path).is_file() else {}
+        self._resolved: dict[tuple, list[str]] = {}
+
+    def save(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        Path(self.path).write_text(json.dumps(self.entries, indent=2, sort_keys=True))
+
+    def versions(self, spark_download_url: str) -> list[str]:
+        entry = self.entries.get(spark_download_url.rstrip("/") + "/")
+        if entry is None:
+            raise ValueError(f"No cached tarball index for {spark_download_url}, "
+                             f"please refresh it: python -m okdp.extension.matrix.tarball_index --tarball-index {self.path} --refresh --spark-download-url {spark_download_url}")
+        return entry["versions"]
+
+    def record(self, spark_download_url: str, versions: list[str]) -> None:
+        self.entries[spark_download_url.rstrip("/") + "/"] = {"versions": versions, "refreshed_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        self._resolved.clear()
+
+    def refresh(self, spark_download_url: str) -> list[str]:
+        versions = versions_from_refs(fetch_refs(spark_download_url))
+        LOGGER.info(f"Available spark versions at {spark_download_url}: {versions}")
+        self.record(spark_download_url, versions)
+        return versions
+
+    def resolve(self, selectors: list[str], spark_download_url: str) -> list[str]:
+        """ Memoized resolution of the spark_version selectors of a compatibility entry """
+        if not any(is_selector(selector) for selector in selectors):
+            return selectors
+        key = (tuple(selectors), spark_download_url)
+        if key not in self._resolved:
+            self._resolved[key] = resolve_selectors(selectors, self.versions(spark_download_url))
+        return self._resolved[key]
+
+if __name__ == "__main__":
+  logging.basicConfig(level=logging.INFO)
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument(
+      "--tarball-index",
+      required=True,
+      help="The cached tarball index (json file)",
+  )
+  arg_parser.add_argument(
+      "--refresh",
+      required=False,
+      action="store_true",
+      help="Fetch the available spark versions (network) and update the cached index",
+  )
+  arg_parser.add_argument(
+      "--spark-download-url",
+      required=False,
+      nargs="*",
+      default=[],
+      help="The spark download urls to refresh (default: the urls already in the index)",
+  )
+  args = arg_parser.parse_args()
+
+  tarball_index = TarballIndex(args.tarball_index)
+  if args.refresh:
+    for spark_download_url in args.spark_download_url or list(tarball_index.entries):
+      tarball_index.refresh(spark_download_url)
+    tarball_index.save()
+  print(json.dumps(tarball_index.entries, indent=2))
@@ -14,8 +14,9 @@
 # limitations under the License.
 #
 
-from itertools import groupby
 import itertools
+import sys
+from collections.abc import Hashable, Iterable
 from okdp.extension.matrix.constants import *
 
 def group_on(elem) -> str:
@@ -31,45 +32,37 @@ def intersect_dicts(dict1: dict, dict2: dict) -> dict:
     #    if key == PYTHON_VERSION:
     #      dict_res[f"_{PYTHON_VERSION}"] = dict1.get(key)
     ### Do the intersection
-    for key, value in dict_res.items():
-        if key in dict1 and key in dict2:
-                dict_res[key] = list(set(value) & set(dict1[key]))
+    return _intersect_dicts(dict1, dict_res, {key: frozenset(value) for key, value in dict2.items()})
+
+def _intersect_dicts(dict1: dict, dict_res: dict, allowed: dict[str, frozenset]) -> dict:
+    """ The values of dict1 in allowed (the sets of dict2 values), in the dict1 order """
+    for key, value in dict1.items():
+        if key in allowed:
+                dict_res[key] = [v for v in dict.fromkeys(value) if v in allowed[key]]
     return dict_res
 
 def merge_dicts(dict1: dict, *args: dict) -> dict:
     """ Merge multiple dicts by keeping all the values for the keys """
     if not args:
         return dict1
-    dict2 = args[0]
-    dict_res = {**dict1, **dict2}
-    for key, value in dict_res.items():
-        if key in dict1 and key in dict2:
-                dict_res[key] = list(set(sum([value , dict1[key]], [])))
-    return dict_res if len(args) == 1 else merge_dicts(dict_res, *args[1:])
+    ### Merged one dict after the other (no recursion), the values of the shared keys without duplicates
+    dict_res = dict(dict1)
+    for dict2 in args:
+        for key, value in dict2.items():
+            dict_res[key] = list(dict.fromkeys([*dict_res[key], *value])) if key in dict_res else value
+    return dict_res
 
 def join_versions(groups: list[dict], on_dict: dict) -> list[dict]:
     """ Intersect groups of dicts values with the provided on_dict """
-    ### Intersect the groups with on_dict
-    result = []
-    for group in groups:
-      result.append(intersect_dicts(group, on_dict))
-    
-    return result
+    ### Intersect the groups with on_dict (its value sets are built once)
+    allowed = {key: frozenset(value) for key, value in on_dict.items()}
+    return [_intersect_dicts(group, {**group, **on_dict}, allowed) for group in groups]
 
 def group_versions_by(dicts: list[dict], group_on) -> list[dict]:
     """ Group the spark versions by PYTHON_VERSION/JAVA_VERSION/HADOOP_VERSION
     """
-    ### Group the elements by python_version
-    python_groups = []
-    data = sorted(dicts, key=group_on)
-    for k, g in groupby(data, group_on):
-         python_groups.append(list(g))
-    
-    ### Merge the groups
-    result = []
-    for group in python_groups:
-      result.extend(group)
-    return result
+    ### The groups one after the other: sorting by the group key is enough (stable, no intermediate lists)
+    return sorted(dicts, key=group_on)
 
 def ignore_invalid_versions (dicts: list[dict]) -> list[dict]:
    return list(filter(lambda elem: 
@@ -84,12 +77,13 @@ def normalize_matrix(versions: list[dict]) -> list[dict]:
        https://github.com/orgs/community/discussions/24981 
   """
 
-  combinations = []
-  for version in versions:
-    keys, values = zip(*version.items())
-    combinations.extend([dict(zip(keys, v)) for v in itertools.product(*values)])
+  return list(itertools.chain.from_iterable(_combinations(version) for version in versions))
 
-  return combinations
+def _combinations(version: dict) -> Iterable[dict]:
+  """ The combinations of a row, generated lazily """
+  keys, values = zip(*version.items())
+  keys = tuple(sys.intern(key) for key in keys)
+  return (dict(zip(keys, v)) for v in itertools.product(*values))
 
 def normalize_scala_version(matrix: list[dict]) -> list[dict]:
     """
@@ -117,10 +111,34 @@ def normalize_value (value: str) -> [str]:
     return [str(value)]
   return [str(v) for v in value]
 
+def row_key(row: dict) -> Hashable:
+    """ Frozen form of a row: two rows have the same key if and only if they are equal
+        Ex.: {"python_version": ["3.11"]} => frozenset({("python_version", (list, ("3.11",)))})
+    """
+    return frozenset((key, _freeze(value)) for key, value in row.items())
+
+def _freeze(value) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return (dict, row_key(value))
+    return value
+
 def remove_duplicates (dicts: list[dict]) -> list[dict]:
+    """ Keep the first occurrence of the equal rows (hash based, the unhashable rows are compared one by one) """
+    seen = set()
+    unhashable = []
     result = []
     for dict in dicts:
-        if dict not in result:
+        try:
+            key = row_key(dict)
+        except TypeError:
+            if dict not in unhashable:
+                unhashable.append(dict)
+                result.append(dict)
+            continue
+        if key not in seen:
+            seen.add(key)
             result.append(dict)
     return result
 
@@ -18,15 +18,25 @@ import json
 import yaml
 import argparse
 import logging
+from collections.abc import Iterable
+from functools import cached_property
+from pathlib import Path
 from okdp.extension.matrix.constants import *
 
-from okdp.extension.matrix.utils.matrix_utils import ignore_invalid_versions, join_versions, group_versions_by, normalize_matrix, normalize_scala_version, normalize_value, remove_duplicates
-from okdp.extension.matrix.utils.matrix_utils import group_on
+from okdp.extension.matrix.build_cache import BuildCache, BuildCacheIndex
+from okdp.extension.matrix.build_dag import BuildDag
+from okdp.extension.matrix.compatibility_solver import CompatibilitySolver
+from okdp.extension.matrix.delta_matrix import DeltaMatrix, diff_matrices
+from okdp.extension.matrix.job_packer import BuildHistory, GITHUB_MAX_MATRIX_JOBS, makespan_report, pack_rows
+from okdp.extension.matrix.matrix_cache import CompiledMatrix, versions_sha256
+from okdp.extension.matrix.matrix_query import MatrixIndex, parse_conditions
+from okdp.extension.matrix.tarball_index import TarballIndex, is_selector
+from okdp.extension.matrix.utils.matrix_utils import normalize_scala_version, normalize_value
 LOGGER = logging.getLogger(__name__)
 
 class VersionCompatibilityMatrix:
    
-   def __init__(self, path: str, git_branch: str):
+   def __init__(self, path: str, git_branch: str, tarball_index: TarballIndex | None = None):
       
       LOGGER.info(f"Building version compatibilty matrix - Matrix path: {path}, Current git branch: {git_branch}")
       with open(path, 'r') as file:
@@ -39,6 +49,7 @@ class VersionCompatibilityMatrix:
 
       self.__validate__()
       self._normalize_values_()
+      self._resolve_spark_versions_(tarball_index)
 
     
    def _normalize_values_(self):
@@ -48,6 +59,19 @@ class VersionCompatibilityMatrix:
       self.compatibility_matrix = [dict(map(lambda kv: (kv[0], normalize_value(kv[1])), e.items())) for e in self.compatibility_matrix]
       self.build_matrix = dict(map(lambda kv: (kv[0], normalize_value(kv[1])), self.build_matrix.items()))
 
+   def _resolve_spark_versions_(self, tarball_index: TarballIndex | None):
+      """ Resolve the spark_version selectors (3.5.x, >=3.4,<4, latest-patch) against the cached tarball index (offline)
+          Ex.: spark_version: 3.5.x => spark_version: ['3.5.1', ..., '3.5.6']
+      """
+      for e in self.compatibility_matrix:
+        selectors = e.get(SPARK_VERSION, [])
+        if not any(is_selector(selector) for selector in selectors):
+          continue
+        if tarball_index is None:
+          raise ValueError(f"The spark_version selectors {selectors} require a tarball index (--tarball-index)")
+        e[SPARK_VERSION] = list(dict.fromkeys(v for url in e.get(SPARK_DOWNLOAD_URL, []) for v in tarball_index.resolve(selectors, url)))
+        LOGGER.info(f"Resolved spark versions {selectors} => {e[SPARK_VERSION]}")
+
    def __validate__(self):
       if not self.compatibility_matrix:
         raise ValueError(f"The compatibility-matrix section is mandatory")
@@ -55,17 +79,49 @@ class VersionCompatibilityMatrix:
    def generate_matrix(self) -> (str, dict):
 
       compatibility_versions_matrix = [dict(map(lambda kv: (kv[0], normalize_value(kv[1])), e.items())) for e in self.compatibility_matrix]
-      spark_version_matrix = normalize_matrix(ignore_invalid_versions(join_versions(group_versions_by(compatibility_versions_matrix, group_on=group_on), self.build_matrix)))
-      spark_version_matrix = normalize_scala_version(self.add_latest_dev_tags(spark_version_matrix))
-      python_version_matrix = remove_duplicates([{PYTHON_VERSION: e.get(PYTHON_VERSION), PYTHON_DEV_TAG: e.get(PYTHON_DEV_TAG)}  for e in spark_version_matrix ])
+      solver = CompatibilitySolver(compatibility_versions_matrix)
+      spark_version_matrix = normalize_scala_version(self.add_latest_dev_tags(solver.solve(self.build_matrix)))
+      python_versions = dict.fromkeys((e.get(PYTHON_VERSION), e.get(PYTHON_DEV_TAG)) for e in spark_version_matrix)
+      python_version_matrix = [{PYTHON_VERSION: python_version, PYTHON_DEV_TAG: python_dev_tag} for (python_version, python_dev_tag) in python_versions]
       return (spark_version_matrix, python_version_matrix)
+
+   @cached_property
+   def _matrix_indexes(self) -> dict[str, MatrixIndex]:
+      (spark_matrix, python_matrix) = self.generate_matrix()
+      return {"spark": MatrixIndex(spark_matrix), "python": MatrixIndex(python_matrix)}
+
+   def index(self, matrix: str = "spark") -> MatrixIndex:
+      """ The per-field indexes of the expanded spark or python matrix, built once """
+      return self._matrix_indexes[matrix]
+
+   def query(self, *conditions: str, matrix: str = "spark") -> list[dict]:
+      """ The rows of the expanded matrix matching all the conditions
+          Ex.: vcm.query("spark_version=3.5.6", "python_version=3.11"), vcm.query("spark_version>=3.4", "spark_version<4")
+      """
+      return self.index(matrix).query(parse_conditions(list(conditions)))
+
+   def generate_build_dag(self) -> BuildDag:
+      """ The image builds (python bases, datascience and spark images) and their dependencies """
+      (spark_matrix, python_matrix) = self.generate_matrix()
+      return BuildDag(spark_matrix, python_matrix)
+
+   def generate_delta_matrix(self, previous: "VersionCompatibilityMatrix", changed_paths: list[str]) -> DeltaMatrix:
+      """ Split the matrix into the combinations to rebuild and the ones to re-tag only
+          previous: the matrix of the previous revision (built for the same git branch)
+          changed_paths: the paths changed since the previous revision (git diff --name-only)
+      """
+      (spark_matrix, python_matrix) = self.generate_matrix()
+      (previous_spark_matrix, previous_python_matrix) = previous.generate_matrix()
+      return diff_matrices(spark_matrix, python_matrix, previous_spark_matrix, previous_python_matrix, changed_paths)
    
-   def add_latest_dev_tags(self, matrix: list[dict]) -> list[dict]:
+   def add_latest_dev_tags(self, matrix: Iterable[dict]) -> list[dict]:
       """ The intermediate images are pushed with a latest uniq dev tag """
+      result = []
       for e in matrix:
         e |= {f"{SPARK_DEV_TAG}": self.spark_dev_tag(e)}
         e |= {f"{PYTHON_DEV_TAG}": self.python_dev_tag(e.get(PYTHON_VERSION))}
-      return matrix
+        result.append(e)
+      return result
 
    def python_dev_tag (self, python_version: str) -> str:
       return f"python{python_version}-{self.git_branch}-latest"
@@ -93,13 +149,106 @@ if __name__ == "__main__":
       required=True,
       help="The current git branch",
   )
+
+  arg_parser.add_argument(
+      "--previous-versions-matrix-path",
+      required=False,
+      help="The matrix path location of the previous revision. Only the changed combinations are emitted (delta mode)",
+  )
+
+  arg_parser.add_argument(
+      "--changed-paths",
+      required=False,
+      nargs="*",
+      default=[],
+      help="The paths changed since the previous revision (delta mode)",
+  )
+
+  arg_parser.add_argument(
+      "--build-cache-index",
+      required=False,
+      help="The build cache index (json file or OCI image layout directory). The rows already built are marked with skip: true",
+  )
+
+  arg_parser.add_argument(
+      "--base-image-digest",
+      required=False,
+      default="",
+      help="The digest of the root image the python images are built from (build cache fingerprint)",
+  )
+
+  arg_parser.add_argument(
+      "--build-history",
+      required=False,
+      help="The build durations history (json file or SQLite database). The spark rows are packed into balanced shards",
+  )
+
+  arg_parser.add_argument(
+      "--shards",
+      required=False,
+      type=int,
+      help="The number of shards to pack the spark rows into (default: one row per shard up to --max-jobs)",
+  )
+
+  arg_parser.add_argument(
+      "--max-jobs",
+      required=False,
+      type=int,
+      default=GITHUB_MAX_MATRIX_JOBS,
+      help="The maximum number of shards (github matrix jobs)",
+  )
+
+  arg_parser.add_argument(
+      "--build-dag",
+      required=False,
+      action="store_true",
+      help="Emit the dag of the image builds with its levels and critical path (weighted with --build-history if any)",
+  )
+
+  arg_parser.add_argument(
+      "--tarball-index",
+      required=False,
+      help="The cached tarball index (json file) the spark_version selectors (3.5.x, >=3.4,<4, latest-patch) are resolved against",
+  )
+
+  arg_parser.add_argument(
+      "--compiled-matrix-path",
+      required=False,
+      help="Also write the compiled matrix (JSON lines) read by okdp.extension.matrix.matrix_cache",
+  )
   
   args = arg_parser.parse_args()
-  vcm = VersionCompatibilityMatrix(args.versions_matrix_path, args.git_branch)
+  tarball_index = TarballIndex(args.tarball_index) if args.tarball_index else None
+  vcm = VersionCompatibilityMatrix(args.versions_matrix_path, args.git_branch, tarball_index)
   #vcm = VersionCompatibilityMatrix(".build/.versions.yml", "main")
   #with open(os.environ['GITHUB_OUTPUT'], 'a') as fh:
   #  print(f"spark_matrix={json.dumps(vcm.generate_matrix())}", file=fh)
   (spark_matrix, python_version) = vcm.generate_matrix()
   assert spark_matrix, ("The resulting build matrix was empty. Please, review your configuration '.build/.versions.yml'") 
-  print(f"spark={json.dumps(spark_matrix)}")
-  print(f"python={json.dumps(python_version)}")
+  if args.compiled_matrix_path:
+    CompiledMatrix.compile(versions_sha256(args.versions_matrix_path, args.tarball_index), args.git_branch, spark_matrix, python_version).save(args.compiled_matrix_path)
+  outputs = {"spark": spark_matrix, "python": python_version}
+  if args.previous_versions_matrix_path:
+    previous_vcm = VersionCompatibilityMatrix(args.previous_versions_matrix_path, args.git_branch, tarball_index)
+    delta = vcm.generate_delta_matrix(previous_vcm, args.changed_paths)
+    LOGGER.info(f"Delta matrix - Spark combinations to build: {len(delta.spark)}/{len(spark_matrix)}, Python versions to build: {len(delta.python)}/{len(python_version)}")
+    outputs = {"spark": delta.spark, "python": delta.python, "spark_unchanged": delta.spark_unchanged, "python_unchanged": delta.python_unchanged}
+  if args.build_cache_index:
+    # .build/.versions.yml => repository root
+    repository_root = Path(args.versions_matrix_path).resolve().parent.parent
+    build_cache = BuildCache(BuildCacheIndex.load(args.build_cache_index), repository_root, args.base_image_digest)
+    build_cache.annotate(outputs["spark"] + outputs.get("spark_unchanged", []), outputs["python"] + outputs.get("python_unchanged", []))
+    LOGGER.info(f"Build cache - Spark combinations already built: {sum(e[SKIP] for e in outputs['spark'])}/{len(outputs['spark'])}")
+  if args.build_history:
+    history = BuildHistory.load(args.build_history)
+    shards = pack_rows([e for e in outputs["spark"] if not e.get(SKIP)], history, args.shards, args.max_jobs)
+    report = makespan_report(shards, history)
+    LOGGER.info(f"Spark shards - expected makespan: {report['makespan']}s (lower bound: {report['lower_bound']}s), shards: {report['shard_durations']}")
+    outputs |= {"spark_shards": [shard.to_matrix() for shard in shards], "spark_makespan": report}
+  if args.build_dag:
+    build_dag = BuildDag(outputs["spark"], outputs["python"])
+    (durations, default_duration) = (history.durations, history.mean_duration) if args.build_history else ({}, 1.0)
+    outputs |= {"build_dag": build_dag.to_dict(durations, default_duration)}
+    LOGGER.info(f"Build dag - critical path: {outputs['build_dag']['critical_path']}")
+  for name, matrix in outputs.items():
+    print(f"{name}={json.dumps(matrix)}")
@@ -5,25 +5,46 @@
 """
 Modification of the original file:
 * Generate and apply the tags on the fly instead of writing them to an intermediate file
+* Apply the tags through the Docker API (docker_tags) instead of one docker CLI process per tag
+* Probe all the taggers versions in a single exec (version_probe)
+* Consult the probe cache (image digest + command) before starting a container (probe_cache)
+* Infer the tags from the image layers (docker save archive or OCI layout) without running a container (layer_inspector)
+* Derive the spark/python/java/scala tagger values from the build matrix row, verified in a single exec (matrix_row_tags)
+* Evaluate the primitive taggers shared by the LongTaggers once, without duplicate tags (tag_plan_compiler)
+* Run in the warm container of a session shared with the manifest steps (container_session)
 """
+import json
 import logging
-import plumbum
 import argparse
+from contextlib import nullcontext
+
+from docker.models.containers import Container
 
 from tagging.utils.docker_runner import DockerRunner
+from okdp.extension.tagging.docker_tags import tag_images
 from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
-
-docker = plumbum.local["docker"]
+from okdp.extension.tagging.probe_cache import CachedDockerRunner, ProbeCache
+from okdp.extension.tagging.version_probe import ProbedContainer
+from okdp.extension.tagging.layer_inspector import inspected_container
+from okdp.extension.tagging.matrix_row_tags import row_values, verify_row
+from okdp.extension.tagging.tag_plan_compiler import CompiledTagPlan
 
 LOGGER = logging.getLogger(__name__)
 
 class Tagging:
 
-    def __init__(self, image_name: str, registry: str, owner: str, platform: str,):
+    def __init__(self, image_name: str, registry: str, owner: str, platform: str, version_probe: bool = True, probe_cache: str | None = None,
+                 image_archive: str | None = None, matrix_row: dict | None = None, session: Container | None = None):
         self.image_name, self.tag = image_name.split(":")
         self.registry = registry
         self.owner = owner
         self.platform = platform
+        self.version_probe = version_probe
+        self.probe_cache = probe_cache
+        self.image_archive = image_archive
+        self.matrix_row = matrix_row
+        # The warm container of a session (c.f. container_session), left running for the next steps
+        self.session = session
 
     def apply_tags(self) -> None:
         """
@@ -35,9 +56,7 @@ class Tagging:
         
         tags = self.generate_tags()
 
-        for tag in tags:
-            LOGGER.info(f"Applying tag: {tag}")
-            docker["tag", image, tag] & plumbum.FG
+        tag_images({image: [tag for tag in tags if tag != image]})
 
     def generate_tags(self) -> list[str]:
         """
@@ -48,17 +67,36 @@ class Tagging:
 
         image = f"{self.registry}/{self.owner}/{self.image_name}:{self.tag}-{self.platform}"
         tags = [f"{self.registry}/{self.owner}/{self.image_name}:{self.tag}-{self.platform}"]
-        with DockerRunner(image) as container:
-            for tagger in taggers:
-                tagger_name = tagger.__class__.__name__
-                tag_value = tagger.tag_value(container)
-                LOGGER.info(
-                    f"Calculated tag, tagger_name: {tagger_name} tag_value: {tag_value}"
-                )
-                tags.append(
-                    f"{self.registry}/{self.owner}/{self.image_name}:{tag_value}-{self.platform}"
-                )
+        # The primitive taggers shared by the LongTaggers (of the image and its parents) are evaluated once
+        plan = CompiledTagPlan.compile(taggers)
+        if self.image_archive:
+            container = inspected_container(self.image_archive, self.platform)
+            return tags + self._tags(plan, container)
+
+        if self.session:
+            runner = nullcontext(self.session)
+        else:
+            runner = CachedDockerRunner(image, ProbeCache(self.probe_cache)) if self.probe_cache else DockerRunner(image)
+        with runner as container:
+            values = {}
+            if self.matrix_row:
+                verify_row(container, self.matrix_row)
+                values = row_values(self.matrix_row)
+            if self.version_probe:
+                container = ProbedContainer.probe(container, [primitive for primitive in plan.primitives if primitive not in values])
+            tags += self._tags(plan, container, values)
+
+        return tags
 
+    def _tags(self, plan: CompiledTagPlan, container, values: dict | None = None) -> list[str]:
+        tags = []
+        for tag_value in plan.evaluate(container, values):
+            LOGGER.info(
+                f"Calculated tag, tag_value: {tag_value}"
+            )
+            tags.append(
+                f"{self.registry}/{self.owner}/{self.image_name}:{tag_value}-{self.platform}"
+            )
         return tags
 
 
@@ -90,8 +128,30 @@ if __name__ == "__main__":
         choices=["amd64", "arm64"],
         help="Platform",
     )
+    arg_parser.add_argument(
+        "--no-version-probe",
+        action="store_true",
+        help="Run the taggers commands one by one instead of probing all the versions in a single exec",
+    )
+    arg_parser.add_argument(
+        "--probe-cache",
+        required=False,
+        help="The probe cache (SQLite) of the commands results by image digest",
+    )
+    arg_parser.add_argument(
+        "--image-archive",
+        required=False,
+        help="Infer the tags from the image layers without running a container: docker save archive or OCI layout directory",
+    )
+    arg_parser.add_argument(
+        "--matrix-row",
+        required=False,
+        type=json.loads,
+        help="The build matrix row of the image (json), the spark/python/java/scala tags are derived from it and verified in the container. Ex.: '${{ toJson(matrix.spark) }}'",
+    )
     args = arg_parser.parse_args()
 
-    tagging = Tagging(args.image_name, args.registry, args.owner, args.platform)
+    tagging = Tagging(args.image_name, args.registry, args.owner, args.platform, not args.no_version_probe, args.probe_cache,
+                      args.image_archive, args.matrix_row)
     
     tagging.apply_tags()
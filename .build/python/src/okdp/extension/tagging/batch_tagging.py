@@ -0,0 +1,202 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Tag many images (matrix rows x image names x platforms) in one process:
+* The tags of every image are computed concurrently, with a bounded number of containers running at the same time
+* The results are aggregated into a single tag plan (json), applied in bulk once all the tags are known
+"""
+
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from okdp.extension.matrix.constants import PYTHON_DEV_TAG, SPARK_DEV_TAG
+from okdp.extension.tagging.apply_tags import Tagging
+from okdp.extension.tagging.docker_tags import DEFAULT_MAX_WORKERS as DEFAULT_MAX_PUSH_WORKERS, PushReport, push_tags, tag_images
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+SPARK_IMAGES = ("pyspark-notebook", "all-spark-notebook")
+
+@dataclass(frozen=True)
+class TaggingJob:
+    image_name: str
+    platform: str
+    matrix_row: dict | None = field(default=None, hash=False, compare=False)
+
+def jobs_from_matrix(rows: list[dict], image_names: list[str], platforms: list[str]) -> list[TaggingJob]:
+    """ The images of the matrix rows: the spark images are tagged <spark_dev_tag>, the others <python_dev_tag> (deduplicated) """
+    jobs = {}
+    for row in rows:
+        for image_name in image_names:
+            spark_image = image_name in SPARK_IMAGES
+            dev_tag = row.get(SPARK_DEV_TAG if spark_image else PYTHON_DEV_TAG)
+            if not dev_tag:
+                continue
+            for platform in platforms:
+                # The matrix row only describes the versions of the spark images (python_dev_tag is shared by several rows)
+                job = TaggingJob(f"{image_name}:{dev_tag}", platform, row if spark_image else None)
+                jobs.setdefault(job, job)
+    return list(jobs)
+
+@dataclass
+class TagPlan:
+    """ source image -> tags, with the time spent computing the tags of every image """
+    tags: dict[str, list[str]] = field(default_factory=dict)
+    durations: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def save(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(asdict(self), indent=2))
+
+    @staticmethod
+    def load(path: str) -> "TagPlan":
+        return TagPlan(**json.loads(Path(path).read_text()))
+
+    def apply(self) -> None:
+        """ Tag all the source images """
+        tag_images(self.tags)
+
+    def push(self, max_workers: int = DEFAULT_MAX_PUSH_WORKERS) -> PushReport:
+        """ Push the source images and their tags """
+        return push_tags([tag for source, tags in self.tags.items() for tag in [source, *tags]], max_workers=max_workers)
+
+class BatchTagging:
+
+    def __init__(self, jobs: list[TaggingJob], registry: str, owner: str, max_workers: int = DEFAULT_MAX_WORKERS, **tagging_options):
+        self.jobs = jobs
+        self.registry = registry
+        self.owner = owner
+        self.max_workers = max_workers
+        self.tagging_options = tagging_options
+
+    def _generate_tags(self, job: TaggingJob) -> tuple[str, list[str], float]:
+        start = time.perf_counter()
+        tagging = Tagging(job.image_name, self.registry, self.owner, job.platform, matrix_row=job.matrix_row, **self.tagging_options)
+        (source, *tags) = tagging.generate_tags()
+        duration = time.perf_counter() - start
+        LOGGER.info(f"Computed {len(tags)} tags for {source} in {duration:.2f}s")
+        return (source, tags, duration)
+
+    def plan(self) -> TagPlan:
+        """ The tags of all the images, computed with at most max_workers containers at the same time """
+        plan = TagPlan()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {job: executor.submit(self._generate_tags, job) for job in self.jobs}
+            # Stable plan order: the jobs order
+            for job, future in futures.items():
+                try:
+                    (source, tags, duration) = future.result()
+                    plan.tags[source] = tags
+                    plan.durations[source] = round(duration, 3)
+                except Exception as e:
+                    LOGGER.error(f"Unable to compute the tags of {job.image_name} ({job.platform}): {e}")
+                    plan.errors[f"{job.image_name}-{job.platform}"] = str(e)
+        LOGGER.info(f"Computed the tags of {len(plan.tags)}/{len(self.jobs)} images in {time.perf_counter() - start:.2f}s ({self.max_workers} workers)")
+        return plan
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--images",
+        required=False,
+        nargs="*",
+        default=[],
+        help="The images name:tag to tag. Ex.: pyspark-notebook:spark3.5.6-python3.11-java17-scala2.13-main-latest",
+    )
+    arg_parser.add_argument(
+        "--matrix-json",
+        required=False,
+        help="The spark or python matrix (json list of rows) whose images are tagged",
+    )
+    arg_parser.add_argument(
+        "--image-names",
+        required=False,
+        nargs="*",
+        default=list(SPARK_IMAGES),
+        help="The images to tag for every row of --matrix-json",
+    )
+    arg_parser.add_argument(
+        "--registry",
+        required=True,
+        type=str,
+        choices=["quay.io", "ghcr.io"],
+        help="Image registry",
+    )
+    arg_parser.add_argument(
+        "--owner",
+        required=True,
+        help="Owner of the image",
+    )
+    arg_parser.add_argument(
+        "--platforms",
+        required=False,
+        nargs="*",
+        choices=["amd64", "arm64"],
+        default=["amd64", "arm64"],
+        help="Platforms",
+    )
+    arg_parser.add_argument(
+        "--max-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The maximum number of containers running at the same time",
+    )
+    arg_parser.add_argument(
+        "--probe-cache",
+        required=False,
+        help="The probe cache (SQLite) of the commands results by image digest",
+    )
+    arg_parser.add_argument(
+        "--plan-output",
+        required=False,
+        help="Write the tag plan (json) to this file",
+    )
+    arg_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only compute the tag plan, do not apply the tags",
+    )
+    arg_parser.add_argument(
+        "--push",
+        action="store_true",
+        help="Push the source images and their tags once applied",
+    )
+    args = arg_parser.parse_args()
+
+    jobs = [TaggingJob(image, platform) for image in args.images for platform in args.platforms]
+    if args.matrix_json:
+        jobs += jobs_from_matrix(json.loads(Path(args.matrix_json).read_text()), args.image_names, args.platforms)
+    tag_plan = BatchTagging(jobs, args.registry, args.owner, args.max_workers, probe_cache=args.probe_cache).plan()
+    if args.plan_output:
+        tag_plan.save(args.plan_output)
+    if tag_plan.errors:
+        raise SystemExit(f"Unable to compute the tags of: {', '.join(tag_plan.errors)}")
+    if not args.dry_run:
+        tag_plan.apply()
+        if args.push:
+            tag_plan.push()
@@ -0,0 +1,109 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Immutable build context (commit, message, timestamp, branch, platform) shared by the taggers and the manifests:
+* Computed once per process with a single git invocation, instead of a git subprocess per GitHelper call
+* Serializable: a CI step saves it, the next steps reuse it through OKDP_BUILD_CONTEXT (same commit and timestamp everywhere)
+"""
+
+import os
+import re
+import json
+import datetime
+import logging
+import argparse
+import subprocess
+from dataclasses import asdict, dataclass, replace
+from functools import cache
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+BUILD_CONTEXT_ENV = "OKDP_BUILD_CONTEXT"
+BRANCH_PATTERN = re.compile(r"HEAD -> ([^,]+)")
+
+@dataclass(frozen=True)
+class BuildContext:
+    commit: str
+    message: str
+    # Ex.: 2026-01-05T05:00:00Z
+    timestamp: str
+    branch: str
+    platform: str | None = None
+
+    @property
+    def commit_tag(self) -> str:
+        return self.commit[:12]
+
+    @property
+    def date(self) -> str:
+        return self.timestamp[:10]
+
+    def with_platform(self, platform: str) -> "BuildContext":
+        return replace(self, platform=platform)
+
+    @staticmethod
+    def from_git(path: str = ".") -> "BuildContext":
+        """ The commit, its refs and message of HEAD in a single git invocation, the build timestamp is now """
+        output = subprocess.run(["git", "log", "-1", "--format=%H%x00%D%x00%B"], cwd=path, capture_output=True, text=True, check=True).stdout
+        (commit, refs, message) = output.split("\0", 2)
+        branch = BRANCH_PATTERN.search(refs)
+        # A detached HEAD (actions/checkout of a pull request or a tag): the ref of the workflow
+        branch = branch.group(1) if branch else os.environ.get("GITHUB_HEAD_REF") or os.environ.get("GITHUB_REF_NAME", "")
+        timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return BuildContext(commit.strip(), message.strip(), timestamp, branch.strip())
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(asdict(self), indent=2))
+
+    @staticmethod
+    def load(path: Path) -> "BuildContext":
+        return BuildContext(**json.loads(path.read_text()))
+
+@cache
+def build_context() -> BuildContext:
+    """ The build context of the process: the one saved by a previous CI step (OKDP_BUILD_CONTEXT), computed otherwise """
+    path = os.environ.get(BUILD_CONTEXT_ENV)
+    if path and Path(path).exists():
+        LOGGER.info(f"Using the build context: {path}")
+        return BuildContext.load(Path(path))
+    return BuildContext.from_git()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--output",
+        required=True,
+        type=Path,
+        help=f"Save the build context (json) to this file, for the next steps (c.f. {BUILD_CONTEXT_ENV})",
+    )
+    arg_parser.add_argument(
+        "--platform",
+        required=False,
+        type=str,
+        choices=["amd64", "arm64"],
+        help="Platform",
+    )
+    args = arg_parser.parse_args()
+
+    context = build_context()
+    context = context.with_platform(args.platform) if args.platform else context
+    context.save(args.output)
+    LOGGER.info(f"Build context: {context}")
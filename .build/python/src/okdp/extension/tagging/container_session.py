@@ -0,0 +1,262 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+A warm container session shared by the tags file, the build history line and the manifest of an image:
+* A single container is started per image (on the first command) and removed once idle or when the session ends
+* Every command run in the session is memoized: the steps asking for the same versions only run them once
+"""
+
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace, TracebackType
+from typing import Iterator
+
+import docker
+from docker.models.containers import Container
+
+from tagging.utils.docker_runner import DockerRunner
+from okdp.extension.tagging.apply_tags import Tagging
+from okdp.extension.tagging.docker_tags import tag_images
+from okdp.extension.tagging.probe_cache import CachedContainer, ProbeCache, image_digest
+from okdp.extension.tagging.version_probe import probe
+from okdp.extension.tagging.write_manifest import Manifest
+from okdp.extension.tagging.write_tags_file import write_tags_file
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+def _key(cmd) -> str | tuple | None:
+    """ The memoization key of a command, None if it can't be memoized """
+    if isinstance(cmd, str):
+        return cmd
+    if isinstance(cmd, (list, tuple)) and all(isinstance(arg, str) for arg in cmd):
+        return tuple(cmd)
+    return None
+
+class ContainerSession:
+    """ One container per image kept alive across the steps, the commands results memoized """
+
+    def __init__(self, image: str, docker_client: docker.DockerClient | None = None, probe_cache: str | None = None,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.name = image
+        self.image = image
+        self.docker_client = docker_client if docker_client else docker.from_env()
+        self.probe_cache = probe_cache
+        self.idle_timeout = idle_timeout
+        self.results: dict[str | tuple, dict] = {}
+        self.starts = 0
+        # command -> lock, a command run concurrently by several steps is only run once
+        self._running: dict[str | tuple, threading.Lock] = {}
+        self._busy = 0
+        self.runner: DockerRunner | None = None
+        self.container: Container | CachedContainer | None = None
+        self._reaper: threading.Timer | None = None
+        # Incremented by every reaper (re)set: a reaper that fired late for an older container is ignored
+        self._reaper_generation = 0
+        self._lock = threading.RLock()
+
+    def _started(self) -> Container | CachedContainer:
+        with self._lock:
+            if self.container is None:
+                if self.probe_cache:
+                    digest = image_digest(self.image, self.docker_client)
+                    self.container = CachedContainer(self.image, digest, ProbeCache(self.probe_cache), self.docker_client)
+                else:
+                    self.runner = DockerRunner(self.image, self.docker_client)
+                    self.container = self.runner.__enter__()
+                self.starts += 1
+            self._reset_reaper()
+            return self.container
+
+    @contextmanager
+    def _in_use(self) -> Iterator[Container | CachedContainer]:
+        """ The (started) container, not reaped until released """
+        with self._lock:
+            container = self._started()
+            self._busy += 1
+        try:
+            yield container
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _reset_reaper(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+        self._reaper_generation += 1
+        self._reaper = threading.Timer(self.idle_timeout, self._reap, args=(self._reaper_generation,))
+        self._reaper.daemon = True
+        self._reaper.start()
+
+    def _reap(self, generation: int) -> None:
+        # The idle check and the removal under the same lock: _started() can't hand out the container being removed
+        with self._lock:
+            if generation != self._reaper_generation or self.container is None:
+                return
+            if self._busy:
+                self._reset_reaper()
+                return
+            LOGGER.info(f"Container session of {self.image} idle for {self.idle_timeout}s, removing its container")
+            self._stop()
+
+    def _stop(self) -> None:
+        with self._lock:
+            if isinstance(self.container, CachedContainer):
+                self.container.close()
+            elif self.runner is not None:
+                self.runner.__exit__(None, None, None)
+            self.runner, self.container = None, None
+
+    def prefetch(self, commands: list[str]) -> None:
+        """ Run the commands not memoized yet in a single exec (version probe) """
+        with self._lock:
+            missing = [command for command in commands if command not in self.results]
+            if not missing:
+                return
+            container = self._started()
+            if isinstance(container, CachedContainer):
+                container.prefetch(missing)
+                return
+            self.results.update(probe(container, missing))
+
+    def exec_run(self, cmd, *args, **kwargs):
+        key = _key(cmd)
+        if key is None or args or kwargs:
+            with self._in_use() as container:
+                return container.exec_run(cmd, *args, **kwargs)
+        with self._lock:
+            lock = self._running.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self.results:
+                with self._in_use() as container:
+                    exec_result = container.exec_run(cmd)
+                self.results[key] = {"exit_code": exec_result.exit_code, "output": exec_result.output.decode(errors="replace")}
+        result = self.results[key]
+        return SimpleNamespace(exit_code=result["exit_code"], output=result["output"].encode())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+            self._stop()
+        LOGGER.info(f"Container session of {self.image} closed: {self.starts} container(s) started, {len(self.results)} commands memoized")
+
+    def __enter__(self) -> "ContainerSession":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+def write_all(tagging: Tagging, manifest: Manifest, tags_dir: Path, hist_lines_dir: Path, manifests_dir: Path, apply: bool = False) -> None:
+    """ The tags file, the build history line and the manifest of the image (and its tags if apply), in the session of tagging and manifest """
+    tags_file = write_tags_file(tagging, tags_dir)
+    if apply:
+        (image, *tags) = tags_file.read_text().splitlines()
+        tag_images({image: tags})
+    manifest.write_all(hist_lines_dir, manifests_dir)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--image-name",
+        required=True,
+        help="Image name:tag",
+    )
+    arg_parser.add_argument(
+        "--registry",
+        required=True,
+        type=str,
+        choices=["quay.io", "ghcr.io"],
+        help="Image registry",
+    )
+    arg_parser.add_argument(
+        "--owner",
+        required=True,
+        help="Owner of the image",
+    )
+    arg_parser.add_argument(
+        "--platform",
+        required=True,
+        type=str,
+        choices=["amd64", "arm64"],
+        help="Platform",
+    )
+    arg_parser.add_argument(
+        "--repository",
+        required=True,
+        help="Repository name on GitHub",
+    )
+    arg_parser.add_argument(
+        "--tags-dir",
+        required=True,
+        type=Path,
+        help="Directory for tags file",
+    )
+    arg_parser.add_argument(
+        "--hist-lines-dir",
+        required=True,
+        type=Path,
+        help="Directory for hist_lines file",
+    )
+    arg_parser.add_argument(
+        "--manifests-dir",
+        required=True,
+        type=Path,
+        help="Directory for manifests file",
+    )
+    arg_parser.add_argument(
+        "--apply-tags",
+        action="store_true",
+        help="Also apply the tags to the image",
+    )
+    arg_parser.add_argument(
+        "--probe-cache",
+        required=False,
+        help="The probe cache (SQLite) of the commands results by image digest",
+    )
+    arg_parser.add_argument(
+        "--idle-timeout",
+        required=False,
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="Remove the container of the session after this number of idle seconds",
+    )
+    arg_parser.add_argument(
+        "--parent-image",
+        required=False,
+        help="The parent image name:tag the image is built from, to report the shared layers. Ex.: scipy-notebook:python3.11-main-latest",
+    )
+    args = arg_parser.parse_args()
+
+    image = f"{args.registry}/{args.owner}/{args.image_name}-{args.platform}"
+    with ContainerSession(image, probe_cache=args.probe_cache, idle_timeout=args.idle_timeout) as session:
+        tagging = Tagging(args.image_name, args.registry, args.owner, args.platform, probe_cache=args.probe_cache, session=session)
+        manifest = Manifest(args.image_name, args.registry, args.owner, args.platform, args.repository, args.probe_cache, session,
+                            parent_image=args.parent_image)
+        write_all(tagging, manifest, args.tags_dir, args.hist_lines_dir, args.manifests_dir, args.apply_tags)
@@ -0,0 +1,151 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Tag and push the images in-process through the Docker API instead of one docker CLI process per tag:
+* A single pooled Docker client is shared by all the tag and push calls
+* The tags are pushed grouped by repository (the shared blobs are uploaded by the first push of the group),
+  the repositories concurrently, with a report of the bytes uploaded vs skipped
+"""
+
+import json
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import cache
+from pathlib import Path
+
+import docker
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_MAX_WORKERS = 4
+SKIPPED_STATUSES = ("Layer already exists", "Mounted from")
+
+@cache
+def docker_client(max_pool_size: int = DEFAULT_POOL_SIZE) -> docker.DockerClient:
+    """ The Docker API client (connection pool) shared by the process """
+    return docker.from_env(max_pool_size=max_pool_size)
+
+def split_tag(image: str) -> tuple[str, str]:
+    """ Ex.: 'localhost:5000/okdp/pyspark-notebook:spark-3.5.6' => ('localhost:5000/okdp/pyspark-notebook', 'spark-3.5.6') """
+    (repository, separator, tag) = image.rpartition(":")
+    if not separator or "/" in tag:
+        return (image, "latest")
+    return (repository, tag)
+
+def tag_images(tags: dict[str, list[str]], client: docker.DockerClient | None = None) -> int:
+    """ Tag every source image with its tags (source image -> tags), the number of tags applied """
+    client = client if client else docker_client()
+    applied = 0
+    for source, source_tags in tags.items():
+        image = client.images.get(source)
+        for tag in source_tags:
+            LOGGER.info(f"Applying tag: {tag}")
+            (repository, tag_name) = split_tag(tag)
+            image.tag(repository, tag_name)
+            applied += 1
+    return applied
+
+@dataclass
+class PushReport:
+    pushed_tags: list[str] = field(default_factory=list)
+    uploaded_layers: int = 0
+    uploaded_bytes: int = 0
+    skipped_layers: int = 0
+    # Only the sizes of the layers uploaded earlier in the same run are known (the registry does not report the others)
+    skipped_bytes: int = 0
+
+    def merge(self, other: "PushReport") -> "PushReport":
+        return PushReport(self.pushed_tags + other.pushed_tags,
+                          self.uploaded_layers + other.uploaded_layers, self.uploaded_bytes + other.uploaded_bytes,
+                          self.skipped_layers + other.skipped_layers, self.skipped_bytes + other.skipped_bytes)
+
+    def summary(self) -> str:
+        return (f"Pushed {len(self.pushed_tags)} tags: {self.uploaded_layers} layers uploaded ({self.uploaded_bytes} bytes), "
+                f"{self.skipped_layers} layers skipped ({self.skipped_bytes} bytes known)")
+
+def push_repository(repository: str, tags: list[str], client: docker.DockerClient) -> PushReport:
+    """ Push the tags of a repository one after the other: the blobs uploaded by the first push are skipped by the others """
+    report = PushReport()
+    layer_sizes: dict[str, int] = {}
+    for tag in tags:
+        LOGGER.info(f"Pushing {repository}:{tag}")
+        for event in client.images.push(repository, tag=tag, stream=True, decode=True):
+            if "error" in event:
+                raise RuntimeError(f"Push of {repository}:{tag} failed: {event['error']}")
+            (status, layer) = (event.get("status", ""), event.get("id"))
+            if status == "Pushing" and event.get("progressDetail", {}).get("total"):
+                layer_sizes[layer] = event["progressDetail"]["total"]
+            elif status == "Pushed":
+                report.uploaded_layers += 1
+                report.uploaded_bytes += layer_sizes.get(layer, 0)
+            elif status.startswith(SKIPPED_STATUSES):
+                report.skipped_layers += 1
+                report.skipped_bytes += layer_sizes.get(layer, 0)
+        report.pushed_tags.append(f"{repository}:{tag}")
+    return report
+
+def push_tags(tags: list[str], client: docker.DockerClient | None = None, max_workers: int = DEFAULT_MAX_WORKERS) -> PushReport:
+    """ Push the tags grouped by repository, at most max_workers repositories at the same time """
+    client = client if client else docker_client()
+    repositories: dict[str, list[str]] = {}
+    for tag in dict.fromkeys(tags):
+        (repository, tag_name) = split_tag(tag)
+        repositories.setdefault(repository, []).append(tag_name)
+    report = PushReport()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for repository_report in executor.map(lambda item: push_repository(*item, client), repositories.items()):
+            report = report.merge(repository_report)
+    LOGGER.info(report.summary())
+    return report
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--tag-plan",
+        required=True,
+        help="The tag plan (json) to apply. c.f. okdp.extension.tagging.batch_tagging --plan-output",
+    )
+    arg_parser.add_argument(
+        "--push",
+        action="store_true",
+        help="Push the source images and their tags",
+    )
+    arg_parser.add_argument(
+        "--max-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The maximum number of repositories pushed at the same time",
+    )
+    arg_parser.add_argument(
+        "--push-report",
+        required=False,
+        help="Write the push report (json) to this file",
+    )
+    args = arg_parser.parse_args()
+
+    plan = json.loads(Path(args.tag_plan).read_text())
+    tag_images(plan["tags"])
+    if args.push:
+        push_report = push_tags([tag for source, tags in plan["tags"].items() for tag in [source, *tags]], max_workers=args.max_workers)
+        if args.push_report:
+            Path(args.push_report).write_text(json.dumps(asdict(push_report), indent=2))
@@ -6,20 +6,15 @@ Extension of the original file:
 * Remove simple form taggers (date_tagger/commit_sha_tagger, etc) which may conflicts with multiple python version built on the same date
 * Add long form tagger to uniquely identify an image
 * Remove the dependency for pyspark-notebook to parent images tags
+* Use the package inventory manifests (okdp.extension.tagging.manifests)
+* Use the commit sha and date taggers of the build context (okdp.extension.tagging.taggers)
 """
 
 from dataclasses import dataclass, field
 
-from tagging.manifests.apt_packages import apt_packages_manifest
-from tagging.manifests.conda_environment import conda_environment_manifest
-from tagging.manifests.julia_packages import julia_packages_manifest
 from tagging.manifests.manifest_interface import ManifestInterface
-from tagging.manifests.r_packages import r_packages_manifest
-from tagging.manifests.spark_info import spark_info_manifest
 
 from tagging.taggers import versions
-from tagging.taggers.date import date_tagger
-from tagging.taggers.sha import commit_sha_tagger
 from tagging.taggers.tagger_interface import TaggerInterface
 from tagging.taggers.ubuntu_version import ubuntu_version_tagger
 
@@ -29,8 +24,17 @@ from okdp.extension.tagging.taggers import (
     java_major_version_tagger,
     scala_tagger,
     scala_major_minor_tagger,
+    commit_sha_tagger,
+    date_tagger,
     LongTagger,
 )
+from okdp.extension.tagging.manifests import (
+    apt_packages_manifest,
+    conda_environment_manifest,
+    julia_packages_manifest,
+    r_packages_manifest,
+    spark_info_manifest,
+)
 
 @dataclass
 class ImageDescription:
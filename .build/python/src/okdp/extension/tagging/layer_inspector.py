@@ -0,0 +1,214 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Container-free tag inference from the image filesystem layers (docker save archive or OCI image layout):
+* The layers are streamed in order and only the files the taggers need are kept (whiteouts applied)
+* The outputs of the tagger commands are derived from the files, the taggers run unchanged against inspected_container()
+"""
+
+import re
+import json
+import logging
+import argparse
+import posixpath
+import tarfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import IO
+
+from okdp.extension.tagging.version_probe import ProbedContainer, _okdp_program_version, _pip_show, _program_version
+
+LOGGER = logging.getLogger(__name__)
+
+CONDA_META_PATTERN = re.compile(r"^opt/conda/conda-meta/(.+)-([^-]+)-([^-]+)\.json$")
+DIST_INFO_PATTERN = re.compile(r"^opt/conda/lib/python[^/]+/site-packages/([^/]+)-([^/-]+)\.dist-info/METADATA$")
+SPARK_RELEASE_PATTERN = re.compile(r"^usr/local/spark[^/]*/RELEASE$")
+SCALA_LIBRARY_PATTERN = re.compile(r"^usr/local/spark[^/]*/jars/scala-library-(.+)\.jar$")
+JDK_RELEASE_PATTERN = re.compile(r"^usr/lib/jvm/[^/]+/release$")
+JULIA_PATTERN = re.compile(r"^opt/julia-(\d[^/]*)/bin/julia$")
+OS_RELEASE_PATHS = ("etc/os-release", "usr/lib/os-release")
+# The files whose content is needed (the other relevant files are identified by their path)
+CONTENT_PATTERNS = (SPARK_RELEASE_PATTERN, JDK_RELEASE_PATTERN)
+
+def is_relevant(path: str) -> bool:
+    return (path in OS_RELEASE_PATHS
+            or any(pattern.match(path) for pattern in (CONDA_META_PATTERN, DIST_INFO_PATTERN, SCALA_LIBRARY_PATTERN, JULIA_PATTERN, *CONTENT_PATTERNS)))
+
+class ImageFilesystem:
+    """ The relevant files of the merged image layers: path -> content (b"" when only the path matters) or symlink target """
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.symlinks: dict[str, str] = {}
+
+    def apply_layer(self, layer: IO[bytes]) -> None:
+        """ Stream a layer tarball (gzip or not) over the lower layers """
+        with tarfile.open(fileobj=layer, mode="r|*") as tar:
+            for member in tar:
+                path = member.name.removeprefix("./")
+                (directory, name) = posixpath.split(path)
+                if name == ".wh..wh..opq":
+                    self._remove(directory, opaque=True)
+                elif name.startswith(".wh."):
+                    self._remove(posixpath.join(directory, name.removeprefix(".wh.")))
+                elif is_relevant(path):
+                    self._remove(path)
+                    if member.issym():
+                        self.symlinks[path] = member.linkname
+                    elif member.isfile():
+                        needs_content = path in OS_RELEASE_PATHS or any(pattern.match(path) for pattern in CONTENT_PATTERNS)
+                        self.files[path] = tar.extractfile(member).read() if needs_content else b""
+
+    def _remove(self, path: str, opaque: bool = False) -> None:
+        prefix = path + "/"
+        for entries in (self.files, self.symlinks):
+            for entry in [entry for entry in entries if entry.startswith(prefix) or (entry == path and not opaque)]:
+                del entries[entry]
+
+    def read(self, path: str) -> bytes | None:
+        for _ in range(8):
+            if path not in self.symlinks:
+                return self.files.get(path)
+            target = self.symlinks[path]
+            path = posixpath.normpath(target.lstrip("/") if target.startswith("/") else posixpath.join(posixpath.dirname(path), target))
+        return None
+
+    def matches(self, pattern: re.Pattern) -> Iterator[re.Match]:
+        return filter(None, (pattern.match(path) for path in sorted(self.files)))
+
+@contextmanager
+def _layers_of_oci_layout(directory: Path, platform: str | None) -> Iterator[list[IO[bytes]]]:
+    def blob(digest: str) -> Path:
+        (algorithm, hex_digest) = digest.split(":")
+        return directory / "blobs" / algorithm / hex_digest
+
+    document = json.loads((directory / "index.json").read_text())
+    while "manifests" in document:
+        # Image index: the requested platform, attestation manifests excluded
+        candidates = [m for m in document["manifests"] if m.get("platform", {}).get("architecture") != "unknown"]
+        if platform:
+            candidates = [m for m in candidates if m.get("platform", {}).get("architecture", platform) == platform]
+        document = json.loads(blob(candidates[0]["digest"]).read_text())
+    files = [open(blob(layer["digest"]), "rb") for layer in document["layers"]]
+    try:
+        yield files
+    finally:
+        for file in files:
+            file.close()
+
+@contextmanager
+def _layers_of_docker_archive(path: Path) -> Iterator[list[IO[bytes]]]:
+    # The outer archive is not compressed: only the headers are read to find the layers
+    with tarfile.open(path, mode="r:") as archive:
+        manifest = json.load(archive.extractfile("manifest.json"))
+        yield [archive.extractfile(layer) for layer in manifest[0]["Layers"]]
+
+def inspect_filesystem(image: str, platform: str | None = None) -> ImageFilesystem:
+    """ image: a docker save archive or an OCI image layout directory """
+    path = Path(image)
+    layers = _layers_of_oci_layout(path, platform) if path.is_dir() else _layers_of_docker_archive(path)
+    filesystem = ImageFilesystem()
+    with layers as files:
+        for (index, file) in enumerate(files):
+            LOGGER.info(f"Reading layer {index + 1}/{len(files)} of {image}")
+            filesystem.apply_layer(file)
+    return filesystem
+
+def _ok(output: str) -> dict:
+    return {"exit_code": 0, "output": output}
+
+def command_outputs(filesystem: ImageFilesystem) -> dict[str, dict]:
+    """ The outputs of the tagger commands (c.f. version_probe.TAGGER_COMMANDS) derived from the image files """
+    outputs = {}
+    conda = {match.group(1): match.group(2) for match in filesystem.matches(CONDA_META_PATTERN)}
+    pip = {match.group(1).lower().replace("_", "-"): match.group(2) for match in filesystem.matches(DIST_INFO_PATTERN)}
+
+    os_release = next(filter(None, map(filesystem.read, OS_RELEASE_PATHS)), None)
+    if os_release is not None:
+        outputs["cat /etc/os-release"] = _ok(os_release.decode())
+    if "python" in conda:
+        outputs[_program_version("python")] = _ok(f"Python {conda['python']}")
+    if "conda" in conda:
+        outputs[_program_version("conda")] = _ok(f"conda {conda['conda']}")
+    if "mamba" in conda:
+        outputs[_program_version("mamba")] = _ok(conda["mamba"])
+    if "jupyterlab" in conda:
+        outputs[_program_version("jupyter-lab")] = _ok(conda["jupyterlab"])
+    if "notebook" in conda:
+        outputs[_program_version("jupyter-notebook")] = _ok(conda["notebook"])
+    jupyterhub = next((conda[name] for name in ("jupyterhub", "jupyterhub-base", "jupyterhub-singleuser") if name in conda), None)
+    if jupyterhub:
+        outputs[_program_version("jupyterhub")] = _ok(jupyterhub)
+    if "r-base" in conda:
+        outputs[_program_version("R")] = _ok(f"R version {conda['r-base']}")
+    julia = next(filesystem.matches(JULIA_PATTERN), None)
+    if julia:
+        outputs[_program_version("julia")] = _ok(f"julia version {julia.group(1)}")
+    for package in ("tensorflow", "tensorflow-cpu", "torch"):
+        if package in pip:
+            outputs[_pip_show(package)] = _ok(f"Name: {package}\nVersion: {pip[package]}")
+
+    jdk_release = next((filesystem.files[match.string] for match in filesystem.matches(JDK_RELEASE_PATTERN)), None)
+    java_version = re.search(rb'JAVA_VERSION="([^"]+)"', jdk_release) if jdk_release else None
+    if java_version:
+        java = f"openjdk {java_version.group(1).decode()}"
+        outputs[_program_version("java")] = outputs[_okdp_program_version("java")] = _ok(java)
+
+    spark_release = next((filesystem.files[match.string] for match in filesystem.matches(SPARK_RELEASE_PATTERN)), None)
+    spark_version = re.search(rb"^Spark (\S+)", spark_release) if spark_release else None
+    scala_library = next(filesystem.matches(SCALA_LIBRARY_PATTERN), None)
+    if spark_version and scala_library:
+        # The lines of the spark-submit --version banner read by the spark and scala taggers
+        spark_submit = "\n".join([
+            f"   /___/ .__/\\_,_/_/ /_/\\_\\   version {spark_version.group(1).decode()}",
+            f"Using Scala version {scala_library.group(1)}, {java if java_version else 'OpenJDK'}",
+        ])
+        outputs[_program_version("spark-submit")] = outputs[_okdp_program_version("spark-submit")] = _ok(spark_submit)
+    return outputs
+
+class UnavailableContainer:
+    """ No container: the commands not derived from the image files fail """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def exec_run(self, cmd, *args, **kwargs):
+        return SimpleNamespace(exit_code=127, output=f"{cmd}: not derived from the image layers".encode())
+
+def inspected_container(image: str, platform: str | None = None) -> ProbedContainer:
+    """ A container answering the tagger commands from the image layers, without running the image """
+    return ProbedContainer(UnavailableContainer(image), command_outputs(inspect_filesystem(image, platform)))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--image-archive",
+        required=True,
+        help="The docker save archive or OCI image layout directory",
+    )
+    arg_parser.add_argument(
+        "--platform",
+        required=False,
+        help="The architecture to read from a multi-platform OCI image layout. Ex.: amd64",
+    )
+    args = arg_parser.parse_args()
+
+    print(json.dumps(command_outputs(inspect_filesystem(args.image_archive, args.platform)), indent=2))
@@ -0,0 +1,237 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Layer and size breakdown of an image, with an estimate of its pull cost:
+* The layers (Dockerfile step, uncompressed size) come from the Docker API image history, the compressed sizes
+  from the registry manifest when the image is pushed (estimated otherwise)
+* The layers shared with the parent image (the BASE_IMAGE of the build) are already on the nodes running the parent image
+* The reports are saved as json next to the manifests: the size regressions are found by comparing two builds
+"""
+
+import os
+import json
+import logging
+import argparse
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import docker
+
+from tagging.manifests.manifest_interface import MarkdownPiece
+
+from okdp.extension.tagging.merge_manifests import platform_manifest
+from okdp.extension.tagging.registry_client import RegistryClient, parse_reference
+
+LOGGER = logging.getLogger(__name__)
+
+# Assumptions of the pull cost estimate (a node pulling from a remote registry)
+DEFAULT_COMPRESSION_RATIO = 0.4
+# bytes per second: 1 Gbit/s download, 200 MB/s extraction
+DEFAULT_BANDWIDTH = 125 * 1000 * 1000
+DEFAULT_EXTRACT_RATE = 200 * 1000 * 1000
+DEFAULT_LAYER_LATENCY = 0.2
+DEFAULT_THRESHOLD = 0.05
+DEFAULT_MIN_BYTES = 10 * 1000 * 1000
+STEP_WIDTH = 100
+
+@dataclass(frozen=True)
+class Layer:
+    step: str
+    size: int
+    # None if the image is not pushed yet
+    compressed_size: int | None = None
+    shared: bool = False
+
+    def estimated_compressed_size(self) -> int:
+        return self.compressed_size if self.compressed_size is not None else int(self.size * DEFAULT_COMPRESSION_RATIO)
+
+@dataclass
+class LayerReport:
+    image: str
+    parent_image: str | None = None
+    layers: list[Layer] = field(default_factory=list)
+
+    def size(self, shared: bool | None = None) -> int:
+        return sum(layer.size for layer in self.layers if shared is None or layer.shared == shared)
+
+    def compressed_size(self, shared: bool | None = None) -> int:
+        return sum(layer.estimated_compressed_size() for layer in self.layers if shared is None or layer.shared == shared)
+
+    def pull_seconds(self, parent_cached: bool = False) -> float:
+        """ Download, extraction and per layer round trips of the layers missing from the node """
+        layers = [layer for layer in self.layers if not (parent_cached and layer.shared)]
+        return round(sum(layer.estimated_compressed_size() / DEFAULT_BANDWIDTH + layer.size / DEFAULT_EXTRACT_RATE + DEFAULT_LAYER_LATENCY
+                         for layer in layers), 1)
+
+    def step_sizes(self) -> dict[str, int]:
+        sizes: dict[str, int] = {}
+        for layer in self.layers:
+            sizes[layer.step] = sizes.get(layer.step, 0) + layer.size
+        return sizes
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(report: dict) -> "LayerReport":
+        return LayerReport(report["image"], report["parent_image"], [Layer(**layer) for layer in report["layers"]])
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=1))
+
+    @staticmethod
+    def load(path: Path) -> "LayerReport":
+        return LayerReport.from_dict(json.loads(path.read_text()))
+
+def history(image: str, client: docker.DockerClient) -> list[dict]:
+    """ The history entries of the local image, the oldest first """
+    return list(client.images.get(image).history())[::-1]
+
+def image_layers(image: str, client: docker.DockerClient, parent_image: str | None = None, compressed_sizes: list[int] | None = None) -> LayerReport:
+    """ The layers of the local image
+        parent_image: the local image it is built from, with its own tag (ex.: the spark images are built from
+                      scipy-notebook:<python dev tag>, c.f. build-spark-images-template.yml)
+        compressed_sizes: the sizes of the registry manifest layers, in order
+    """
+    entries = history(image, client)
+    shared = 0
+    if parent_image:
+        try:
+            parent_entries = history(parent_image, client)
+            # The history of the parent image is the beginning of the history of the image
+            key = lambda entry: (entry.get("Created"), entry.get("CreatedBy"), entry.get("Size"))
+            while shared < min(len(entries), len(parent_entries)) and key(entries[shared]) == key(parent_entries[shared]):
+                shared += 1
+        except docker.errors.DockerException as e:
+            LOGGER.warning(f"Unable to get the history of the parent image {parent_image}, no layer reported as shared: {e}")
+            parent_image = None
+    # The empty layers (ENV, LABEL, ...) are not in the registry manifest
+    layers = [(position, entry) for position, entry in enumerate(entries) if entry.get("Size", 0) > 0]
+    if compressed_sizes is not None and len(compressed_sizes) != len(layers):
+        LOGGER.warning(f"The registry manifest has {len(compressed_sizes)} layers, the history {len(layers)}: the compressed sizes are estimated")
+        compressed_sizes = None
+    return LayerReport(image, parent_image, [
+        Layer(" ".join(entry.get("CreatedBy", "").split()), entry["Size"], compressed_sizes[index] if compressed_sizes else None, position < shared)
+        for index, (position, entry) in enumerate(layers)
+    ])
+
+def registry_compressed_sizes(client: RegistryClient, image: str, architecture: str) -> list[int] | None:
+    """ The sizes of the layers in the registry manifest of the platform image, None if the image is not pushed """
+    (_, repository, reference) = parse_reference(image)
+    descriptor = platform_manifest(client, repository, reference, architecture)
+    if descriptor is None:
+        return None
+    (_, body) = client.get_manifest(repository, descriptor.digest)
+    return [layer["size"] for layer in json.loads(body)["layers"]]
+
+def human_size(size: int) -> str:
+    for unit in ("B", "kB", "MB"):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.2f} GB"
+
+def layers_manifest(report: LayerReport) -> MarkdownPiece:
+    """ The layers table and the pull cost estimate (not a container manifest, c.f. build_info_manifest) """
+    estimated = any(layer.compressed_size is None for layer in report.layers)
+    summary = "\n".join([
+        f"- Image size: {human_size(report.size())} ({human_size(report.compressed_size())} compressed{', estimated' if estimated else ''})",
+        f"- Shared with the parent image `{report.parent_image}`: {human_size(report.size(shared=True))}" if report.parent_image else
+        "- Parent image: not available",
+        f"- Estimated pull time: {report.pull_seconds()}s cold, {report.pull_seconds(parent_cached=True)}s with the parent image on the node",
+    ])
+    rows = [
+        f"| {human_size(layer.size)} | {human_size(layer.estimated_compressed_size())} | {'yes' if layer.shared else 'no'} | "
+        f"`{layer.step[:STEP_WIDTH].replace('|', '&#124;').replace('`', '')}` |"
+        for layer in report.layers
+    ]
+    table = "\n".join(["| Size | Compressed | Shared | Step |", "| ---- | ---------- | ------ | ---- |", *rows])
+    return MarkdownPiece(title="## Image Layers", sections=[summary, table])
+
+def size_regressions(previous: LayerReport, current: LayerReport, threshold: float = DEFAULT_THRESHOLD,
+                     min_bytes: int = DEFAULT_MIN_BYTES) -> list[str]:
+    """ The steps (and the image) grown by more than threshold and min_bytes since the previous build """
+    previous_sizes = previous.step_sizes()
+    sizes = [(step, previous_sizes.get(step, 0), size) for step, size in current.step_sizes().items()]
+    regressions = [
+        f"{human_size(before)} -> {human_size(after)}: {step[:STEP_WIDTH]}"
+        for step, before, after in [("image", previous.size(), current.size()), *sizes]
+        if after - before > min_bytes and after > before * (1 + threshold)
+    ]
+    return regressions
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--image",
+        required=False,
+        help="Print the layers of this local image. Ex.: ghcr.io/okdp/pyspark-notebook:latest-amd64",
+    )
+    arg_parser.add_argument(
+        "--parent-image",
+        required=False,
+        help="The local image the image is built from (BASE_IMAGE), to report the shared layers. Ex.: ghcr.io/okdp/scipy-notebook:python3.11-main-latest-amd64",
+    )
+    arg_parser.add_argument(
+        "--from-registry",
+        action="store_true",
+        help="Read the compressed sizes of the layers from the registry manifest of the image",
+    )
+    arg_parser.add_argument(
+        "--previous",
+        required=False,
+        type=Path,
+        help="The layers report (json) of the previous build. c.f. write_manifest",
+    )
+    arg_parser.add_argument(
+        "--current",
+        required=False,
+        type=Path,
+        help="The layers report (json) of the current build, fails on size regressions since the previous build",
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        required=False,
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="The relative growth of a step (or the image) considered a regression",
+    )
+    arg_parser.add_argument(
+        "--min-bytes",
+        required=False,
+        type=int,
+        default=DEFAULT_MIN_BYTES,
+        help="The growth (bytes) of a step (or the image) below which it is never a regression",
+    )
+    args = arg_parser.parse_args()
+
+    if args.image:
+        sizes = None
+        if args.from_registry:
+            # Same credentials as the docker/login-action step of the workflows
+            registry_client = RegistryClient(parse_reference(args.image)[0], os.environ.get("REGISTRY_USERNAME"), os.environ.get("REGISTRY_PASSWORD"))
+            sizes = registry_compressed_sizes(registry_client, args.image, args.image.rsplit("-", 1)[-1])
+        print(layers_manifest(image_layers(args.image, docker.from_env(), args.parent_image, sizes)).get_str())
+    if args.previous and args.current:
+        found = size_regressions(LayerReport.load(args.previous), LayerReport.load(args.current), args.threshold, args.min_bytes)
+        for regression in found:
+            LOGGER.error(f"Size regression: {regression}")
+        if found:
+            raise SystemExit(f"{len(found)} size regressions since the previous build")
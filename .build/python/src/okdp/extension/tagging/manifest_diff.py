@@ -0,0 +1,231 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Package level diff between build manifests (Markdown of write_manifest, or package inventories):
+* The conda, apt, R, Julia and Spark sections are parsed once into keyed maps (ecosystem -> package -> version)
+* The added, removed, upgraded and downgraded packages are found in linear time, for a pair or the whole history
+"""
+
+import re
+import json
+import logging
+import argparse
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from okdp.extension.tagging.package_inventory import PackageInventory, parse_spark_jars
+
+LOGGER = logging.getLogger(__name__)
+
+# manifest section title -> ecosystem
+SECTIONS = {
+    "## Python Packages": "conda",
+    "## Apt Packages": "apt",
+    "## R Packages": "r",
+    "## Julia Packages": "julia",
+    "## Apache Spark": "spark",
+}
+TABLE_ROW_PATTERN = re.compile(r"^\| (?!Package \|)(?!-)(\S+) \| (\S+) \|$")
+COMMAND_PATTERN = re.compile(r"^`(.+)`:$")
+APT_LINE_PATTERN = re.compile(r"^([^/\s]+)/\S+ (\S+) ")
+R_LINE_PATTERN = re.compile(r'^\S+\s+"([^"]+)"\s+"([^"]+)"$')
+JULIA_LINE_PATTERN = re.compile(r"^\s*\[[0-9a-f]+\]\s+(\S+) v(\S+)")
+SPARK_VERSION_PATTERN = re.compile(r"version (\d+\.\d+\.\d+)")
+SCALA_VERSION_PATTERN = re.compile(r"Using Scala version (\d+\.\d+\.\d+)")
+BUILD_TIMESTAMP_PATTERN = re.compile(r"^- Build timestamp: (\S+)$", re.MULTILINE)
+VERSION_SEPARATORS = re.compile(r"[.\-_+~:]")
+
+def _mamba_list(lines: list[str]) -> dict[str, str]:
+    return {fields[0]: fields[1] for fields in (line.split() for line in lines if not line.startswith("#")) if len(fields) >= 2}
+
+def _apt_list(lines: list[str]) -> dict[str, str]:
+    return {match.group(1): match.group(2) for match in map(APT_LINE_PATTERN.match, lines) if match}
+
+def _r_packages(lines: list[str]) -> dict[str, str]:
+    return {match.group(1): match.group(2) for match in map(R_LINE_PATTERN.match, lines) if match}
+
+def _julia_status(lines: list[str]) -> dict[str, str]:
+    return {match.group(1): match.group(2) for match in map(JULIA_LINE_PATTERN.match, lines) if match}
+
+def _spark_submit(lines: list[str]) -> dict[str, str]:
+    output = "\n".join(lines)
+    packages = {}
+    for (name, pattern) in (("spark", SPARK_VERSION_PATTERN), ("scala", SCALA_VERSION_PATTERN)):
+        match = pattern.search(output)
+        if match:
+            packages[name] = match.group(1)
+    return packages
+
+# The raw command outputs of the upstream manifests (before the package inventory): command prefix -> parser
+COMMAND_PARSERS = {
+    "mamba list": _mamba_list,
+    "apt list --installed": _apt_list,
+    "R --silent -e 'installed.packages": _r_packages,
+    "julia -E 'import Pkg; Pkg.status()'": _julia_status,
+    "/usr/local/spark/bin/spark-submit --version": _spark_submit,
+    "ls /usr/local/spark/jars": lambda lines: parse_spark_jars("\n".join(lines)),
+}
+
+def parse_manifest(markdown: str) -> dict[str, dict[str, str]]:
+    """ ecosystem -> package -> version, from the package tables or the raw command outputs of the sections """
+    packages: dict[str, dict[str, str]] = {}
+    ecosystem, command, block = None, None, None
+    for line in markdown.splitlines():
+        if line.startswith("## "):
+            ecosystem, command = SECTIONS.get(line.strip()), None
+        elif ecosystem is None:
+            continue
+        elif block is not None:
+            if line.startswith("```"):
+                parser = next((parser for prefix, parser in COMMAND_PARSERS.items() if command and command.startswith(prefix)), None)
+                if parser:
+                    packages.setdefault(ecosystem, {}).update(parser(block))
+                block = None
+            else:
+                block.append(line)
+        elif line.startswith("```"):
+            block = []
+        elif COMMAND_PATTERN.match(line):
+            command = COMMAND_PATTERN.match(line).group(1)
+        elif line.startswith("| "):
+            match = TABLE_ROW_PATTERN.match(line)
+            if match:
+                packages.setdefault(ecosystem, {})[match.group(1)] = match.group(2)
+    return packages
+
+def load_packages(path: Path) -> dict[str, dict[str, str]]:
+    """ The packages of a Markdown manifest or a package inventory (json) """
+    if path.suffix == ".json":
+        return PackageInventory.load(path).packages
+    return parse_manifest(path.read_text())
+
+def version_key(version: str) -> tuple:
+    """ Ex.: 1.10.0 > 1.9.2, 2.39-0ubuntu8.4 > 2.39-0ubuntu8 (numbers compared as numbers) """
+    return tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in VERSION_SEPARATORS.split(version))
+
+@dataclass
+class EcosystemDiff:
+    added: dict[str, str] = field(default_factory=dict)
+    removed: dict[str, str] = field(default_factory=dict)
+    # package -> [old version, new version]
+    upgraded: dict[str, list[str]] = field(default_factory=dict)
+    downgraded: dict[str, list[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.upgraded or self.downgraded)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.removed)} removed, "
+                f"{len(self.upgraded)} upgraded, {len(self.downgraded)} downgraded")
+
+def diff_packages(old: dict[str, dict[str, str]], new: dict[str, dict[str, str]]) -> dict[str, EcosystemDiff]:
+    """ ecosystem -> its changes, the unchanged ecosystems omitted """
+    diffs = {}
+    for ecosystem in dict.fromkeys([*old, *new]):
+        (old_packages, new_packages) = (old.get(ecosystem, {}), new.get(ecosystem, {}))
+        diff = EcosystemDiff()
+        for name, version in new_packages.items():
+            old_version = old_packages.get(name)
+            if old_version is None:
+                diff.added[name] = version
+            elif old_version != version:
+                changes = diff.downgraded if version_key(version) < version_key(old_version) else diff.upgraded
+                changes[name] = [old_version, version]
+        diff.removed = {name: version for name, version in old_packages.items() if name not in new_packages}
+        if diff:
+            diffs[ecosystem] = diff
+    return diffs
+
+def render_markdown(diffs: dict[str, EcosystemDiff]) -> str:
+    """ The 'what changed' section """
+    if not diffs:
+        return "## What changed\n\nNo package change"
+    lines = ["## What changed", ""]
+    for ecosystem, diff in diffs.items():
+        lines.append(f"- {ecosystem}: {diff.summary()}")
+        lines += [f"  - added `{name}` {version}" for name, version in diff.added.items()]
+        lines += [f"  - removed `{name}` {version}" for name, version in diff.removed.items()]
+        lines += [f"  - upgraded `{name}` {old} -> {new}" for name, (old, new) in diff.upgraded.items()]
+        lines += [f"  - downgraded `{name}` {old} -> {new}" for name, (old, new) in diff.downgraded.items()]
+    return "\n".join(lines)
+
+def build_timestamp(path: Path) -> str:
+    """ The build timestamp of the Build Info section, at the top of the manifest """
+    with path.open() as manifest:
+        match = BUILD_TIMESTAMP_PATTERN.search(manifest.read(4096))
+    return match.group(1) if match else ""
+
+def history_summaries(paths: list[Path]) -> dict[str, str]:
+    """ manifest -> the changes since the previous build of the same <platform>-<image>
+        The manifests are named <platform>-<image>-<commit hash tag>.md (c.f. write_manifest),
+        every manifest is parsed once and only the previous build of the image is kept in memory
+    """
+    builds: dict[str, list[tuple[str, Path]]] = {}
+    for path in paths:
+        builds.setdefault(path.stem.rsplit("-", 1)[0], []).append((build_timestamp(path), path))
+    summaries = {}
+    for image_builds in builds.values():
+        previous = None
+        for (_, path) in sorted(image_builds):
+            packages = parse_manifest(path.read_text())
+            if previous is not None:
+                diffs = diff_packages(previous, packages)
+                summaries[path.name] = "; ".join(f"{ecosystem}: {diff.summary()}" for ecosystem, diff in diffs.items()) or "No package change"
+            previous = packages
+    return summaries
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--old",
+        required=False,
+        type=Path,
+        help="The previous build manifest (Markdown) or package inventory (json)",
+    )
+    arg_parser.add_argument(
+        "--new",
+        required=False,
+        type=Path,
+        help="The current build manifest (Markdown) or package inventory (json)",
+    )
+    arg_parser.add_argument(
+        "--history",
+        required=False,
+        nargs="*",
+        type=Path,
+        default=[],
+        help="All the build manifests (Markdown): the changes of every build since the previous one of the same image and platform",
+    )
+    arg_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the diff as json instead of Markdown",
+    )
+    args = arg_parser.parse_args()
+
+    if args.history:
+        print(json.dumps(history_summaries(args.history), indent=2))
+    elif args.old and args.new:
+        package_diffs = diff_packages(load_packages(args.old), load_packages(args.new))
+        if args.json:
+            print(json.dumps({ecosystem: asdict(diff) for ecosystem, diff in package_diffs.items()}, indent=2))
+        else:
+            print(render_markdown(package_diffs))
+    else:
+        arg_parser.error("--old and --new, or --history, are required")
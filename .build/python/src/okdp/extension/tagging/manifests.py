@@ -0,0 +1,71 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+"""
+* The conda, apt, R, Julia and Spark manifests list the packages of the typed inventory (package_inventory)
+  instead of the raw command outputs, the other sections (conda info, R --version, ...) are unchanged
+* The build info reads the build context (build_context) and the image size of the layers report (layer_sizes)
+  instead of the git and docker images subprocesses
+"""
+import textwrap
+
+from docker.models.containers import Container
+
+from tagging.manifests.build_info import BuildInfoConfig
+from tagging.manifests.manifest_interface import MarkdownPiece
+from tagging.utils.docker_runner import DockerRunner
+from tagging.utils.quoted_output import quoted_output
+
+from okdp.extension.tagging.build_context import BuildContext
+from okdp.extension.tagging.package_inventory import PACKAGE_COMMANDS, packages_table
+
+class InventoryManifest:
+    """ A manifest (ManifestInterface) whose packages are collected as an inventory, the Markdown rendered from it """
+
+    def __init__(self, name: str, ecosystem: str, title: str, info_commands: tuple[str, ...] = ()):
+        self.__name__ = name
+        self.ecosystem = ecosystem
+        self.title = title
+        self.info_commands = info_commands
+
+    def packages(self, container: Container) -> dict[str, str]:
+        (command, parse) = PACKAGE_COMMANDS[self.ecosystem]
+        return parse(DockerRunner.exec_cmd(container, command))
+
+    def render(self, container: Container, packages: dict[str, str]) -> MarkdownPiece:
+        return MarkdownPiece(
+            title=self.title,
+            sections=[*(quoted_output(container, command) for command in self.info_commands), packages_table(packages)],
+        )
+
+    def __call__(self, container: Container) -> MarkdownPiece:
+        return self.render(container, self.packages(container))
+
+conda_environment_manifest = InventoryManifest(
+    "conda_environment_manifest", "conda", "## Python Packages", ("python --version", "conda info", "mamba info"),
+)
+apt_packages_manifest = InventoryManifest("apt_packages_manifest", "apt", "## Apt Packages")
+r_packages_manifest = InventoryManifest("r_packages_manifest", "r", "## R Packages", ("R --version",))
+julia_packages_manifest = InventoryManifest(
+    "julia_packages_manifest", "julia", "## Julia Packages", ("julia -E 'using InteractiveUtils; versioninfo()'",),
+)
+spark_info_manifest = InventoryManifest(
+    "spark_info_manifest", "spark", "## Apache Spark", ("/usr/local/spark/bin/spark-submit --version",),
+)
+
+def build_info_manifest(config: BuildInfoConfig, context: BuildContext, image_size: str) -> MarkdownPiece:
+    """BuildInfo doesn't fall under common interface, and we run it separately"""
+    build_info = textwrap.dedent(
+        f"""\
+        - Build timestamp: {config.build_timestamp}
+        - Docker image: `{config.full_image()}:{context.commit_tag}`
+        - Docker image size: {image_size}
+        - Git commit SHA: [{context.commit}](https://github.com/{config.repository}/commit/{context.commit})
+        - Git commit message:
+
+        ```text
+        {{message}}
+        ```"""
+    ).format(message=context.message)
+
+    return MarkdownPiece(title="## Build Info", sections=[build_info])
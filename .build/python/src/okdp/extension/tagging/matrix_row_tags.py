@@ -0,0 +1,87 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Deterministic tags from the build matrix row (VersionCompatibilityMatrix):
+* The spark, python major.minor, java major and scala major.minor tagger values are the build args of the row
+* The row is verified against the built image with a single exec reading the installed versions (no spark-submit/java start)
+"""
+
+import json
+import logging
+from collections.abc import Callable
+
+from docker.models.containers import Container
+
+from tagging.taggers import versions
+
+from okdp.extension.matrix.constants import JAVA_VERSION, PYTHON_VERSION, SCALA_VERSION, SPARK_VERSION
+from okdp.extension.tagging.taggers import java_major_version_tagger, scala_major_minor_tagger, spark_tagger
+
+LOGGER = logging.getLogger(__name__)
+
+def scala_version(row: dict) -> str:
+    """ The scala version is blank for the default dist (c.f. normalize_scala_version): 2.12 before spark 4, 2.13 since """
+    if row.get(SCALA_VERSION):
+        return row[SCALA_VERSION]
+    return "2.13" if int(row[SPARK_VERSION].split(".")[0]) >= 4 else "2.12"
+
+# tagger function -> (the matrix row key it depends on, the tagger value from the row)
+ROW_TAGGERS: dict[Callable, tuple[str, Callable[[dict], str]]] = {
+    spark_tagger: (SPARK_VERSION, lambda row: f"spark-{row[SPARK_VERSION]}"),
+    versions.python_major_minor_tagger: (PYTHON_VERSION, lambda row: f"python-{row[PYTHON_VERSION]}"),
+    java_major_version_tagger: (JAVA_VERSION, lambda row: f"java-{row[JAVA_VERSION]}"),
+    scala_major_minor_tagger: (SPARK_VERSION, lambda row: f"scala-{scala_version(row)}"),
+}
+
+# Run in the container: prints the installed versions, at the precision of the matrix row, as JSON
+VERIFY_SCRIPT = """
+import glob, json, os, re, sys
+facts = {"python_version": "%d.%d" % sys.version_info[:2]}
+spark_home = os.environ.get("SPARK_HOME", "/usr/local/spark")
+for release in glob.glob(os.path.join(spark_home, "RELEASE")):
+    facts["spark_version"] = open(release).read().split()[1]
+for jar in glob.glob(os.path.join(spark_home, "jars", "scala-library-*.jar")):
+    facts["scala_version"] = ".".join(re.search(r"scala-library-(.+)[.]jar", jar).group(1).split(".")[:2])
+java_home = os.environ.get("JAVA_HOME") or next(iter(sorted(glob.glob("/usr/lib/jvm/*"))), "")
+for release in glob.glob(os.path.join(java_home, "release")):
+    java_version = re.search(r'JAVA_VERSION="([^"]+)"', open(release).read()).group(1)
+    facts["java_version"] = java_version[2:].split(".")[0] if java_version.startswith("1.") else java_version.split(".")[0]
+print(json.dumps(facts))
+"""
+
+def expected_versions(row: dict) -> dict[str, str]:
+    """ The versions of the row verified in the image """
+    expected = {key: row[key] for key in (PYTHON_VERSION, SPARK_VERSION, JAVA_VERSION) if row.get(key)}
+    if row.get(SPARK_VERSION):
+        expected[SCALA_VERSION] = scala_version(row)
+    return expected
+
+def verify_row(container: Container, row: dict) -> None:
+    """ Fail if the image versions differ from the matrix row, in a single exec """
+    expected = expected_versions(row)
+    exec_result = container.exec_run(["python", "-c", VERIFY_SCRIPT])
+    if exec_result.exit_code != 0:
+        raise ValueError(f"Unable to verify the matrix row {expected} on container {container.name}: {exec_result.output.decode(errors='replace')}")
+    actual = json.loads(exec_result.output.decode())
+    mismatches = [f"{key}={value} (image: {actual.get(key, 'not found')})" for key, value in expected.items() if actual.get(key) != value]
+    if mismatches:
+        raise ValueError(f"The image built on container {container.name} does not match the matrix row: {', '.join(mismatches)}")
+    LOGGER.info(f"Matrix row verified: {expected}")
+
+def row_values(row: dict) -> dict[Callable, str]:
+    """ The values of the row derived tagger functions """
+    return {function: value(row) for function, (key, value) in ROW_TAGGERS.items() if row.get(key)}
@@ -0,0 +1,150 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Registry-native multi-arch manifests, instead of docker pull + docker manifest create/push:
+* The platform images <tag>-<platform> are resolved by HEAD requests (digest, size, media type)
+* The manifest list (OCI index) <tag> is PUT directly to the registry, many tags concurrently
+"""
+
+import os
+import json
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from okdp.extension.tagging.registry_client import (
+    DOCKER_MANIFEST,
+    DOCKER_MANIFEST_LIST,
+    INDEX_TYPES,
+    OCI_INDEX,
+    Descriptor,
+    RegistryClient,
+    parse_reference,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PLATFORMS = ["amd64", "arm64"]
+# The variant of the platform architectures (c.f. the OCI image index specification)
+PLATFORM_VARIANTS = {"arm64": "v8"}
+DEFAULT_MAX_WORKERS = 8
+
+def platform_manifest(client: RegistryClient, repository: str, reference: str, architecture: str) -> Descriptor | None:
+    """ The image manifest of the platform tag. A tag pushed by buildx can be an index (image + attestations) """
+    descriptor = client.head_manifest(repository, reference)
+    if descriptor is None or descriptor.media_type not in INDEX_TYPES:
+        return descriptor
+    (_, body) = client.get_manifest(repository, descriptor.digest)
+    for manifest in json.loads(body)["manifests"]:
+        if manifest.get("platform", {}).get("architecture") == architecture:
+            return Descriptor(manifest["mediaType"], manifest["digest"], manifest["size"])
+    return None
+
+def platform(architecture: str) -> dict:
+    """ Ex.: 'arm64' => {"architecture": "arm64", "os": "linux", "variant": "v8"} """
+    variant = PLATFORM_VARIANTS.get(architecture)
+    return {"architecture": architecture, "os": "linux"} | ({"variant": variant} if variant else {})
+
+def manifest_list(manifests: dict[str, Descriptor]) -> tuple[str, bytes]:
+    """ The manifest list of the platform images (docker manifest list if all the images are docker manifests, OCI index otherwise) """
+    media_type = DOCKER_MANIFEST_LIST if all(d.media_type == DOCKER_MANIFEST for d in manifests.values()) else OCI_INDEX
+    body = {
+        "schemaVersion": 2,
+        "mediaType": media_type,
+        "manifests": [d.to_dict() | {"platform": platform(architecture)} for architecture, d in manifests.items()],
+    }
+    return (media_type, json.dumps(body, indent=3).encode())
+
+def merge_tag(client: RegistryClient, merged_tag: str, platforms: list[str]) -> str | None:
+    """ PUT the manifest list <merged_tag> of the existing <merged_tag>-<platform> images, its digest """
+    (_, repository, tag) = parse_reference(merged_tag)
+    manifests = {}
+    for platform in platforms:
+        descriptor = platform_manifest(client, repository, f"{tag}-{platform}", platform)
+        if descriptor is None:
+            LOGGER.warning(f"Tag {merged_tag}-{platform} doesn't exist, not merged")
+            continue
+        manifests[platform] = descriptor
+    if not manifests:
+        LOGGER.warning(f"No platform image for {merged_tag}")
+        return None
+    (media_type, body) = manifest_list(manifests)
+    digest = client.put_manifest(repository, tag, media_type, body)
+    LOGGER.info(f"Created manifest {merged_tag}@{digest} ({', '.join(manifests)})")
+    return digest
+
+def merge_tags(client: RegistryClient, merged_tags: list[str], platforms: list[str] = DEFAULT_PLATFORMS,
+               max_workers: int = DEFAULT_MAX_WORKERS) -> dict[str, str | None]:
+    """ merged tag -> digest of its manifest list (None if no platform image exists) """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(merged_tags, executor.map(lambda merged_tag: merge_tag(client, merged_tag, platforms), merged_tags)))
+
+def merged_tags_of(tags_files: list[str], platforms: list[str]) -> list[str]:
+    """ The merged tags of the <platform>-<image>.txt files (c.f. write_tags_file): the platform suffix removed """
+    merged_tags = {}
+    for tags_file in tags_files:
+        for tag in Path(tags_file).read_text().splitlines():
+            for platform in platforms:
+                if tag.endswith(f"-{platform}"):
+                    merged_tags[tag.removesuffix(f"-{platform}")] = None
+    return list(merged_tags)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--tags",
+        required=False,
+        nargs="*",
+        default=[],
+        help="The merged tags to create. Ex.: ghcr.io/okdp/pyspark-notebook:spark-3.5.6-python-3.11-java-17-scala-2.13",
+    )
+    arg_parser.add_argument(
+        "--tags-files",
+        required=False,
+        nargs="*",
+        default=[],
+        help="The tags files of the platform images, the merged tags are the tags without the platform suffix",
+    )
+    arg_parser.add_argument(
+        "--platforms",
+        required=False,
+        nargs="*",
+        default=DEFAULT_PLATFORMS,
+        help="Platforms",
+    )
+    arg_parser.add_argument(
+        "--max-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The maximum number of manifests created at the same time",
+    )
+    args = arg_parser.parse_args()
+
+    tags = args.tags + merged_tags_of(args.tags_files, args.platforms)
+    registries = {parse_reference(tag)[0] for tag in tags}
+    if len(registries) != 1:
+        raise SystemExit(f"The merged tags must belong to a single registry: {registries}")
+    # Same credentials as the docker/login-action step of the workflows
+    registry_client = RegistryClient(registries.pop(), os.environ.get("REGISTRY_USERNAME"), os.environ.get("REGISTRY_PASSWORD"))
+    digests = merge_tags(registry_client, tags, args.platforms, args.max_workers)
+    missing = [tag for tag, digest in digests.items() if digest is None]
+    if missing:
+        raise SystemExit(f"No platform image for: {', '.join(missing)}")
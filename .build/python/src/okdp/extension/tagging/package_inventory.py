@@ -0,0 +1,123 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Typed package inventory of an image, filled from structured sources instead of the manifests Markdown:
+* conda (mamba list --json), apt (dpkg-query format string), R and Julia (tab separated), Spark (jars of the distribution)
+* Saved as a compact JSON per image (ecosystem -> package -> version): the cross-build queries are lookups
+"""
+
+import re
+import json
+import logging
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+
+SPARK_JAR_PATTERN = re.compile(r"^(.+?)-(\d[\w.+-]*)\.jar$")
+
+def parse_mamba_list_json(output: str) -> dict[str, str]:
+    return {package["name"]: package["version"] for package in json.loads(output)}
+
+def parse_tab_separated(output: str) -> dict[str, str]:
+    """ One '<name>\t<version>' line per package """
+    packages = {}
+    for line in output.splitlines():
+        (name, separator, version) = line.strip().partition("\t")
+        if name and separator:
+            packages[name] = version.strip()
+    return packages
+
+def parse_spark_jars(output: str) -> dict[str, str]:
+    """ Ex.: spark-core_2.13-3.5.6.jar => spark-core_2.13: 3.5.6 """
+    return {match.group(1): match.group(2) for match in map(SPARK_JAR_PATTERN.match, output.split()) if match}
+
+# ecosystem -> (the command listing the packages, its parser)
+# The commands are split with shlex and run without a shell (c.f. DockerRunner.exec_cmd): no shell expansion nor escape
+# The julia standard libraries have no version of their own (nothing): the version of julia
+PACKAGE_COMMANDS: dict[str, tuple[str, Callable[[str], dict[str, str]]]] = {
+    "conda": ("mamba list --json", parse_mamba_list_json),
+    "apt": ("dpkg-query --show --showformat='${Package}\\t${Version}\\n'", parse_tab_separated),
+    "r": ("Rscript -e 'write.table(installed.packages(.Library)[, c(1,3)], sep=\"\\t\", quote=FALSE, row.names=FALSE, col.names=FALSE)'",
+          parse_tab_separated),
+    "julia": ("julia -e 'import Pkg; for p in values(Pkg.dependencies()); p.is_direct_dep && println(p.name, \"\\t\", something(p.version, VERSION)); end'",
+              parse_tab_separated),
+    "spark": ("ls /usr/local/spark/jars", parse_spark_jars),
+}
+
+@dataclass
+class PackageInventory:
+    image: str
+    # ecosystem -> package name -> version
+    packages: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    def version(self, ecosystem: str, name: str) -> str | None:
+        return self.packages.get(ecosystem, {}).get(name)
+
+    def to_dict(self) -> dict:
+        return {
+            "image": self.image,
+            "packages": {ecosystem: dict(sorted(self.packages[ecosystem].items())) for ecosystem in sorted(self.packages)},
+        }
+
+    @staticmethod
+    def from_dict(inventory: dict) -> "PackageInventory":
+        return PackageInventory(inventory["image"], inventory["packages"])
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=1))
+
+    @staticmethod
+    def load(path: Path) -> "PackageInventory":
+        return PackageInventory.from_dict(json.loads(path.read_text()))
+
+def packages_table(packages: dict[str, str]) -> str:
+    """ The Markdown rendering of the packages of an ecosystem """
+    rows = [f"| {name} | {version} |" for name, version in sorted(packages.items(), key=lambda item: item[0].lower())]
+    return "\n".join(["| Package | Version |", "| ------- | ------- |", *rows])
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--inventories",
+        required=True,
+        nargs="+",
+        type=Path,
+        help="The package inventories (json) of the builds. c.f. write_manifest",
+    )
+    arg_parser.add_argument(
+        "--package",
+        required=True,
+        help="The package whose version is looked up in every build. Ex.: numpy",
+    )
+    arg_parser.add_argument(
+        "--ecosystem",
+        required=False,
+        default="conda",
+        choices=list(PACKAGE_COMMANDS),
+        help="Ecosystem of the package",
+    )
+    args = arg_parser.parse_args()
+
+    for path in args.inventories:
+        inventory = PackageInventory.load(path)
+        print(f"{inventory.image}\t{inventory.version(args.ecosystem, args.package) or '-'}")
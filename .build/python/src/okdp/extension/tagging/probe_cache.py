@@ -0,0 +1,153 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Persistent cache of the commands run on the images by the taggers and manifests:
+* The results are keyed by image digest and command in a SQLite database, bounded in size (LRU eviction)
+* CachedDockerRunner only starts a container for the commands missing from the cache
+"""
+
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from pathlib import Path
+from types import SimpleNamespace, TracebackType
+
+import docker
+from docker.models.containers import Container
+
+from tagging.utils.docker_runner import DockerRunner
+from okdp.extension.tagging.version_probe import probe
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+class ProbeCache:
+    """ (image digest, command) -> (exit code, output) """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(path)) as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS probes("
+                               "digest TEXT, command TEXT, exit_code INTEGER, output TEXT, size INTEGER, last_used INTEGER, "
+                               "PRIMARY KEY (digest, command))")
+
+    def get(self, digest: str, command: str) -> dict | None:
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            row = connection.execute("SELECT exit_code, output FROM probes WHERE digest = ? AND command = ?", (digest, command)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE probes SET last_used = (SELECT MAX(last_used) + 1 FROM probes) WHERE digest = ? AND command = ?", (digest, command))
+        return {"exit_code": row[0], "output": row[1]}
+
+    def put(self, digest: str, results: dict[str, dict]) -> None:
+        """ Store the results of the commands run on the image: {command: {"exit_code": ..., "output": ...}}
+            Only the successful ones: a failure may be transient (OOM, timeout) and the command is run again
+        """
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            for command, result in results.items():
+                if result["exit_code"] != 0:
+                    continue
+                connection.execute("INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(last_used), 0) + 1 FROM probes))",
+                                   (digest, command, result["exit_code"], result["output"], len(result["output"].encode())))
+            self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (total,) = connection.execute("SELECT COALESCE(SUM(size), 0) FROM probes").fetchone()
+        for (digest, command, size) in connection.execute("SELECT digest, command, size FROM probes ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM probes WHERE digest = ? AND command = ?", (digest, command))
+            total -= size
+
+def image_digest(image: str, docker_client: docker.DockerClient) -> str | None:
+    """ The content addressed id of the local image, None if the image is not available """
+    try:
+        return docker_client.images.get(image).id
+    except docker.errors.DockerException as e:
+        LOGGER.warning(f"Unable to get the digest of the image {image}: {e}")
+        return None
+
+class CachedContainer:
+    """ Answers the commands from the probe cache, the container is only started on a cache miss """
+
+    def __init__(self, image: str, digest: str | None, cache: ProbeCache, docker_client: docker.DockerClient):
+        self.name = image
+        self.image = image
+        self.digest = digest
+        self.cache = cache
+        self.docker_client = docker_client
+        self.runner: DockerRunner | None = None
+        self.container: Container | None = None
+        self._lock = threading.Lock()
+
+    def _started(self) -> Container:
+        # The manifest sections run their commands concurrently: a single container is started
+        with self._lock:
+            if self.container is None:
+                self.runner = DockerRunner(self.image, self.docker_client)
+                self.container = self.runner.__enter__()
+            return self.container
+
+    def prefetch(self, commands: list[str]) -> None:
+        """ Run the commands missing from the cache in a single exec (version probe) """
+        if self.digest is None:
+            return
+        missing = [command for command in commands if self.cache.get(self.digest, command) is None]
+        if missing:
+            self.cache.put(self.digest, probe(self._started(), missing))
+        LOGGER.info(f"Probe cache - {len(commands) - len(missing)}/{len(commands)} commands answered from the cache for {self.image}")
+
+    def exec_run(self, cmd, *args, **kwargs):
+        if self.digest is None or not isinstance(cmd, str) or args or kwargs:
+            return self._started().exec_run(cmd, *args, **kwargs)
+        result = self.cache.get(self.digest, cmd)
+        if result is None:
+            exec_result = self._started().exec_run(cmd)
+            result = {"exit_code": exec_result.exit_code, "output": exec_result.output.decode(errors="replace")}
+            self.cache.put(self.digest, {cmd: result})
+        return SimpleNamespace(exit_code=result["exit_code"], output=result["output"].encode())
+
+    def close(self) -> None:
+        if self.runner is not None:
+            self.runner.__exit__(None, None, None)
+            self.runner, self.container = None, None
+
+class CachedDockerRunner:
+    """ DockerRunner consulting the probe cache: a digest hit does not need a container """
+
+    def __init__(self, image_name: str, cache: ProbeCache, docker_client: docker.DockerClient | None = None):
+        self.image_name = image_name
+        self.cache = cache
+        self.docker_client = docker_client if docker_client else docker.from_env()
+        self.container: CachedContainer | None = None
+
+    def __enter__(self) -> CachedContainer:
+        self.container = CachedContainer(self.image_name, image_digest(self.image_name, self.docker_client), self.cache, self.docker_client)
+        return self.container
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        assert self.container is not None
+        self.container.close()
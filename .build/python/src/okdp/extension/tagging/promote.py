@@ -0,0 +1,178 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Registry-side promotion of the dev tagged images (python_dev_tag/spark_dev_tag) to their release tags:
+* The dev tag -> release tags mapping is the tag plan (or the tags files) computed when the images were built
+* The manifests are copied by digest, the blobs of another repository are mounted: no layer is pulled or pushed
+"""
+
+import os
+import json
+import logging
+import argparse
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from okdp.extension.tagging.registry_client import INDEX_TYPES, RegistryClient, parse_reference
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PLATFORMS = ["amd64", "arm64"]
+DEFAULT_MAX_WORKERS = 8
+
+def promotion_plan(tags: dict[str, list[str]], platforms: list[str] = DEFAULT_PLATFORMS, target_owner: str | None = None) -> dict[str, list[str]]:
+    """ dev image -> release tags, for the platform images and their multi-arch manifest (platform suffix removed)
+        target_owner releases into another namespace of the same registry. Ex.: okdp => okdp/jupyter
+    """
+    def retarget(tag: str) -> str:
+        if not target_owner:
+            return tag
+        (registry, repository, reference) = parse_reference(tag)
+        return f"{registry}/{target_owner}/{repository.rsplit('/', 1)[-1]}:{reference}"
+
+    plan: dict[str, list[str]] = {}
+    for source, source_tags in tags.items():
+        plan.setdefault(source, []).extend(retarget(tag) for tag in source_tags)
+        platform = next((platform for platform in platforms if source.endswith(f"-{platform}")), None)
+        if platform:
+            merged = plan.setdefault(source.removesuffix(f"-{platform}"), [])
+            merged.extend(retarget(tag).removesuffix(f"-{platform}") for tag in source_tags if tag.endswith(f"-{platform}"))
+    return {source: list(dict.fromkeys(targets)) for source, targets in plan.items()}
+
+def tags_of_tags_files(tags_files: list[str]) -> dict[str, list[str]]:
+    """ The tags files of write_tags_file: the dev image on the first line, then its tags """
+    tags = {}
+    for tags_file in tags_files:
+        (source, *source_tags) = Path(tags_file).read_text().splitlines()
+        tags[source] = source_tags
+    return tags
+
+class Promoter:
+
+    def __init__(self, client: RegistryClient):
+        self.client = client
+        # (repository, digest) -> lock, the blobs and manifests are copied once even by concurrent promotions
+        self._copies: dict[tuple[str, str], threading.Lock] = {}
+        self._copied: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+
+    def _copy_once(self, repository: str, digest: str, copy: Callable[[], None]) -> None:
+        with self._lock:
+            lock = self._copies.setdefault((repository, digest), threading.Lock())
+        with lock:
+            if (repository, digest) not in self._copied:
+                copy()
+                self._copied.add((repository, digest))
+
+    def _mount(self, source_repository: str, repository: str, digest: str) -> None:
+        if self.client.blob_exists(repository, digest):
+            return
+        if not self.client.mount_blob(repository, digest, source_repository):
+            raise RuntimeError(f"Unable to mount the blob {digest} from {source_repository} into {repository}: "
+                               f"the registry does not support cross repository mounts")
+
+    def copy_manifest(self, source_repository: str, repository: str, reference: str) -> tuple[str, str, bytes]:
+        """ Copy a manifest (by digest) and what it references to another repository: (media type, digest, body) """
+        (descriptor, body) = self.client.get_manifest(source_repository, reference)
+        if source_repository == repository:
+            return (descriptor.media_type, descriptor.digest, body)
+
+        def copy() -> None:
+            manifest = json.loads(body)
+            if descriptor.media_type in INDEX_TYPES:
+                for child in manifest["manifests"]:
+                    self.copy_manifest(source_repository, repository, child["digest"])
+            else:
+                for blob in [manifest["config"], *manifest["layers"]]:
+                    self._copy_once(repository, blob["digest"], lambda: self._mount(source_repository, repository, blob["digest"]))
+            self.client.put_manifest(repository, descriptor.digest, descriptor.media_type, body)
+
+        self._copy_once(repository, descriptor.digest, copy)
+        return (descriptor.media_type, descriptor.digest, body)
+
+    def promote(self, source: str, targets: list[str]) -> str:
+        """ Tag the manifest of the dev image with the release tags, its digest """
+        (registry, source_repository, reference) = parse_reference(source)
+        digest = None
+        for target in targets:
+            (target_registry, repository, tag) = parse_reference(target)
+            if target_registry != registry:
+                raise ValueError(f"Unable to promote {source} to {target}: the images must belong to the same registry")
+            (media_type, digest, body) = self.copy_manifest(source_repository, repository, reference)
+            self.client.put_manifest(repository, tag, media_type, body)
+            LOGGER.info(f"Promoted {source} to {target} ({digest})")
+        return digest
+
+    def promote_all(self, plan: dict[str, list[str]], max_workers: int = DEFAULT_MAX_WORKERS) -> dict[str, str]:
+        """ dev image -> promoted digest """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(plan, executor.map(lambda item: self.promote(*item), plan.items())))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--tag-plan",
+        required=False,
+        help="The tag plan (json) of the dev images. c.f. okdp.extension.tagging.batch_tagging --plan-output",
+    )
+    arg_parser.add_argument(
+        "--tags-files",
+        required=False,
+        nargs="*",
+        default=[],
+        help="The tags files of the dev images. c.f. okdp.extension.tagging.write_tags_file",
+    )
+    arg_parser.add_argument(
+        "--platforms",
+        required=False,
+        nargs="*",
+        default=DEFAULT_PLATFORMS,
+        help="Platforms",
+    )
+    arg_parser.add_argument(
+        "--target-owner",
+        required=False,
+        help="Release the images into this namespace of the same registry. Ex.: okdp/jupyter",
+    )
+    arg_parser.add_argument(
+        "--max-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The maximum number of images promoted at the same time",
+    )
+    arg_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print the promotion plan",
+    )
+    args = arg_parser.parse_args()
+
+    tags = json.loads(Path(args.tag_plan).read_text())["tags"] if args.tag_plan else {}
+    plan = promotion_plan(tags | tags_of_tags_files(args.tags_files), args.platforms, args.target_owner)
+    print(json.dumps(plan, indent=2))
+    if not args.dry_run:
+        registries = {parse_reference(source)[0] for source in plan}
+        if len(registries) != 1:
+            raise SystemExit(f"The dev images must belong to a single registry: {registries}")
+        # Same credentials as the docker/login-action step of the workflows
+        registry_client = RegistryClient(registries.pop(), os.environ.get("REGISTRY_USERNAME"), os.environ.get("REGISTRY_PASSWORD"))
+        Promoter(registry_client).promote_all(plan, args.max_workers)
@@ -0,0 +1,138 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Minimal client of the OCI distribution API (manifests and blob mounts), no image is pulled:
+* A pooled HTTP session is shared by the concurrent calls, the transient errors (429/5xx) are retried with a backoff
+* Bearer token (WWW-Authenticate challenge) and basic authentication, the tokens are cached by scope
+"""
+
+import re
+import logging
+import threading
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from okdp.extension.tagging.docker_tags import split_tag
+
+LOGGER = logging.getLogger(__name__)
+
+DOCKER_MANIFEST = "application/vnd.docker.distribution.manifest.v2+json"
+DOCKER_MANIFEST_LIST = "application/vnd.docker.distribution.manifest.list.v2+json"
+OCI_MANIFEST = "application/vnd.oci.image.manifest.v1+json"
+OCI_INDEX = "application/vnd.oci.image.index.v1+json"
+MANIFEST_TYPES = (OCI_INDEX, DOCKER_MANIFEST_LIST, OCI_MANIFEST, DOCKER_MANIFEST)
+INDEX_TYPES = (OCI_INDEX, DOCKER_MANIFEST_LIST)
+DEFAULT_POOL_SIZE = 16
+CHALLENGE_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+@dataclass(frozen=True)
+class Descriptor:
+    media_type: str
+    digest: str
+    size: int
+
+    def to_dict(self) -> dict:
+        return {"mediaType": self.media_type, "digest": self.digest, "size": self.size}
+
+def parse_reference(image: str) -> tuple[str, str, str]:
+    """ Ex.: 'ghcr.io/okdp/pyspark-notebook:spark-3.5.6' => ('ghcr.io', 'okdp/pyspark-notebook', 'spark-3.5.6') """
+    (repository, tag) = split_tag(image)
+    (registry, _, repository) = repository.partition("/")
+    return (registry, repository, tag)
+
+class RegistryClient:
+
+    def __init__(self, registry: str, username: str | None = None, password: str | None = None,
+                 scheme: str = "https", pool_size: int = DEFAULT_POOL_SIZE):
+        self.base_url = f"{scheme}://{registry}/v2"
+        self.credentials = (username, password) if username else None
+        self.session = requests.Session()
+        # Only the idempotent methods (urllib3 default) are retried: a retried POST could start a second blob upload
+        retries = Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._tokens: dict[tuple[str, ...], str] = {}
+        self._lock = threading.Lock()
+
+    def _token(self, challenge: str, scopes: tuple[str, ...], rejected: str | None = None) -> str:
+        """ The cached token of the scopes, a new one if there is none or the cached one was rejected (expired) """
+        params = dict(CHALLENGE_PATTERN.findall(challenge))
+        with self._lock:
+            if self._tokens.get(scopes) in (None, rejected):
+                response = self.session.get(params["realm"], params={"service": params.get("service"), "scope": list(scopes)}, auth=self.credentials, timeout=30)
+                response.raise_for_status()
+                body = response.json()
+                self._tokens[scopes] = body.get("token") or body["access_token"]
+            return self._tokens[scopes]
+
+    def request(self, method: str, repository: str, path: str, actions: str = "pull", extra_scopes: tuple[str, ...] = (), **kwargs) -> requests.Response:
+        """ A /v2/<repository>/<path> call, authenticated on the first challenge """
+        scopes = (f"repository:{repository}:{actions}", *extra_scopes)
+        url = f"{self.base_url}/{repository}/{path}"
+        headers = kwargs.pop("headers", {})
+        token = self._tokens.get(scopes)
+        response = self.session.request(method, url, headers=headers | ({"Authorization": f"Bearer {token}"} if token else {}), timeout=60, **kwargs)
+        challenge = response.headers.get("WWW-Authenticate", "")
+        if response.status_code == 401 and challenge.lower().startswith("bearer"):
+            headers = headers | {"Authorization": f"Bearer {self._token(challenge, scopes, token)}"}
+            response = self.session.request(method, url, headers=headers, timeout=60, **kwargs)
+        elif response.status_code == 401 and self.credentials:
+            response = self.session.request(method, url, headers=headers, auth=self.credentials, timeout=60, **kwargs)
+        return response
+
+    def head_manifest(self, repository: str, reference: str) -> Descriptor | None:
+        """ The descriptor of a manifest (tag or digest), None if it does not exist """
+        response = self.request("HEAD", repository, f"manifests/{reference}", headers={"Accept": ", ".join(MANIFEST_TYPES)})
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return Descriptor(response.headers["Content-Type"], response.headers["Docker-Content-Digest"], int(response.headers["Content-Length"]))
+
+    def get_manifest(self, repository: str, reference: str) -> tuple[Descriptor, bytes]:
+        """ The manifest as stored in the registry (the exact bytes are kept so that the digest does not change) """
+        response = self.request("GET", repository, f"manifests/{reference}", headers={"Accept": ", ".join(MANIFEST_TYPES)})
+        response.raise_for_status()
+        return (Descriptor(response.headers["Content-Type"], response.headers["Docker-Content-Digest"], len(response.content)), response.content)
+
+    def put_manifest(self, repository: str, reference: str, media_type: str, body: bytes) -> str:
+        """ The digest of the manifest stored under the reference """
+        response = self.request("PUT", repository, f"manifests/{reference}", actions="pull,push", headers={"Content-Type": media_type}, data=body)
+        response.raise_for_status()
+        return response.headers["Docker-Content-Digest"]
+
+    def blob_exists(self, repository: str, digest: str) -> bool:
+        response = self.request("HEAD", repository, f"blobs/{digest}")
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def mount_blob(self, repository: str, digest: str, from_repository: str) -> bool:
+        """ Cross repository blob mount, False if the registry does not support it (the upload session it opened is cancelled) """
+        response = self.request("POST", repository, "blobs/uploads/", actions="pull,push", extra_scopes=(f"repository:{from_repository}:pull",),
+                                params={"mount": digest, "from": from_repository})
+        if response.status_code == 201:
+            return True
+        response.raise_for_status()
+        if "Location" in response.headers:
+            location = response.headers["Location"]
+            self.session.delete(location if location.startswith("http") else self.base_url.removesuffix("/v2") + location, timeout=30)
+        return False
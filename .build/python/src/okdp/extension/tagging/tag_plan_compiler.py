@@ -0,0 +1,99 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compile the taggers of an image (its own and its parents ones) into a deduplicated tag plan before any docker call:
+* The primitive tagger functions shared by the LongTaggers (python version, date, sha, ...) are evaluated once
+* The duplicate LongTaggers and tag values are removed, the time spent by every primitive is reported
+"""
+
+import json
+import time
+import logging
+import argparse
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from docker.models.containers import Container
+
+from tagging.taggers.tagger_interface import TaggerInterface
+
+from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+from okdp.extension.tagging.version_probe import TAGGER_COMMANDS
+
+LOGGER = logging.getLogger(__name__)
+
+def primitive_name(primitive: Callable | TaggerInterface) -> str:
+    return getattr(primitive, "__name__", primitive.__class__.__name__)
+
+@dataclass
+class CompiledTagPlan:
+    """ The primitive taggers and the tags as tuples of primitive positions """
+    primitives: list[Callable | TaggerInterface] = field(default_factory=list)
+    tags: list[tuple[int, ...]] = field(default_factory=list)
+    # primitive name -> seconds, once evaluated
+    costs: dict[str, float] = field(default_factory=dict)
+
+    @staticmethod
+    def compile(taggers: list[TaggerInterface]) -> "CompiledTagPlan":
+        plan = CompiledTagPlan()
+        positions: dict[int, int] = {}
+        for tagger in taggers:
+            # A tagger without primitives (not a LongTagger) is its own primitive
+            primitives = getattr(tagger, "taggers", (tagger,))
+            tag = tuple(positions.setdefault(id(primitive), len(positions)) for primitive in primitives)
+            for primitive in primitives:
+                if positions[id(primitive)] == len(plan.primitives):
+                    plan.primitives.append(primitive)
+            if tag not in plan.tags:
+                plan.tags.append(tag)
+        return plan
+
+    def to_dict(self) -> dict:
+        return {
+            "primitives": [{"name": primitive_name(p), "commands": TAGGER_COMMANDS.get(p, [])} for p in self.primitives],
+            "tags": [[primitive_name(self.primitives[position]) for position in tag] for tag in self.tags],
+        }
+
+    def evaluate(self, container: Container, values: dict[Callable, str] | None = None) -> list[str]:
+        """ The unique tag values. values: the primitive values already known (ex.: from the matrix row) """
+        values = dict(values or {})
+        for primitive in self.primitives:
+            if primitive in values:
+                self.costs[primitive_name(primitive)] = 0.0
+                continue
+            start = time.perf_counter()
+            values[primitive] = primitive(container) if callable(primitive) else primitive.tag_value(container)
+            self.costs[primitive_name(primitive)] = round(time.perf_counter() - start, 3)
+        LOGGER.info(f"Tagging cost per primitive (seconds): {self.costs}")
+        return list(dict.fromkeys("-".join(values[self.primitives[position]] for position in tag) for tag in self.tags))
+
+def compile_tag_plan(image_name: str) -> CompiledTagPlan:
+    taggers, _ = get_taggers_and_manifests(image_name)
+    return CompiledTagPlan.compile(taggers)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--image-name",
+        required=True,
+        help="The image (short name) whose tag plan is compiled. Ex.: pyspark-notebook",
+    )
+    args = arg_parser.parse_args()
+
+    print(json.dumps(compile_tag_plan(args.image_name).to_dict(), indent=2))
@@ -5,6 +5,7 @@
 * Add custom taggers (long form, scala etc taggers)
 * Fix existing SparkVersionTagger when jdk '--add-opens' options are enabled for spark 3.2.x (java 11 compatibility)
 * Unset JDK_JAVA_OPTIONS when asking for java program version
+* The commit sha and date taggers read the build context of the process (build_context) instead of running git/datetime per tag
 """
 
 from functools import cache
@@ -17,6 +18,8 @@ from tagging.utils.docker_runner import DockerRunner
 from tagging.taggers import *
 from tagging.taggers.tagger_interface import TaggerInterface
 
+from okdp.extension.tagging.build_context import build_context
+
 @cache
 def _get_program_version(container: Container, program: str) -> str:
     """"Get program version. Handle compatibility with spark 3.2.x/Java 11"""
@@ -62,6 +65,12 @@ def java_major_version_tagger(container: Container) -> str:
     full_version = java_tagger(container)
     return full_version[: full_version.find(".")]
 
+def commit_sha_tagger(container: Container) -> str:
+    return build_context().commit_tag
+
+def date_tagger(container: Container) -> str:
+    return build_context().date
+
 class LongTagger:
     """Combine multiple tagger functions into one long tag."""
     def __init__(self, *taggers: callable):
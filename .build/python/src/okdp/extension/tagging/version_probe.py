@@ -0,0 +1,162 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Probe all the versions needed by the taggers of an image in a single exec:
+* A python script runs the tagger commands (concurrently) inside the container and prints a JSON snapshot
+* ProbedContainer answers the taggers exec_run calls from the snapshot, the other commands are run on the container
+"""
+
+import json
+import logging
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+
+from docker.models.containers import Container
+
+from tagging.taggers import versions
+from tagging.taggers.ubuntu_version import ubuntu_version_tagger
+from tagging.taggers.tagger_interface import TaggerInterface
+from tagging.utils.docker_runner import DockerRunner
+
+from okdp.extension.tagging import taggers as okdp_taggers
+from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+
+LOGGER = logging.getLogger(__name__)
+
+def _program_version(program: str) -> str:
+    """ c.f. tagging.taggers.versions._get_program_version """
+    return f"{program} --version"
+
+def _okdp_program_version(program: str) -> str:
+    """ c.f. okdp.extension.tagging.taggers._get_program_version """
+    return f"/bin/sh -c 'unset JDK_JAVA_OPTIONS && {program} --version'"
+
+def _pip_show(package: str) -> str:
+    """ c.f. tagging.taggers.versions._get_pip_package_version """
+    return f"pip show {package}"
+
+# The commands run by every tagger function (the other taggers do not exec in the container)
+TAGGER_COMMANDS = {
+    ubuntu_version_tagger: ["cat /etc/os-release"],
+    versions.python_tagger: [_program_version("python")],
+    versions.python_major_minor_tagger: [_program_version("python")],
+    versions.mamba_tagger: [_program_version("mamba")],
+    versions.conda_tagger: [_program_version("conda")],
+    versions.jupyter_notebook_tagger: [_program_version("jupyter-notebook")],
+    versions.jupyter_lab_tagger: [_program_version("jupyter-lab")],
+    versions.jupyter_hub_tagger: [_program_version("jupyterhub")],
+    versions.r_tagger: [_program_version("R")],
+    versions.julia_tagger: [_program_version("julia")],
+    versions.tensorflow_tagger: [_pip_show("tensorflow"), _pip_show("tensorflow-cpu")],
+    versions.pytorch_tagger: [_pip_show("torch")],
+    versions.spark_tagger: [_program_version("spark-submit")],
+    versions.java_tagger: [_program_version("java")],
+    okdp_taggers.spark_tagger: [_okdp_program_version("spark-submit")],
+    okdp_taggers.java_tagger: [_okdp_program_version("java")],
+    okdp_taggers.java_major_version_tagger: [_okdp_program_version("java")],
+    okdp_taggers.scala_tagger: [_okdp_program_version("spark-submit")],
+    okdp_taggers.scala_major_minor_tagger: [_okdp_program_version("spark-submit")],
+}
+
+# Run in the container: the commands are passed as a JSON list, the output mimics exec_run (stdout + stderr)
+PROBE_SCRIPT = """
+import json, subprocess, sys
+from concurrent.futures import ThreadPoolExecutor
+def run(cmd):
+    result = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    return {"exit_code": result.returncode, "output": result.stdout.decode(errors="replace")}
+commands = json.loads(sys.argv[1])
+with ThreadPoolExecutor(max_workers=len(commands) or 1) as executor:
+    print(json.dumps(dict(zip(commands, executor.map(run, commands)))))
+"""
+
+def probe_commands(taggers: list[TaggerInterface]) -> list[str]:
+    """ The commands run by the taggers (LongTagger or simple tagger functions) """
+    functions = [f for tagger in taggers for f in getattr(tagger, "taggers", [tagger])]
+    return list(dict.fromkeys(command for f in functions for command in TAGGER_COMMANDS.get(f, [])))
+
+def probe(container: Container, commands: list[str]) -> dict[str, dict]:
+    """ Run all the commands in a single exec: {command: {"exit_code": ..., "output": ...}}
+        An empty snapshot is returned if the probe fails (ex.: no python in the image)
+    """
+    if not commands:
+        return {}
+    LOGGER.info(f"Probing {len(commands)} commands on container: {container.name}")
+    exec_result = container.exec_run(["python", "-c", PROBE_SCRIPT, json.dumps(commands)])
+    try:
+        if exec_result.exit_code != 0:
+            raise ValueError(f"exit code {exec_result.exit_code}")
+        snapshot = json.loads(exec_result.output.decode())
+        assert isinstance(snapshot, dict)
+        return snapshot
+    except (ValueError, AssertionError, AttributeError) as e:
+        LOGGER.warning(f"Version probe failed ({e}), the taggers commands are run one by one")
+        return {}
+
+class ProbedContainer:
+    """ A container answering the probed commands from the snapshot """
+
+    def __init__(self, container: Container, snapshot: dict[str, dict]):
+        self.container = container
+        self.snapshot = snapshot
+
+    @staticmethod
+    def probe(container: Container, taggers: list[TaggerInterface]) -> "Container | ProbedContainer":
+        # The probe cache containers and the container sessions only probe the commands they don't know yet
+        if hasattr(container, "prefetch"):
+            container.prefetch(probe_commands(taggers))
+            return container
+        return ProbedContainer(container, probe(container, probe_commands(taggers)))
+
+    def exec_run(self, cmd, *args, **kwargs):
+        result = self.snapshot.get(cmd) if isinstance(cmd, str) and not args and not kwargs else None
+        if result is None:
+            return self.container.exec_run(cmd, *args, **kwargs)
+        return SimpleNamespace(exit_code=result["exit_code"], output=result["output"].encode())
+
+    def __getattr__(self, name: str):
+        return getattr(self.container, name)
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--image-name",
+        required=True,
+        help="The image (short name) whose taggers versions are probed. Ex.: pyspark-notebook",
+    )
+    arg_parser.add_argument(
+        "--image",
+        required=True,
+        help="The image to run. Ex.: ghcr.io/okdp/pyspark-notebook:spark3.5.6-python3.11-java17-scala2.13-main-latest",
+    )
+    arg_parser.add_argument(
+        "--output",
+        required=False,
+        help="The JSON snapshot file (default: stdout)",
+    )
+    args = arg_parser.parse_args()
+
+    taggers, _ = get_taggers_and_manifests(args.image_name)
+    with DockerRunner(args.image) as container:
+        snapshot = {"image": args.image, "probes": probe(container, probe_commands(taggers))}
+    if args.output:
+        Path(args.output).write_text(json.dumps(snapshot, indent=2))
+    else:
+        print(json.dumps(snapshot, indent=2))
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+"""
+Modification of the original file:
+* Use the OKDP images hierarchy and image naming (<registry>/<owner>/<image_name>:<tag>-<platform>), c.f. apply_tags
+* Consult the probe cache (image digest + command) before starting a container
+* Run in the warm container of a session shared with the tagging steps (container_session)
+* Collect the manifest sections concurrently (bounded thread pool, same order), with a timing summary next to the manifest
+* Write the package inventory (json) of the image next to the manifest, its Markdown sections are rendered from it
+* Add the layers and sizes of the image, with a pull cost estimate (layer_sizes), saved as json to track the size across builds
+* Read the commit and the build timestamp from the build context of the process (build_context) instead of git subprocesses
+"""
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+import docker
+from docker.models.containers import Container
+
+from tagging.manifests.build_info import BuildInfoConfig
+from tagging.manifests.manifest_interface import ManifestInterface
+from tagging.utils.docker_runner import DockerRunner
+from okdp.extension.tagging.build_context import BuildContext, build_context
+from okdp.extension.tagging.docker_tags import docker_client
+from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+from okdp.extension.tagging.layer_sizes import LayerReport, human_size, image_layers, layers_manifest
+from okdp.extension.tagging.manifests import InventoryManifest, build_info_manifest
+from okdp.extension.tagging.package_inventory import PackageInventory
+from okdp.extension.tagging.probe_cache import CachedDockerRunner, ProbeCache
+from okdp.extension.tagging.version_probe import ProbedContainer
+
+LOGGER = logging.getLogger(__name__)
+
+MARKDOWN_LINE_BREAK = "<br />"
+DEFAULT_MAX_WORKERS = 4
+
+class Manifest:
+
+    def __init__(self, image_name: str, registry: str, owner: str, platform: str, repository: str, probe_cache: str | None = None,
+                 session: Container | None = None, max_workers: int = DEFAULT_MAX_WORKERS, context: BuildContext | None = None,
+                 parent_image: str | None = None):
+        self.image_name, self.tag = image_name.split(":")
+        self.registry = registry
+        self.owner = owner
+        self.platform = platform
+        self.repository = repository
+        self.probe_cache = probe_cache
+        # The warm container of a session (c.f. container_session), left running for the next steps
+        self.session = session
+        self.max_workers = max_workers
+        # We use the build context creation timestamp, which happens right after a build
+        self.context = context if context else build_context().with_platform(platform)
+        # manifest section -> seconds, once collected
+        self.timings: dict[str, float] = {}
+        # The packages listed by the manifests, once collected
+        self.inventory = PackageInventory(f"{self.full_image()}:{self.tag}-{self.platform}")
+        self.layer_report: LayerReport | None = None
+        # The image name:tag it is built from, as the parent-image of the workflows (ex.: scipy-notebook:python3.11-main-latest)
+        self.parent_image = parent_image
+
+    def full_image(self) -> str:
+        return f"{self.registry}/{self.owner}/{self.image_name}"
+
+    def get_build_history_line(self, container: Container, filename: str) -> str:
+        LOGGER.info(f"Calculating build history line for image: {self.image_name}")
+
+        taggers, _ = get_taggers_and_manifests(self.image_name)
+        all_tags = [f"{tagger.tag_value(container)}-{self.platform}" for tagger in taggers]
+
+        date_column = f"`{self.context.timestamp}`"
+        image_column = MARKDOWN_LINE_BREAK.join(
+            f"`{self.full_image()}:{tag_value}`" for tag_value in all_tags
+        )
+        commit_hash = self.context.commit
+        links_column = MARKDOWN_LINE_BREAK.join(
+            [
+                f"[Git diff](https://github.com/{self.repository}/commit/{commit_hash})",
+                f"[Dockerfile](https://github.com/{self.repository}/blob/{commit_hash}/docker-stacks/images/{self.image_name}/Dockerfile)",
+                f"[Build manifest](./{filename})",
+            ]
+        )
+        build_history_line = f"| {date_column} | {image_column} | {links_column} |"
+
+        LOGGER.info(f"Build history line calculated for image: {self.image_name}")
+        return build_history_line
+
+    def get_manifest(self, container: Container, commit_hash_tag: str) -> str:
+        LOGGER.info(f"Calculating manifest file for image: {self.image_name}")
+
+        _, manifests = get_taggers_and_manifests(self.image_name)
+        manifest_names = [manifest.__name__ for manifest in manifests]
+        LOGGER.info(f"Using manifests: {manifest_names}")
+
+        build_info_config = BuildInfoConfig(
+            registry=self.registry,
+            owner=self.owner,
+            image=self.image_name,
+            repository=self.repository,
+            build_timestamp=self.context.timestamp,
+        )
+        image_size = human_size(self.layer_report.size()) if self.layer_report else "unknown"
+
+        markdown_pieces = [
+            f"# Build manifest for image: {self.image_name}:{commit_hash_tag}",
+            build_info_manifest(build_info_config, self.context, image_size).get_str(),
+            *([layers_manifest(self.layer_report).get_str()] if self.layer_report else []),
+            *self.get_sections(container, manifests),
+        ]
+        markdown_content = "\n\n".join(markdown_pieces) + "\n"
+
+        LOGGER.info(f"Manifest file calculated for image: {self.image_name}")
+        return markdown_content
+
+    def get_sections(self, container: Container, manifests: list[ManifestInterface]) -> list[str]:
+        """ The manifest sections, collected by at most max_workers concurrent commands (the slow julia/spark starts overlap) """
+        def timed(manifest: ManifestInterface) -> str:
+            start = time.perf_counter()
+            if isinstance(manifest, InventoryManifest):
+                packages = self.inventory.packages[manifest.ecosystem] = manifest.packages(container)
+                section = manifest.render(container, packages).get_str()
+            else:
+                section = manifest(container).get_str()
+            self.timings[manifest.__name__] = round(time.perf_counter() - start, 3)
+            return section
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            sections = list(executor.map(timed, manifests))
+        self.timings["total"] = round(time.perf_counter() - start, 3)
+        LOGGER.info(f"Manifest sections timings (seconds): {self.timings}")
+        return sections
+
+    def get_layer_report(self, image: str) -> LayerReport | None:
+        """ The layers of the local image (Docker API), None if the image history is not available """
+        try:
+            parent_image = f"{self.registry}/{self.owner}/{self.parent_image}-{self.platform}" if self.parent_image else None
+            return image_layers(image, docker_client(), parent_image)
+        except docker.errors.DockerException as e:
+            LOGGER.warning(f"Unable to get the layers of the image {image}: {e}")
+            return None
+
+    def write_all(self, hist_lines_dir: Path, manifests_dir: Path) -> None:
+        LOGGER.info(f"Writing all files for image: {self.image_name}")
+
+        commit_hash_tag = self.context.commit_tag
+        filename = f"{self.platform}-{self.image_name}-{commit_hash_tag}"
+        image = f"{self.full_image()}:{self.tag}-{self.platform}"
+        taggers, _ = get_taggers_and_manifests(self.image_name)
+        self.inventory.image = f"{self.full_image()}:{commit_hash_tag}-{self.platform}"
+        self.layer_report = self.get_layer_report(image)
+
+        if self.session:
+            runner = nullcontext(self.session)
+        else:
+            runner = CachedDockerRunner(image, ProbeCache(self.probe_cache)) if self.probe_cache else DockerRunner(image)
+        with runner as container:
+            container = ProbedContainer.probe(container, taggers)
+
+            path = hist_lines_dir / f"{filename}.txt"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(self.get_build_history_line(container, filename))
+            LOGGER.info(f"Build history line written to: {path}")
+
+            path = manifests_dir / f"{filename}.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(self.get_manifest(container, commit_hash_tag))
+            LOGGER.info(f"Manifest file written to: {path}")
+
+            path = manifests_dir / f"{filename}-timings.json"
+            path.write_text(json.dumps(self.timings, indent=2))
+            LOGGER.info(f"Manifest timings written to: {path}")
+
+            path = manifests_dir / f"{filename}-packages.json"
+            self.inventory.save(path)
+            LOGGER.info(f"Package inventory written to: {path}")
+
+            if self.layer_report:
+                path = manifests_dir / f"{filename}-layers.json"
+                self.layer_report.save(path)
+                LOGGER.info(f"Layers report written to: {path}")
+
+        LOGGER.info(f"All files written for image: {self.image_name}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    LOGGER.info(f"Current build timestamp: {build_context().timestamp}")
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--image-name",
+        required=True,
+        help="Image name:tag",
+    )
+    arg_parser.add_argument(
+        "--registry",
+        required=True,
+        type=str,
+        choices=["quay.io", "ghcr.io"],
+        help="Image registry",
+    )
+    arg_parser.add_argument(
+        "--owner",
+        required=True,
+        help="Owner of the image",
+    )
+    arg_parser.add_argument(
+        "--platform",
+        required=True,
+        type=str,
+        choices=["amd64", "arm64"],
+        help="Platform",
+    )
+    arg_parser.add_argument(
+        "--hist-lines-dir",
+        required=True,
+        type=Path,
+        help="Directory for hist_lines file",
+    )
+    arg_parser.add_argument(
+        "--manifests-dir",
+        required=True,
+        type=Path,
+        help="Directory for manifests file",
+    )
+    arg_parser.add_argument(
+        "--repository",
+        required=True,
+        help="Repository name on GitHub",
+    )
+    arg_parser.add_argument(
+        "--probe-cache",
+        required=False,
+        help="The probe cache (SQLite) of the commands results by image digest",
+    )
+    arg_parser.add_argument(
+        "--max-workers",
+        required=False,
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="The maximum number of manifest sections collected at the same time",
+    )
+    arg_parser.add_argument(
+        "--parent-image",
+        required=False,
+        help="The parent image name:tag the image is built from, to report the shared layers. Ex.: scipy-notebook:python3.11-main-latest",
+    )
+    args = arg_parser.parse_args()
+
+    manifest = Manifest(args.image_name, args.registry, args.owner, args.platform, args.repository, args.probe_cache,
+                        max_workers=args.max_workers, parent_image=args.parent_image)
+    manifest.write_all(args.hist_lines_dir, args.manifests_dir)
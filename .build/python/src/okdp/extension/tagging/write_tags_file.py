@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+
+"""
+Modification of the original file:
+* Use the OKDP images hierarchy and image naming (<registry>/<owner>/<image_name>:<tag>-<platform>), c.f. apply_tags
+* Consult the probe cache (image digest + command) before starting a container
+"""
+import logging
+import argparse
+from pathlib import Path
+
+from okdp.extension.tagging.apply_tags import Tagging
+
+LOGGER = logging.getLogger(__name__)
+
+def write_tags_file(tagging: Tagging, tags_dir: Path) -> Path:
+    LOGGER.info(f"Writing tags for image: {tagging.image_name}")
+
+    path = tags_dir / f"{tagging.platform}-{tagging.image_name}.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tags = tagging.generate_tags()
+    path.write_text("\n".join(tags))
+
+    LOGGER.info(f"Tags written to: {path}")
+    return path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--image-name",
+        required=True,
+        help="Image name:tag",
+    )
+    arg_parser.add_argument(
+        "--registry",
+        required=True,
+        type=str,
+        choices=["quay.io", "ghcr.io"],
+        help="Image registry",
+    )
+    arg_parser.add_argument(
+        "--owner",
+        required=True,
+        help="Owner of the image",
+    )
+    arg_parser.add_argument(
+        "--platform",
+        required=True,
+        type=str,
+        choices=["amd64", "arm64"],
+        help="Platform",
+    )
+    arg_parser.add_argument(
+        "--tags-dir",
+        required=True,
+        type=Path,
+        help="Directory for tags file",
+    )
+    arg_parser.add_argument(
+        "--probe-cache",
+        required=False,
+        help="The probe cache (SQLite) of the commands results by image digest",
+    )
+    args = arg_parser.parse_args()
+
+    write_tags_file(Tagging(args.image_name, args.registry, args.owner, args.platform, probe_cache=args.probe_cache), args.tags_dir)
@@ -0,0 +1,25 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest.mock import MagicMock, patch
+import pytest
+
+@pytest.fixture
+def mock_docker():
+    """ The tagging modules create a docker client and a plumbum docker command when imported (c.f. DockerRunner) """
+    with patch("docker.from_env", return_value=MagicMock()) as from_env, \
+         patch("plumbum.local", return_value={"docker": MagicMock()}):
+        yield from_env
@@ -0,0 +1,67 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from okdp.extension.benchmarks.compare import compare, report
+from okdp.extension.benchmarks.suite import FakeContainer, matrix_utils_pipeline, run_suite, solver_pipeline, synthetic_compatibility_matrix
+
+def test_fake_container(mock_docker) -> None:
+    from okdp.extension.tagging.taggers import java_tagger, spark_tagger
+    container = FakeContainer(latency_scale=0)
+
+    assert spark_tagger(container) == "spark-3.5.6"
+    assert java_tagger(container) == "java-17.0.16"
+    # The spark-submit and java versions are memoized per container
+    assert spark_tagger(container) == "spark-3.5.6"
+    assert container.exec_count == 2
+
+def test_run_suite(mock_docker) -> None:
+    results = run_suite(sizes=[100], rounds=2, latency_scale=0)
+
+    assert list(results["benchmarks"]) == [
+        "matrix.generate_matrix[100]",
+        "matrix.normalize_scala_version[100]",
+        "matrix.solver[100]",
+        "matrix.matrix_utils[100]",
+        "tagging.get_taggers_and_manifests",
+        "tagging.LongTagger.tag_value[pyspark-notebook]",
+        "tagging.LongTagger.tag_value[all-spark-notebook]",
+        "tagging.CompiledTagPlan.evaluate[pyspark-notebook]",
+    ]
+    assert results["benchmarks"]["matrix.generate_matrix[100]"]["rounds"] == 2
+    assert "peak_memory_mb" in results["benchmarks"]["matrix.solver[100]"]
+    assert list(run_suite(sizes=[100], rounds=1, latency_scale=0, benchmark_filter="tag_value")["benchmarks"]) == [
+        "tagging.LongTagger.tag_value[pyspark-notebook]",
+        "tagging.LongTagger.tag_value[all-spark-notebook]",
+    ]
+
+def test_matrix_pipelines() -> None:
+    compatibility_matrix = synthetic_compatibility_matrix(2_000)
+    build_matrix = {"java_version": ["17"], "scala_version": ["2.13", "2.12"]}
+
+    solved = solver_pipeline(compatibility_matrix, build_matrix)
+
+    assert len(solved) == 1_000
+    assert sorted(solved, key=str) == sorted(matrix_utils_pipeline(compatibility_matrix, build_matrix), key=str)
+
+def test_compare() -> None:
+    baseline = {"benchmarks": {"a": {"median": 1.0}, "b": {"median": 2.0}, "removed": {"median": 1.0}}}
+    current = {"benchmarks": {"a": {"median": 1.1}, "b": {"median": 3.0}, "added": {"median": 1.0}}}
+
+    comparisons = compare(baseline, current)
+
+    assert [comparison.name for comparison in comparisons] == ["a", "b"]
+    assert [comparison.is_regression(0.2) for comparison in comparisons] == [False, True]
+    assert "REGRESSION" in report(comparisons, 0.2).splitlines()[2]
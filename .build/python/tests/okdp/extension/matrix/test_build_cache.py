@@ -0,0 +1,95 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import pytest
+from pathlib import Path
+from extension.matrix.conftest import MockedVersionCompatibilityMatrix
+from okdp.extension.matrix.build_cache import BuildCache, BuildCacheIndex, FINGERPRINT_ANNOTATION
+
+@pytest.fixture
+def repository_root(tmp_path: Path) -> Path:
+    (tmp_path / "scipy-notebook").mkdir()
+    (tmp_path / "scipy-notebook" / "requirements.txt").write_text("pandas\n")
+    (tmp_path / "pyspark-notebook").mkdir()
+    (tmp_path / "pyspark-notebook" / "requirements.txt").write_text("pyarrow\n")
+    return tmp_path
+
+def generate_matrix(compatibility_matrix: list[dict], git_branch: str = "main") -> tuple[list[dict], list[dict]]:
+    vcm = MockedVersionCompatibilityMatrix(compatibility_matrix = compatibility_matrix,
+                                           build_matrix = {"spark_version": "3.2.4"},
+                                           git_branch=git_branch)
+    vcm._normalize_values_()
+    return vcm.generate_matrix()
+
+def test_fingerprint_ignores_git_branch(version_compatibility_matrix_data: list[dict], repository_root: Path) -> None:
+    # Given: the same rows built from two branches
+    (spark_main, python_main) = generate_matrix(version_compatibility_matrix_data, "main")
+    (spark_feature, python_feature) = generate_matrix(version_compatibility_matrix_data, "feature-x")
+    build_cache = BuildCache(BuildCacheIndex(), repository_root)
+
+    # When:
+    build_cache.annotate(spark_main, python_main)
+    build_cache.annotate(spark_feature, python_feature)
+
+    # Then:
+    assert [e["fingerprint"] for e in spark_main] == [e["fingerprint"] for e in spark_feature]
+    assert python_main[0]["fingerprint"] == python_feature[0]["fingerprint"]
+    assert len({e["fingerprint"] for e in spark_main}) == 2
+    assert not any(e["skip"] for e in spark_main)
+
+def test_fingerprint_follows_build_inputs(version_compatibility_matrix_data: list[dict], repository_root: Path) -> None:
+    (spark_before, python_before) = generate_matrix(version_compatibility_matrix_data)
+    BuildCache(BuildCacheIndex(), repository_root).annotate(spark_before, python_before)
+
+    # When: the scipy requirements changed
+    (repository_root / "scipy-notebook" / "requirements.txt").write_text("pandas\npolars\n")
+    (spark_after, python_after) = generate_matrix(version_compatibility_matrix_data)
+    BuildCache(BuildCacheIndex(), repository_root).annotate(spark_after, python_after)
+
+    # Then: the python image and the spark images built on top of it changed
+    assert python_before[0]["fingerprint"] != python_after[0]["fingerprint"]
+    assert spark_before[0]["fingerprint"] != spark_after[0]["fingerprint"]
+
+def test_skip_published_rows(version_compatibility_matrix_data: list[dict], repository_root: Path, tmp_path: Path) -> None:
+    # Given: a first row already pushed
+    (spark_matrix, python_matrix) = generate_matrix(version_compatibility_matrix_data)
+    BuildCache(BuildCacheIndex(), repository_root).annotate(spark_matrix, python_matrix)
+    index = BuildCacheIndex()
+    index.record(spark_matrix[0]["fingerprint"], "sha256:1234")
+    index.save(tmp_path / "index.json")
+
+    # When:
+    (spark_matrix, python_matrix) = generate_matrix(version_compatibility_matrix_data)
+    BuildCache(BuildCacheIndex.load(tmp_path / "index.json"), repository_root).annotate(spark_matrix, python_matrix)
+
+    # Then:
+    assert [(e["skip"], e["digest"]) for e in spark_matrix] == [(True, "sha256:1234"), (False, "")]
+    assert python_matrix[0]["skip"] is False
+
+def test_load_oci_layout_index(tmp_path: Path) -> None:
+    (tmp_path / "index.json").write_text(json.dumps({
+        "schemaVersion": 2,
+        "manifests": [
+            {"digest": "sha256:aaaa", "annotations": {FINGERPRINT_ANNOTATION: "sha256:f1"}},
+            {"digest": "sha256:bbbb", "annotations": {"org.opencontainers.image.ref.name": "latest"}},
+        ],
+    }))
+
+    index = BuildCacheIndex.load(tmp_path)
+
+    assert index.digests == {"sha256:f1": "sha256:aaaa"}
+    assert BuildCacheIndex.load(tmp_path / "missing.json").digests == {}
@@ -0,0 +1,106 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from extension.matrix.conftest import MockedVersionCompatibilityMatrix
+from okdp.extension.matrix.build_dag import BuildDag
+from okdp.extension.matrix.job_packer import BuildHistory
+
+def generate_build_dag(compatibility_matrix: list[dict], build_matrix: dict) -> BuildDag:
+    vcm = MockedVersionCompatibilityMatrix(compatibility_matrix = compatibility_matrix,
+                                           build_matrix = build_matrix,
+                                           git_branch="main")
+    vcm._normalize_values_()
+    return vcm.generate_build_dag()
+
+def test_build_dag_nodes_and_edges(version_compatibility_matrix_data: list[dict]) -> None:
+    # Given: one python version and two spark combinations
+    build_dag = generate_build_dag(version_compatibility_matrix_data, {"spark_version": "3.2.4"})
+
+    # Then: 6 python images + 2 x 2 spark images
+    assert len(build_dag.nodes) == 10
+    assert len(build_dag.edges) == 9
+    pyspark = build_dag.nodes["pyspark-notebook:spark3.2.4-python3.9-java11-scala2.13-main-latest"]
+    assert pyspark.parent == "scipy-notebook:python3.9-main-latest"
+    assert pyspark.key == "spark3.2.4-python3.9-java11-scala2.13"
+    assert pyspark.build_args["spark_version"] == "3.2.4"
+    assert pyspark.level == 4
+    assert build_dag.nodes["docker-stacks-foundation:python3.9-main-latest"].build_args == {"PYTHON_VERSION": "3.9"}
+    assert build_dag.nodes["docker-stacks-foundation:python3.9-main-latest"].key == "base-python3.9"
+
+def test_build_dag_levels(version_compatibility_matrix_data: list[dict]) -> None:
+    build_dag = generate_build_dag(version_compatibility_matrix_data, {"spark_version": "3.2.4"})
+
+    levels = build_dag.levels()
+
+    assert [level["parallelism"] for level in levels] == [1, 1, 1, 2, 3, 2]
+    assert levels[-1]["nodes"] == [
+        "all-spark-notebook:spark3.2.4-python3.9-java11-scala2.12-main-latest",
+        "all-spark-notebook:spark3.2.4-python3.9-java11-scala2.13-main-latest",
+    ]
+
+def test_build_dag_critical_path(version_compatibility_matrix_data: list[dict]) -> None:
+    build_dag = generate_build_dag(version_compatibility_matrix_data, {"spark_version": ["3.2.4", "4.0.1"]})
+
+    # When: unit job durations
+    critical_path = build_dag.critical_path()
+    # Then: the base images job followed by the spark images job
+    assert critical_path["duration"] == 2
+    assert critical_path["nodes"][0].startswith("docker-stacks-foundation:")
+
+    # When: the spark 4 job is the slowest one
+    critical_path = build_dag.critical_path({"spark4.0.1-python3.12-java17-scala2.13": 10})
+    # Then:
+    assert critical_path["duration"] == 11
+    assert critical_path["nodes"] == [
+        "docker-stacks-foundation:python3.12-main-latest",
+        "base-notebook:python3.12-main-latest",
+        "minimal-notebook:python3.12-main-latest",
+        "scipy-notebook:python3.12-main-latest",
+        "pyspark-notebook:spark4.0.1-python3.12-java17-scala2.13-main-latest",
+        "all-spark-notebook:spark4.0.1-python3.12-java17-scala2.13-main-latest",
+    ]
+
+def test_build_dag_with_external_parent() -> None:
+    # Given: a spark row whose python image is already built (delta mode)
+    row = {"python_version": "3.11", "spark_version": "3.5.6", "java_version": "17", "scala_version": "",
+           "hadoop_version": "3", "spark_download_url": "url",
+           "spark_dev_tag": "spark3.5.6-python3.11-java17-scala2.12-main-latest", "python_dev_tag": "python3.11-main-latest"}
+
+    build_dag = BuildDag([row], [])
+
+    assert [level["parallelism"] for level in build_dag.levels()] == [1, 1]
+    assert build_dag.nodes["pyspark-notebook:spark3.5.6-python3.11-java17-scala2.12-main-latest"].parent == "scipy-notebook:python3.11-main-latest"
+    assert build_dag.critical_path()["duration"] == 1
+    assert BuildDag([], []).critical_path() == {"nodes": [], "duration": 0.0}
+
+def test_build_dag_weighted_by_build_history(version_compatibility_matrix_data: list[dict]) -> None:
+    # Given: the build history of the spark jobs, as loaded by the matrix CLI (--build-history)
+    build_dag = generate_build_dag(version_compatibility_matrix_data, {"spark_version": ["3.2.4", "4.0.1"]})
+    history = BuildHistory({
+        "spark3.2.4-python3.9-java11-scala2.12": 600,
+        "spark3.2.4-python3.9-java11-scala2.13": 2400,
+        "spark4.0.1-python3.12-java17-scala2.13": 900,
+    })
+
+    # When:
+    critical_path = build_dag.to_dict(history.durations, history.mean_duration)["critical_path"]
+
+    # Then: the slowest spark job (2400s) after the base images job of its python version (mean duration: 1300s)
+    assert critical_path["duration"] == 3700
+    assert critical_path["nodes"][-2:] == [
+        "pyspark-notebook:spark3.2.4-python3.9-java11-scala2.13-main-latest",
+        "all-spark-notebook:spark3.2.4-python3.9-java11-scala2.13-main-latest",
+    ]
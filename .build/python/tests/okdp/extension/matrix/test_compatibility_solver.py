@@ -0,0 +1,99 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+from types import GeneratorType
+from okdp.extension.matrix.compatibility_solver import CompatibilitySolver
+from okdp.extension.matrix.utils.matrix_utils import group_on, group_versions_by, ignore_invalid_versions, join_versions, normalize_matrix
+
+def legacy_matrix(compatibility_matrix: list[dict], build_matrix: dict) -> list[dict]:
+    return normalize_matrix(ignore_invalid_versions(join_versions(group_versions_by(compatibility_matrix, group_on=group_on), build_matrix)))
+
+def as_sorted_json(rows: list[dict]) -> list[str]:
+    return sorted(json.dumps(row, sort_keys=True) for row in rows)
+
+def test_solver_matches_legacy_pipeline(
+    version_compatibility_matrix_data: list[dict],
+) -> None:
+    # Given: build matrices with and without constraints
+    build_matrices = [
+        {},
+        {"spark_version": ["3.2.4"]},
+        {"spark_version": ["4.0.1"], "scala_version": ["2.13"]},
+        {"python_version": ["3.9", "3.10", "3.11"], "spark_version": ["3.2.4", "3.3.4", "3.4.2", "3.5.0"], "java_version": ["11", "17"], "scala_version": ["2.12"]},
+        {"python_version": ["3.7"]},
+    ]
+    solver = CompatibilitySolver(version_compatibility_matrix_data)
+
+    for build_matrix in build_matrices:
+        # When:
+        actual = list(solver.solve(build_matrix))
+        # Then: same combinations as the list passes
+        assert as_sorted_json(actual) == as_sorted_json(legacy_matrix(version_compatibility_matrix_data, build_matrix))
+
+def test_solver_keeps_compatibility_matrix_order(
+    version_compatibility_matrix_data: list[dict],
+) -> None:
+    # Given: a build matrix listing the scala versions in reverse order
+    solver = CompatibilitySolver(version_compatibility_matrix_data)
+
+    # When:
+    rows = list(solver.solve({"spark_version": ["3.2.4"], "scala_version": ["2.13", "2.12"]}))
+
+    # Then: the values follow the compatibility matrix order
+    assert [row["scala_version"] for row in rows] == ["2.12", "2.13"]
+
+def test_solver_is_lazy(
+    version_compatibility_matrix_data: list[dict],
+) -> None:
+    solver = CompatibilitySolver(version_compatibility_matrix_data)
+
+    rows = solver.solve({})
+
+    assert isinstance(rows, GeneratorType)
+    assert next(rows)["python_version"] == "3.10"
+
+def test_solver_skips_entries_with_missing_versions() -> None:
+    # Given: an entry without any hadoop version
+    solver = CompatibilitySolver([
+        {"python_version": ["3.11"], "spark_version": ["3.5.6"], "java_version": ["17"], "scala_version": ["2.12"], "hadoop_version": [], "spark_download_url": ["url"]},
+    ])
+
+    assert list(solver.solve({})) == []
+
+def test_solver_large_compatibility_matrix() -> None:
+    # Given: every spark patch release x 4 python versions x 3 JDKs
+    compatibility_matrix = [
+        {"python_version": [python_version],
+         "spark_version": [f"3.{minor}.{patch}"],
+         "java_version": [java_version],
+         "scala_version": ["2.12", "2.13"],
+         "hadoop_version": ["3"],
+         "spark_download_url": ["https://archive.apache.org/dist/spark/"]}
+        for minor in range(50)
+        for patch in range(10)
+        for python_version in ["3.10", "3.11", "3.12", "3.13"]
+        for java_version in ["11", "17", "21"]
+    ]
+    solver = CompatibilitySolver(compatibility_matrix)
+
+    # When: only a few entries match
+    rows = list(solver.solve({"spark_version": ["3.5.6", "3.42.1"], "java_version": ["17"]}))
+
+    # Then:
+    assert len(rows) == 2 * 4 * 2
+    assert {row["spark_version"] for row in rows} == {"3.5.6", "3.42.1"}
+    assert len(list(solver.solve({}))) == len(compatibility_matrix) * 2
@@ -0,0 +1,108 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import copy
+from extension.matrix.conftest import MockedVersionCompatibilityMatrix
+from okdp.extension.matrix.delta_matrix import touches_images, SPARK_IMAGES, BASE_IMAGES
+
+def mocked_matrix(compatibility_matrix: list[dict], build_matrix: dict) -> MockedVersionCompatibilityMatrix:
+    vcm = MockedVersionCompatibilityMatrix(compatibility_matrix = copy.deepcopy(compatibility_matrix),
+                                           build_matrix = build_matrix,
+                                           git_branch="main")
+    vcm._normalize_values_()
+    return vcm
+
+def test_touches_images() -> None:
+    assert touches_images(["pyspark-notebook/requirements.txt"], SPARK_IMAGES)
+    assert touches_images(["./docker-stacks/images/pyspark-notebook/Dockerfile"], SPARK_IMAGES)
+    assert not touches_images(["pyspark-notebook-old/Dockerfile", "README.md"], SPARK_IMAGES)
+    assert touches_images(["scipy-notebook/Dockerfile"], BASE_IMAGES)
+    assert touches_images([".build/python/src/okdp/patch/images/pyspark-notebook/setup_spark.py"], SPARK_IMAGES)
+    assert not touches_images([".build/python/src/okdp/patch/images/pyspark-notebook/setup_spark.py"], BASE_IMAGES)
+
+def test_delta_matrix_unchanged(
+    version_compatibility_matrix_data: list[dict],
+) -> None:
+    # Given: the same versions and no changed image
+    current = mocked_matrix(version_compatibility_matrix_data, {})
+    previous = mocked_matrix(version_compatibility_matrix_data, {})
+
+    # When:
+    delta = current.generate_delta_matrix(previous, changed_paths=["README.md"])
+
+    # Then: nothing to build, everything to re-tag
+    assert delta.spark == []
+    assert delta.python == []
+    assert len(delta.spark_unchanged) == 26
+    assert len(delta.python_unchanged) == 4
+
+def test_delta_matrix_new_spark_version(
+    version_compatibility_matrix_data: list[dict],
+) -> None:
+    # Given: a new spark patch release
+    current_data = copy.deepcopy(version_compatibility_matrix_data)
+    current_data[-1]["spark_version"] = ["4.0.1", "4.0.2"]
+    current = mocked_matrix(current_data, {})
+    previous = mocked_matrix(version_compatibility_matrix_data, {})
+
+    # When:
+    delta = current.generate_delta_matrix(previous, changed_paths=[".build/.versions.yml"])
+
+    # Then: only the new combination is built
+    assert [e["spark_dev_tag"] for e in delta.spark] == ["spark4.0.2-python3.12-java17-scala2.13-main-latest"]
+    assert delta.python == []
+    assert len(delta.spark_unchanged) == 26
+
+def test_delta_matrix_changed_download_url(
+    version_compatibility_matrix_data: list[dict],
+) -> None:
+    # Given: spark 3.2.x is downloaded from a new location
+    current_data = copy.deepcopy(version_compatibility_matrix_data)
+    current_data[0]["spark_download_url"] = ["https://github.com/OKDP/spark-images/releases/download/spark-tarballs/"]
+    current = mocked_matrix(current_data, {})
+    previous = mocked_matrix(version_compatibility_matrix_data, {})
+
+    # When:
+    delta = current.generate_delta_matrix(previous, changed_paths=[])
+
+    # Then:
+    assert len(delta.spark) == 8
+    assert {e["spark_version"][:3] for e in delta.spark} == {"3.2"}
+
+def test_delta_matrix_touched_images(
+    version_compatibility_matrix_data: list[dict],
+) -> None:
+    current = mocked_matrix(version_compatibility_matrix_data, {})
+    previous = mocked_matrix(version_compatibility_matrix_data, {})
+
+    # When: the pyspark image changed
+    delta = current.generate_delta_matrix(previous, changed_paths=["pyspark-notebook/Dockerfile"])
+    # Then: every spark combination is rebuilt on top of the existing python images
+    assert len(delta.spark) == 26
+    assert delta.python == []
+
+    # When: the okdp patch of the pyspark image changed
+    delta = current.generate_delta_matrix(previous, changed_paths=[".build/python/src/okdp/patch/images/pyspark-notebook/setup_spark.py"])
+    # Then: every spark combination is rebuilt as well
+    assert len(delta.spark) == 26
+    assert delta.python == []
+
+    # When: the scipy image changed
+    delta = current.generate_delta_matrix(previous, changed_paths=["scipy-notebook/requirements.txt"])
+    # Then: everything is rebuilt
+    assert len(delta.spark) == 26
+    assert len(delta.python) == 4
+    assert delta.spark_unchanged == []
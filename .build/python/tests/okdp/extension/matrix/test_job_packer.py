@@ -0,0 +1,80 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import sqlite3
+import pytest
+from pathlib import Path
+from okdp.extension.matrix.job_packer import BuildHistory, DEFAULT_BUILD_DURATION, history_key, makespan_report, pack_rows
+
+def spark_row(spark_version: str, scala_version: str = "") -> dict:
+    return {"python_version": "3.11", "spark_version": spark_version, "java_version": "17", "scala_version": scala_version}
+
+def test_history_key() -> None:
+    assert history_key(spark_row("3.5.6")) == "spark3.5.6-python3.11-java17-scala2.12"
+    assert history_key(spark_row("3.5.6", "2.13")) == "spark3.5.6-python3.11-java17-scala2.13"
+    assert history_key(spark_row("4.0.1")) == "spark4.0.1-python3.11-java17-scala2.13"
+
+def test_load_history(tmp_path: Path) -> None:
+    # Given: a json history and a SQLite history
+    (tmp_path / "history.json").write_text(json.dumps({"spark3.5.6-python3.11-java17-scala2.12": 600}))
+    with sqlite3.connect(tmp_path / "history.db") as connection:
+        connection.execute("CREATE TABLE build_durations(row_key TEXT, duration REAL)")
+        connection.executemany("INSERT INTO build_durations VALUES (?, ?)",
+                               [("spark3.5.6-python3.11-java17-scala2.12", 500), ("spark3.5.6-python3.11-java17-scala2.12", 700)])
+
+    # Then:
+    assert BuildHistory.load(tmp_path / "history.json").durations == {"spark3.5.6-python3.11-java17-scala2.12": 600.0}
+    assert BuildHistory.load(tmp_path / "history.db").durations == {"spark3.5.6-python3.11-java17-scala2.12": 600.0}
+    assert BuildHistory.load(tmp_path / "missing.json").estimate(spark_row("3.5.6")) == DEFAULT_BUILD_DURATION
+
+def test_estimate_new_combination() -> None:
+    history = BuildHistory({"spark3.5.6-python3.11-java17-scala2.12": 600, "spark3.5.5-python3.11-java17-scala2.12": 1000})
+
+    assert history.estimate(spark_row("3.5.6")) == 600
+    assert history.estimate(spark_row("4.0.1")) == 800
+
+def test_pack_rows_balanced() -> None:
+    # Given: one slow combination and a few fast ones
+    history = BuildHistory({
+        history_key(spark_row("3.5.6")): 3000,
+        history_key(spark_row("3.5.5")): 1000,
+        history_key(spark_row("3.5.4")): 1000,
+        history_key(spark_row("3.5.3")): 1000,
+    })
+    rows = [spark_row("3.5.3"), spark_row("3.5.4"), spark_row("3.5.5"), spark_row("3.5.6")]
+
+    # When:
+    shards = pack_rows(rows, history, shards=2)
+
+    # Then: the slow combination runs alone
+    assert [shard.rows for shard in shards] == [[spark_row("3.5.6")], [spark_row("3.5.3"), spark_row("3.5.4"), spark_row("3.5.5")]]
+    report = makespan_report(shards, history)
+    assert report["makespan"] == 3000
+    assert report["lower_bound"] == 3000
+    assert report["total_build_time"] == 6000
+
+def test_pack_rows_job_ceiling() -> None:
+    rows = [spark_row(f"3.{minor}.{patch}") for minor in range(30) for patch in range(10)]
+
+    shards = pack_rows(rows, BuildHistory(), max_jobs=256)
+
+    assert len(shards) == 256
+    assert sum(len(shard.rows) for shard in shards) == 300
+    assert max(len(shard.rows) for shard in shards) == 2
+    assert pack_rows([], BuildHistory()) == []
+    with pytest.raises(ValueError):
+        pack_rows(rows, BuildHistory(), max_jobs=0)
@@ -0,0 +1,74 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from okdp.extension.matrix.matrix_cache import CompiledMatrix, load_or_compile, versions_sha256
+from okdp.extension.matrix.matrix_query import parse_conditions
+
+VERSIONS = """
+compatibility-matrix:
+  - python_version: ["3.10", "3.11"]
+    spark_version: 3.5.6
+    java_version: 17
+    scala_version: ["2.12", "2.13"]
+    hadoop_version: 3
+    spark_download_url: https://archive.apache.org/dist/spark/
+"""
+
+@pytest.fixture
+def versions_matrix_path(tmp_path: Path) -> str:
+    path = tmp_path / ".versions.yml"
+    path.write_text(VERSIONS)
+    return str(path)
+
+def test_load_or_compile(versions_matrix_path: str, tmp_path: Path) -> None:
+    compiled_matrix_path = str(tmp_path / "matrix.jsonl")
+
+    # When: cache miss
+    compiled = load_or_compile(versions_matrix_path, "feature/x", compiled_matrix_path)
+    # Then:
+    assert len(compiled.matrices["spark"]) == 4
+    assert compiled.select("python") == [
+        {"python_version": "3.10", "python_dev_tag": "python3.10-feature-x-latest"},
+        {"python_version": "3.11", "python_dev_tag": "python3.11-feature-x-latest"},
+    ]
+    assert CompiledMatrix.load(compiled_matrix_path, versions_sha256(versions_matrix_path), "feature/x") == compiled
+
+    # When: the branch or the versions change
+    assert CompiledMatrix.load(compiled_matrix_path, versions_sha256(versions_matrix_path), "main") is None
+    Path(versions_matrix_path).write_text(VERSIONS.replace("3.5.6", "3.5.7"))
+    assert load_or_compile(versions_matrix_path, "feature/x", compiled_matrix_path).matrices["spark"][0]["spark_version"] == "3.5.7"
+
+def test_select(versions_matrix_path: str, tmp_path: Path) -> None:
+    compiled = load_or_compile(versions_matrix_path, "main", str(tmp_path / "matrix.jsonl"))
+
+    rows = compiled.select("spark", parse_conditions(["python_version=3.11", "scala_version=2.13"]))
+
+    assert [row["spark_dev_tag"] for row in rows] == ["spark3.5.6-python3.11-java17-scala2.13-main-latest"]
+    assert compiled.select("spark", parse_conditions(["python_version=3.7"])) == []
+    assert len(compiled.select("spark", parse_conditions(["python_version>3.10"]))) == 2
+
+def test_fast_path_does_not_import_yaml(versions_matrix_path: str, tmp_path: Path) -> None:
+    compiled_matrix_path = str(tmp_path / "matrix.jsonl")
+    load_or_compile(versions_matrix_path, "main", compiled_matrix_path)
+
+    code = ("import sys; from okdp.extension.matrix.matrix_cache import load_or_compile; "
+            f"load_or_compile({versions_matrix_path!r}, 'main', {compiled_matrix_path!r}); "
+            "assert 'yaml' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True, env={"PYTHONPATH": str(Path(__file__).parents[4] / "src")})
@@ -0,0 +1,63 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+from extension.matrix.conftest import MockedVersionCompatibilityMatrix
+from okdp.extension.matrix.matrix_query import Condition, MatrixIndex, parse_conditions, version_key
+
+@pytest.fixture
+def vcm(version_compatibility_matrix_data: list[dict]) -> MockedVersionCompatibilityMatrix:
+    vcm = MockedVersionCompatibilityMatrix(compatibility_matrix = version_compatibility_matrix_data,
+                                           build_matrix = {},
+                                           git_branch="main")
+    vcm._normalize_values_()
+    return vcm
+
+def test_parse_conditions() -> None:
+    assert parse_conditions(["spark_version=3.5.6", "spark_version >= 3.4", "python_version==3.11"]) == [
+        Condition("spark_version", "=", "3.5.6"),
+        Condition("spark_version", ">=", "3.4"),
+        Condition("python_version", "=", "3.11"),
+    ]
+    assert version_key("3.10") > version_key("3.9")
+    with pytest.raises(ValueError):
+        Condition.parse("spark_version~3.5")
+
+def test_equality_query(vcm: MockedVersionCompatibilityMatrix) -> None:
+    # Which images contain spark 3.2.4 with python 3.9
+    rows = vcm.query("spark_version=3.2.4", "python_version=3.9")
+
+    assert [row["spark_dev_tag"] for row in rows] == [
+        "spark3.2.4-python3.9-java11-scala2.12-main-latest",
+        "spark3.2.4-python3.9-java11-scala2.13-main-latest",
+    ]
+    assert vcm.query("spark_version=3.2.4", "python_version=3.12") == []
+    assert vcm.query("python_version=3.9", matrix="python") == [{"python_version": "3.9", "python_dev_tag": "python3.9-main-latest"}]
+
+def test_range_query(vcm: MockedVersionCompatibilityMatrix) -> None:
+    rows = vcm.query("spark_version>=3.4", "spark_version<4")
+
+    assert rows
+    assert all(version_key("3.4") <= version_key(row["spark_version"]) < version_key("4") for row in rows)
+    assert len(rows) + len(vcm.query("spark_version<3.4")) + len(vcm.query("spark_version>=4")) == len(vcm.query())
+    assert vcm.index().distinct("java_version", parse_conditions(["spark_version=4.0.1"])) == ["17"]
+
+def test_matrix_index_is_built_once(vcm: MockedVersionCompatibilityMatrix) -> None:
+    assert vcm.index() is vcm.index("spark")
+
+    index = MatrixIndex([{"spark_version": "3.5.6"}, {"spark_version": "3.10.0"}, {"spark_version": "3.9.1"}])
+    assert index.query(parse_conditions(["spark_version>3.9"])) == [{"spark_version": "3.10.0"}, {"spark_version": "3.9.1"}]
+    assert index.query(parse_conditions(["spark_version<=3.9.1"])) == [{"spark_version": "3.5.6"}, {"spark_version": "3.9.1"}]
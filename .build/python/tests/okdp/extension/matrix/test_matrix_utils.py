@@ -0,0 +1,61 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from okdp.extension.matrix.utils.matrix_utils import join_versions, merge_dicts, normalize_matrix, remove_duplicates
+
+def test_remove_duplicates() -> None:
+    # Given: equal rows with their keys in another order, a "None" string and None, an unhashable value
+    rows = [
+        {"python_version": "3.11", "java_version": ["17"]},
+        {"java_version": ["17"], "python_version": "3.11"},
+        {"python_version": None, "java_version": ["17"]},
+        {"python_version": "None", "java_version": ["17"]},
+        {"python_version": "3.11", "java_version": ("17",)},
+        {"python_version": {"3.11"}},
+        {"python_version": {"3.11"}},
+    ]
+
+    # When:
+    result = remove_duplicates(rows)
+
+    # Then: a list of the first occurrences, in order
+    assert isinstance(result, list)
+    assert result == [rows[0], rows[2], rows[3], rows[4], rows[5]]
+    assert result[0] is rows[0]
+
+def test_join_versions_keeps_order() -> None:
+    # Given:
+    groups = [{"python_version": ["3.12", "3.11", "3.10"], "java_version": ["17"]}]
+
+    # When:
+    result = join_versions(groups, {"python_version": ["3.10", "3.12"]})
+
+    # Then: the values of the groups in their order
+    assert result == [{"python_version": ["3.12", "3.10"], "java_version": ["17"]}]
+
+def test_merge_dicts() -> None:
+    # When:
+    result = merge_dicts({"a": ["1"], "b": ["2"]}, {"a": ["1", "3"]}, {"c": ["4"]})
+
+    # Then:
+    assert result == {"a": ["1", "3"], "b": ["2"], "c": ["4"]}
+
+def test_normalize_matrix() -> None:
+    # When:
+    result = normalize_matrix([{"python_version": ["3.11", "3.12"], "java_version": ["17"]}])
+
+    # Then:
+    assert result == [{"python_version": "3.11", "java_version": "17"}, {"python_version": "3.12", "java_version": "17"}]
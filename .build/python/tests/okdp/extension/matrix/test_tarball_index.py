@@ -0,0 +1,76 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from okdp.extension.matrix.tarball_index import TarballIndex, is_selector, resolve_selectors, versions_from_refs
+from okdp.extension.matrix.version_compatibility_matrix import VersionCompatibilityMatrix
+
+URL = "https://archive.apache.org/dist/spark/"
+AVAILABLE = ["3.4.3", "3.4.4", "3.5.1", "3.5.5", "3.5.6", "4.0.0", "4.0.1"]
+
+def test_versions_from_refs() -> None:
+    # apache archive listing and github release assets
+    assert versions_from_refs(["../", "spark-3.5.6/", "spark-4.0.0-preview2/", "spark-3.10.0/", "KEYS"]) == ["3.5.6", "3.10.0"]
+    assert versions_from_refs(["spark-3.5.6-bin-hadoop3.tgz", "spark-3.5.6-bin-hadoop3-scala2.13.tgz"]) == ["3.5.6"]
+
+def test_resolve_selectors() -> None:
+    assert not is_selector("3.5.6")
+    assert resolve_selectors(["3.5.x"], AVAILABLE) == ["3.5.1", "3.5.5", "3.5.6"]
+    assert resolve_selectors([">=3.4,<4"], AVAILABLE) == ["3.4.3", "3.4.4", "3.5.1", "3.5.5", "3.5.6"]
+    assert resolve_selectors([">=3.4,<4", "latest-patch"], AVAILABLE) == ["3.4.4", "3.5.6"]
+    assert resolve_selectors(["latest-patch"], AVAILABLE) == ["3.4.4", "3.5.6", "4.0.1"]
+    assert resolve_selectors(["3.5.1", "4.0.x"], AVAILABLE) == ["3.5.1", "4.0.0", "4.0.1"]
+
+def test_tarball_index_refresh_and_memoization(tmp_path: Path) -> None:
+    path = str(tmp_path / "tarballs.json")
+    tarball_index = TarballIndex(path)
+
+    # When: not refreshed yet
+    with pytest.raises(ValueError):
+        tarball_index.resolve(["3.5.x"], URL)
+    # When: explicit refresh
+    with patch("okdp.extension.matrix.tarball_index.fetch_refs", return_value=[f"spark-{v}/" for v in AVAILABLE]) as fetch_refs:
+        tarball_index.refresh(URL.rstrip("/"))
+    tarball_index.save()
+
+    # Then: the resolution works offline from the saved index
+    tarball_index = TarballIndex(path)
+    assert fetch_refs.call_count == 1
+    assert tarball_index.resolve(["3.5.x"], URL) == ["3.5.1", "3.5.5", "3.5.6"]
+    assert tarball_index.resolve(["3.5.x"], URL) is tarball_index.resolve(["3.5.x"], URL)
+    assert tarball_index.resolve(["3.5.1"], "https://unknown/") == ["3.5.1"]
+
+def test_version_compatibility_matrix_with_selectors(tmp_path: Path) -> None:
+    (tmp_path / "tarballs.json").write_text(json.dumps({URL: {"versions": AVAILABLE}}))
+    (tmp_path / ".versions.yml").write_text(f"""
+compatibility-matrix:
+  - python_version: 3.11
+    spark_version: ['>=3.4,<4', latest-patch]
+    java_version: 17
+    scala_version: 2.13
+    hadoop_version: 3
+    spark_download_url: {URL}
+""")
+
+    vcm = VersionCompatibilityMatrix(str(tmp_path / ".versions.yml"), "main", TarballIndex(str(tmp_path / "tarballs.json")))
+
+    assert vcm.compatibility_matrix[0]["spark_version"] == ["3.4.4", "3.5.6"]
+    assert [row["spark_version"] for row in vcm.generate_matrix()[0]] == ["3.4.4", "3.5.6"]
+    with pytest.raises(ValueError):
+        VersionCompatibilityMatrix(str(tmp_path / ".versions.yml"), "main")
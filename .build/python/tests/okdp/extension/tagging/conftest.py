@@ -14,6 +14,8 @@
 # limitations under the License.
 #
 
+import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 import pytest
 
@@ -28,6 +30,8 @@ mock_docker_cmd = MagicMock()
 patcher_plumbum = patch("plumbum.local", return_value={"docker": mock_docker_cmd})
 patcher_plumbum.start()
 
+from okdp.extension.tagging.build_context import BuildContext
+
 @pytest.fixture
 def mock_container():
     """Fake docker container object"""
@@ -120,6 +124,62 @@ def mock_apply_tags_docker_runner(mock_container):
 
 @pytest.fixture
 def mock_apply_tags_docker():
-    """Patch apply_tags.docker (plumbum.local['docker'])."""
-    with patch("okdp.extension.tagging.apply_tags.docker") as mock_docker:
-        yield mock_docker
+    """Patch the Docker client of docker_tags (image.tag and push calls)."""
+    with patch("okdp.extension.tagging.docker_tags.docker_client") as mock_client:
+        yield mock_client.return_value
+
+SPARK_SUBMIT_VERSION = "\n".join([
+    "   /___/ .__/\\_,_/_/ /_/\\_\\   version 3.5.6",
+    "Using Scala version 2.13.8, OpenJDK 64-Bit Server VM, 17.0.16",
+])
+
+@pytest.fixture
+def canned_outputs() -> dict[str, str]:
+    """Outputs of the tagger commands in the fake containers"""
+    return {
+        "cat /etc/os-release": 'VERSION_ID="24.04"',
+        "python --version": "Python 3.11.13",
+        "jupyterhub --version": "5.3.0",
+        "jupyter-lab --version": "4.4.5",
+        "/bin/sh -c 'unset JDK_JAVA_OPTIONS && spark-submit --version'": SPARK_SUBMIT_VERSION,
+        "/bin/sh -c 'unset JDK_JAVA_OPTIONS && java --version'": "openjdk 17.0.16 2025-07-15",
+    }
+
+class FakeContainer:
+    """Answers the single probe exec (list command) and the one by one execs (str command)"""
+    name = "fake"
+
+    def __init__(self, outputs: dict[str, str], default: str | None = None):
+        self.outputs = outputs
+        # The output of the other commands, 'not found' (exit code 127) if None
+        self.default = default
+        self.execs = []
+        self.removed = False
+
+    def remove(self, force: bool = False):
+        self.removed = True
+
+    def _run(self, command: str) -> tuple[int, str]:
+        if command in self.outputs:
+            return (0, self.outputs[command])
+        return (127, "not found") if self.default is None else (0, self.default)
+
+    def exec_run(self, cmd):
+        self.execs.append(cmd)
+        if isinstance(cmd, list):
+            results = {command: dict(zip(("exit_code", "output"), self._run(command))) for command in json.loads(cmd[-1])}
+            return SimpleNamespace(exit_code=0, output=json.dumps(results).encode())
+        (exit_code, output) = self._run(cmd)
+        return SimpleNamespace(exit_code=exit_code, output=output.encode())
+
+@pytest.fixture
+def fake_container(canned_outputs):
+    """Factory of fake containers answering the tagger commands with canned_outputs (and the extra outputs)"""
+    def create(extra_outputs: dict[str, str] | None = None, default: str | None = None) -> FakeContainer:
+        return FakeContainer(canned_outputs | (extra_outputs or {}), default)
+    return create
+
+@pytest.fixture
+def fake_build_context():
+    """Fixed build context (commit, message, timestamp, branch, platform)"""
+    return BuildContext("0123456789abcdef0123456789abcdef01234567", "Build the images", "2026-01-05T05:00:00Z", "main", "amd64")
@@ -0,0 +1,122 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import re
+import json
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from okdp.extension.tagging.registry_client import DOCKER_MANIFEST
+
+PATH_PATTERN = re.compile(r"^/v2/(.+)/(manifests|blobs)/(.*)$")
+TOKEN = "secret-token"
+
+def digest_of(body: bytes) -> str:
+    return f"sha256:{hashlib.sha256(body).hexdigest()}"
+
+class FakeRegistry:
+    """ In-process OCI distribution API: manifests (by tag and digest), blobs, cross repository mounts and bearer tokens """
+
+    def __init__(self, mounts: bool = True):
+        self.manifests: dict[tuple[str, str], tuple[str, bytes]] = {}
+        self.blobs: set[tuple[str, str]] = set()
+        self.mounts = mounts
+        self.requests: list[tuple[str, str]] = []
+        self.mounted: list[tuple[str, str]] = []
+        # Replaced to expire the tokens already issued
+        self.token = TOKEN
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.registry = f"127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def push_image(self, repository: str, tag: str, layers: list[bytes], media_type: str = DOCKER_MANIFEST) -> str:
+        """ Store an image manifest (and its blobs) under the tag, its digest """
+        config = json.dumps({"architecture": tag.rsplit("-", 1)[-1]}).encode()
+        for blob in [config, *layers]:
+            self.blobs.add((repository, digest_of(blob)))
+        manifest = json.dumps({
+            "schemaVersion": 2,
+            "mediaType": media_type,
+            "config": {"mediaType": "application/vnd.docker.container.image.v1+json", "digest": digest_of(config), "size": len(config)},
+            "layers": [{"mediaType": "application/vnd.docker.image.rootfs.diff.tar.gzip", "digest": digest_of(layer), "size": len(layer)} for layer in layers],
+        }).encode()
+        return self.put(repository, tag, media_type, manifest)
+
+    def put(self, repository: str, reference: str, media_type: str, body: bytes) -> str:
+        digest = digest_of(body)
+        self.manifests[(repository, reference)] = self.manifests[(repository, digest)] = (media_type, body)
+        return digest
+
+    def _handler(self):
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, headers: dict | None = None, body: bytes = b""):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _route(self):
+                url = urlparse(self.path)
+                registry.requests.append((self.command, url.path))
+                if url.path == "/token":
+                    return self._reply(200, body=json.dumps({"token": registry.token}).encode())
+                if self.headers.get("Authorization") != f"Bearer {registry.token}":
+                    challenge = f'Bearer realm="http://{registry.registry}/token",service="fake"'
+                    return self._reply(401, {"WWW-Authenticate": challenge})
+                (repository, kind, reference) = PATH_PATTERN.match(url.path).groups()
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if kind == "manifests" and self.command == "PUT":
+                    digest = registry.put(repository, reference, self.headers["Content-Type"], body)
+                    return self._reply(201, {"Docker-Content-Digest": digest})
+                if kind == "manifests":
+                    if (repository, reference) not in registry.manifests:
+                        return self._reply(404)
+                    (media_type, manifest) = registry.manifests[(repository, reference)]
+                    headers = {"Content-Type": media_type, "Docker-Content-Digest": digest_of(manifest)}
+                    if self.command == "HEAD":
+                        self.send_response(200)
+                        for name, value in (headers | {"Content-Length": str(len(manifest))}).items():
+                            self.send_header(name, value)
+                        return self.end_headers()
+                    return self._reply(200, headers, manifest)
+                if self.command == "POST":
+                    query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                    if registry.mounts and (query["from"], query["mount"]) in registry.blobs:
+                        registry.blobs.add((repository, query["mount"]))
+                        registry.mounted.append((repository, query["mount"]))
+                        return self._reply(201, {"Docker-Content-Digest": query["mount"]})
+                    return self._reply(202, {"Location": f"/v2/{repository}/blobs/uploads/session"})
+                if self.command == "DELETE":
+                    return self._reply(204)
+                return self._reply(200 if (repository, reference) in registry.blobs else 404)
+
+            do_GET = do_HEAD = do_PUT = do_POST = do_DELETE = _route
+
+        return Handler
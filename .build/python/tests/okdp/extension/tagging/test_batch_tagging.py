@@ -0,0 +1,72 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest.mock import MagicMock
+
+from okdp.extension.tagging.batch_tagging import BatchTagging, TaggingJob, TagPlan, jobs_from_matrix
+
+ROWS = [
+    {"python_version": "3.11", "spark_version": "3.5.6", "spark_dev_tag": "spark3.5.6-python3.11-java17-scala2.12-main-latest", "python_dev_tag": "python3.11-main-latest"},
+    {"python_version": "3.11", "spark_version": "4.0.1", "spark_dev_tag": "spark4.0.1-python3.11-java17-scala2.13-main-latest", "python_dev_tag": "python3.11-main-latest"},
+]
+
+class FakeTagger:
+    def tag_value(self, container):
+        if "4.0.1" in str(container.image):
+            raise AssertionError("spark-submit failed")
+        return "tag1"
+
+def test_jobs_from_matrix():
+    jobs = jobs_from_matrix(ROWS, ["scipy-notebook", "pyspark-notebook"], ["amd64", "arm64"])
+
+    assert [(job.image_name, job.platform) for job in jobs] == [
+        ("scipy-notebook:python3.11-main-latest", "amd64"),
+        ("scipy-notebook:python3.11-main-latest", "arm64"),
+        ("pyspark-notebook:spark3.5.6-python3.11-java17-scala2.12-main-latest", "amd64"),
+        ("pyspark-notebook:spark3.5.6-python3.11-java17-scala2.12-main-latest", "arm64"),
+        ("pyspark-notebook:spark4.0.1-python3.11-java17-scala2.13-main-latest", "amd64"),
+        ("pyspark-notebook:spark4.0.1-python3.11-java17-scala2.13-main-latest", "arm64"),
+    ]
+    assert jobs[2].matrix_row is ROWS[0] and jobs[0].matrix_row is None
+
+def test_plan_and_apply(tmp_path, mock_apply_tags_docker, mock_apply_tags_docker_runner, mock_get_taggers_and_manifests):
+    # Given: one container per image, the spark 4 image taggers fail
+    mock_get_taggers_and_manifests.return_value = ([FakeTagger()], [])
+    def docker_runner(image):
+        runner = MagicMock()
+        runner.__enter__.return_value.image = image
+        return runner
+
+    mock_apply_tags_docker_runner.side_effect = docker_runner
+    jobs = [TaggingJob("pyspark-notebook:3.5.6", "amd64"), TaggingJob("pyspark-notebook:3.5.6", "arm64"), TaggingJob("pyspark-notebook:4.0.1", "amd64")]
+
+    # When:
+    plan = BatchTagging(jobs, "ghcr.io", "owner", max_workers=2, version_probe=False).plan()
+    plan.save(tmp_path / "plan.json")
+    TagPlan.load(tmp_path / "plan.json").apply()
+
+    # Then: one tag plan, in the jobs order, applied in bulk
+    assert plan.tags == {
+        "ghcr.io/owner/pyspark-notebook:3.5.6-amd64": ["ghcr.io/owner/pyspark-notebook:tag1-amd64"],
+        "ghcr.io/owner/pyspark-notebook:3.5.6-arm64": ["ghcr.io/owner/pyspark-notebook:tag1-arm64"],
+    }
+    assert list(plan.durations) == list(plan.tags)
+    assert plan.errors == {"pyspark-notebook:4.0.1-amd64": "spark-submit failed"}
+    assert [args for args, _ in mock_apply_tags_docker.images.get.call_args_list] == [(source,) for source in plan.tags]
+    assert [args for args, _ in mock_apply_tags_docker.images.get.return_value.tag.call_args_list] == [
+        ("ghcr.io/owner/pyspark-notebook", "tag1-amd64"),
+        ("ghcr.io/owner/pyspark-notebook", "tag1-arm64"),
+    ]
@@ -0,0 +1,73 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import datetime
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from okdp.extension.tagging.build_context import BUILD_CONTEXT_ENV, BuildContext, build_context
+from okdp.extension.tagging.taggers import commit_sha_tagger, date_tagger
+
+def git(repository: Path, *args: str) -> str:
+    return subprocess.run(["git", "-c", "user.name=okdp", "-c", "user.email=okdp@example.com", *args],
+                          cwd=repository, capture_output=True, text=True, check=True).stdout.strip()
+
+def test_from_git(tmp_path: Path, monkeypatch):
+    git(tmp_path, "init", "--initial-branch", "feature/build-context")
+    git(tmp_path, "commit", "--allow-empty", "-m", "Add the build context\n\nComputed once per process")
+
+    # When: a single git invocation
+    with patch("subprocess.run", wraps=subprocess.run) as run:
+        context = BuildContext.from_git(str(tmp_path))
+
+    assert run.call_count == 1
+    assert context.commit == git(tmp_path, "rev-parse", "HEAD")
+    assert context.commit_tag == context.commit[:12]
+    assert context.message == "Add the build context\n\nComputed once per process"
+    assert context.branch == "feature/build-context"
+    assert context.timestamp.endswith("Z") and context.date == context.timestamp[:10]
+
+    # A detached HEAD: the ref of the workflow
+    git(tmp_path, "checkout", "--detach")
+    monkeypatch.setenv("GITHUB_REF_NAME", "v1.0.0")
+    assert BuildContext.from_git(str(tmp_path)).branch == "v1.0.0"
+
+def test_timestamp_on_a_whole_second(tmp_path: Path, monkeypatch):
+    git(tmp_path, "init")
+    git(tmp_path, "commit", "--allow-empty", "-m", "Build")
+
+    # Given: now falls on a whole second (isoformat drops the microseconds)
+    class FixedDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2026, 1, 5, 8, 30, 0, 0, tzinfo=tz)
+    monkeypatch.setattr("okdp.extension.tagging.build_context.datetime", SimpleNamespace(datetime=FixedDatetime, UTC=datetime.UTC))
+
+    # Then:
+    assert BuildContext.from_git(str(tmp_path)).timestamp == "2026-01-05T08:30:00Z"
+
+def test_reused_by_the_next_steps(tmp_path: Path, monkeypatch, fake_build_context):
+    fake_build_context.save(tmp_path / "build-context.json")
+    monkeypatch.setenv(BUILD_CONTEXT_ENV, str(tmp_path / "build-context.json"))
+    build_context.cache_clear()
+    try:
+        assert build_context() == fake_build_context
+        assert build_context() is build_context()
+        assert (commit_sha_tagger(None), date_tagger(None)) == ("0123456789ab", "2026-01-05")
+    finally:
+        build_context.cache_clear()
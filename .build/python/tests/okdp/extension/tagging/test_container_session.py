@@ -0,0 +1,103 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from okdp.extension.tagging.apply_tags import Tagging
+from okdp.extension.tagging.container_session import ContainerSession, write_all
+from okdp.extension.tagging.write_manifest import Manifest
+
+PACKAGES = {
+    "mamba list --json": '[{"name": "numpy", "version": "2.3.1"}, {"name": "pyspark", "version": "3.5.6"}]',
+    "dpkg-query --show --showformat='${Package}\\t${Version}\\n'": "bash\t5.2.21-2ubuntu4\n",
+    "ls /usr/local/spark/jars": "scala-library-2.13.8.jar\nspark-core_2.13-3.5.6.jar\n",
+}
+
+def docker_client(*containers) -> MagicMock:
+    client = MagicMock()
+    client.containers.run.side_effect = list(containers)
+    return client
+
+def test_one_container_for_the_tags_and_manifest_steps(tmp_path: Path, fake_container, fake_build_context):
+    # Also answers the manifests commands (conda, mamba, apt, ...)
+    container = fake_container(PACKAGES, default="package 1.0")
+    client = docker_client(container)
+    image_name = "pyspark-notebook:latest"
+
+    # When: the tags file, the build history line and the manifest in one session
+    with ContainerSession("ghcr.io/okdp/pyspark-notebook:latest-amd64", client) as session, \
+         patch("okdp.extension.tagging.taggers.build_context", return_value=fake_build_context):
+        write_all(Tagging(image_name, "ghcr.io", "okdp", "amd64", session=session),
+                  Manifest(image_name, "ghcr.io", "okdp", "amd64", "OKDP/jupyterlab-docker", session=session, context=fake_build_context),
+                  tmp_path / "tags", tmp_path / "hist_lines", tmp_path / "manifests")
+
+    # Then: a single container, every command run once, removed at the end
+    assert client.containers.run.call_count == 1
+    assert len(container.execs) == len({repr(cmd) for cmd in container.execs})
+    assert container.removed
+    tags = (tmp_path / "tags" / "amd64-pyspark-notebook.txt").read_text().splitlines()
+    assert "ghcr.io/okdp/pyspark-notebook:spark-3.5.6-python-3.11.13-java-17.0.16-scala-2.13.8-hub-5.3.0-lab-4.4.5-amd64" in tags
+    assert "spark-3.5.6-python-3.11.13-java-17.0.16-scala-2.13.8-hub-5.3.0-lab-4.4.5-amd64" in \
+        (tmp_path / "hist_lines" / "amd64-pyspark-notebook-0123456789ab.txt").read_text()
+    assert (tmp_path / "manifests" / "amd64-pyspark-notebook-0123456789ab.md").read_text().startswith("# Build manifest")
+    assert "total" in json.loads((tmp_path / "manifests" / "amd64-pyspark-notebook-0123456789ab-timings.json").read_text())
+    assert json.loads((tmp_path / "manifests" / "amd64-pyspark-notebook-0123456789ab-packages.json").read_text()) == {
+        "image": "ghcr.io/okdp/pyspark-notebook:0123456789ab-amd64",
+        "packages": {
+            "apt": {"bash": "5.2.21-2ubuntu4"},
+            "conda": {"numpy": "2.3.1", "pyspark": "3.5.6"},
+            "spark": {"scala-library": "2.13.8", "spark-core_2.13": "3.5.6"},
+        },
+    }
+
+def test_idle_container_is_reaped(tmp_path: Path, fake_container):
+    (first, second) = (fake_container(), fake_container())
+    client = docker_client(first, second)
+
+    with ContainerSession("pyspark-notebook", client, idle_timeout=0.05) as session:
+        assert session.exec_run("python --version").output == b"Python 3.11.13"
+        time.sleep(0.3)
+        # Then: the idle container is removed, the memoized commands don't restart it
+        assert first.removed
+        assert session.exec_run("python --version").output == b"Python 3.11.13"
+        assert client.containers.run.call_count == 1
+
+        # A new command restarts a container
+        assert session.exec_run("jupyterhub --version").output == b"5.3.0"
+        assert client.containers.run.call_count == 2
+
+    assert first.execs == ["python --version"]
+    assert second.execs == ["jupyterhub --version"]
+    assert second.removed
+
+def test_late_reaper_keeps_the_container_in_use(fake_container):
+    container = fake_container()
+    client = docker_client(container)
+
+    with ContainerSession("pyspark-notebook", client, idle_timeout=60) as session:
+        session.exec_run("python --version")
+        late_generation = session._reaper_generation
+        # When: a reaper fires late, after the container was handed out again
+        with session._in_use():
+            session._reap(late_generation + 1)
+            session._reap(late_generation)
+            # Then: the container in use is kept
+            assert not container.removed
+        assert session.exec_run("jupyterhub --version").output == b"5.3.0"
+        assert client.containers.run.call_count == 1
@@ -0,0 +1,64 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from okdp.extension.tagging.docker_tags import push_tags, split_tag
+
+def push_events(repository, tag, stream, decode):
+    """ The registry already has the base layer, the first push of a repository uploads the other one """
+    pushed = push_events.pushed
+    events = [{"status": "Layer already exists", "id": "base"}]
+    if (repository, "spark") in pushed:
+        events.append({"status": "Layer already exists", "id": "spark"})
+    else:
+        events += [{"status": "Pushing", "id": "spark", "progressDetail": {"current": 512, "total": 1024}},
+                   {"status": "Pushed", "id": "spark"}]
+        pushed.add((repository, "spark"))
+    if tag == "broken":
+        events.append({"error": "denied: requested access to the resource is denied"})
+    return iter(events)
+
+@pytest.fixture
+def client():
+    push_events.pushed = set()
+    client = MagicMock()
+    client.images.push.side_effect = push_events
+    return client
+
+def test_split_tag():
+    assert split_tag("localhost:5000/okdp/pyspark-notebook:spark-3.5.6") == ("localhost:5000/okdp/pyspark-notebook", "spark-3.5.6")
+    assert split_tag("localhost:5000/okdp/pyspark-notebook") == ("localhost:5000/okdp/pyspark-notebook", "latest")
+
+def test_push_tags_grouped_by_repository(client):
+    tags = [
+        "ghcr.io/okdp/pyspark-notebook:spark-3.5.6-amd64",
+        "ghcr.io/okdp/all-spark-notebook:spark-3.5.6-amd64",
+        "ghcr.io/okdp/pyspark-notebook:spark-3.5.6-python-3.11-amd64",
+    ]
+
+    report = push_tags(tags, client, max_workers=2)
+
+    # The shared layer of a repository is uploaded once
+    assert sorted(report.pushed_tags) == sorted(tags)
+    assert (report.uploaded_layers, report.uploaded_bytes) == (2, 2048)
+    assert (report.skipped_layers, report.skipped_bytes) == (4, 1024)
+
+def test_push_error_fails(client):
+    with pytest.raises(RuntimeError, match="denied"):
+        push_tags(["ghcr.io/okdp/pyspark-notebook:broken"], client)
@@ -0,0 +1,118 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import io
+import json
+import hashlib
+import tarfile
+
+import pytest
+
+from okdp.extension.tagging.taggers import commit_sha_tagger
+from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+from okdp.extension.tagging.layer_inspector import command_outputs, inspect_filesystem, inspected_container
+
+BASE_LAYER = {
+    "usr/lib/os-release": b'NAME="Ubuntu"\nVERSION_ID="24.04"\n',
+    "etc/os-release": "../usr/lib/os-release",
+    "opt/conda/conda-meta/python-3.11.12-h9e4cc4f_0_cpython.json": b"{}",
+    "opt/conda/conda-meta/jupyterlab-4.4.5-pyhd8ed1ab_0.json": b"{}",
+    "opt/conda/conda-meta/jupyterhub-base-5.3.0-pyh31011fe_0.json": b"{}",
+    "opt/conda/bin/python": b"not read",
+}
+SPARK_LAYER = {
+    # python upgraded in an upper layer
+    "opt/conda/conda-meta/.wh.python-3.11.12-h9e4cc4f_0_cpython.json": b"",
+    "opt/conda/conda-meta/python-3.11.13-h9e4cc4f_0_cpython.json": b"{}",
+    "usr/lib/jvm/java-17-openjdk-amd64/release": b'JAVA_VERSION="17.0.16"\n',
+    "usr/local/spark-3.5.6-bin-hadoop3/RELEASE": b"Spark 3.5.6 (git revision 303c18c) built for Hadoop 3.3.4\n",
+    "usr/local/spark-3.5.6-bin-hadoop3/jars/scala-library-2.13.8.jar": b"PK",
+}
+
+def layer_tarball(files: dict[str, bytes | str], compress: bool = False) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz" if compress else "w") as tar:
+        for path, content in files.items():
+            info = tarfile.TarInfo(path)
+            if isinstance(content, str):
+                (info.type, info.linkname) = (tarfile.SYMTYPE, content)
+                tar.addfile(info)
+            else:
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+def add_bytes(tar: tarfile.TarFile, name: str, content: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    tar.addfile(info, io.BytesIO(content))
+
+@pytest.fixture
+def docker_archive(tmp_path):
+    """ docker save layout: manifest.json + <id>/layer.tar """
+    path = tmp_path / "image.tar"
+    with tarfile.open(path, mode="w") as tar:
+        add_bytes(tar, "base/layer.tar", layer_tarball(BASE_LAYER))
+        add_bytes(tar, "spark/layer.tar", layer_tarball(SPARK_LAYER))
+        add_bytes(tar, "manifest.json", json.dumps([{"Config": "config.json", "Layers": ["base/layer.tar", "spark/layer.tar"]}]).encode())
+    return str(path)
+
+@pytest.fixture
+def oci_layout(tmp_path):
+    """ OCI image layout: index.json (multi-platform) -> manifest -> gzipped layer blobs """
+    blobs = tmp_path / "blobs" / "sha256"
+    blobs.mkdir(parents=True)
+
+    def blob(content: bytes) -> dict:
+        digest = hashlib.sha256(content).hexdigest()
+        (blobs / digest).write_bytes(content)
+        return {"digest": f"sha256:{digest}", "size": len(content)}
+
+    manifest = blob(json.dumps({"layers": [blob(layer_tarball(BASE_LAYER, compress=True)), blob(layer_tarball(SPARK_LAYER, compress=True))]}).encode())
+    arm64 = blob(json.dumps({"layers": [blob(layer_tarball(BASE_LAYER, compress=True))]}).encode())
+    index = blob(json.dumps({"manifests": [{**arm64, "platform": {"architecture": "arm64"}}, {**manifest, "platform": {"architecture": "amd64"}}]}).encode())
+    (tmp_path / "index.json").write_text(json.dumps({"manifests": [index]}))
+    return str(tmp_path)
+
+def test_docker_archive_layers_are_merged(docker_archive):
+    filesystem = inspect_filesystem(docker_archive)
+
+    assert "opt/conda/bin/python" not in filesystem.files
+    assert "opt/conda/conda-meta/python-3.11.12-h9e4cc4f_0_cpython.json" not in filesystem.files
+    assert filesystem.read("etc/os-release") == BASE_LAYER["usr/lib/os-release"]
+
+def test_command_outputs(docker_archive):
+    outputs = command_outputs(inspect_filesystem(docker_archive))
+
+    assert outputs["python --version"]["output"] == "Python 3.11.13"
+    assert outputs["jupyterhub --version"]["output"] == "5.3.0"
+    assert outputs["/bin/sh -c 'unset JDK_JAVA_OPTIONS && java --version'"]["output"] == "openjdk 17.0.16"
+    assert "R --version" not in outputs
+
+def test_pyspark_taggers_from_oci_layout(oci_layout, docker_archive):
+    # Given: the pyspark-notebook taggers (the commit sha is not computed from the image)
+    taggers, _ = get_taggers_and_manifests("pyspark-notebook")
+    taggers = [tagger for tagger in taggers if commit_sha_tagger not in tagger.taggers]
+
+    # When:
+    tag_values = [tagger.tag_value(inspected_container(oci_layout, "amd64")) for tagger in taggers]
+
+    # Then: same tags from both layouts, without any container
+    assert "spark-3.5.6-python-3.11.13-java-17.0.16-scala-2.13.8-hub-5.3.0-lab-4.4.5" in tag_values
+    assert tag_values == [tagger.tag_value(inspected_container(docker_archive)) for tagger in taggers]
+
+def test_commands_not_derived_from_the_layers_fail(docker_archive):
+    assert inspected_container(docker_archive).exec_run("julia --version").exit_code == 127
@@ -0,0 +1,119 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import docker
+
+from okdp.extension.tagging.layer_sizes import (
+    Layer,
+    LayerReport,
+    image_layers,
+    layers_manifest,
+    registry_compressed_sizes,
+    size_regressions,
+)
+from okdp.extension.tagging.registry_client import RegistryClient
+from okdp.extension.tagging.write_manifest import Manifest
+
+from extension.tagging.fake_registry import FakeRegistry
+
+MB = 1000 * 1000
+SCIPY = [
+    {"Created": 1, "CreatedBy": "/bin/sh -c #(nop) ADD file:ubuntu in /", "Size": 80 * MB},
+    {"Created": 2, "CreatedBy": "ENV CONDA_DIR=/opt/conda", "Size": 0},
+    {"Created": 3, "CreatedBy": "RUN /bin/bash -o pipefail -c mamba install --yes   scipy", "Size": 900 * MB},
+]
+PYSPARK = SCIPY + [
+    {"Created": 4, "CreatedBy": "RUN /bin/bash -o pipefail -c tar -xzf spark.tgz", "Size": 400 * MB},
+]
+
+def docker_client(histories: dict[str, list[dict]]) -> MagicMock:
+    def get(image: str):
+        if image not in histories:
+            raise docker.errors.ImageNotFound(image)
+        # The Docker API lists the history the newest first
+        return SimpleNamespace(history=lambda: list(reversed(histories[image])))
+    client = MagicMock()
+    client.images.get.side_effect = get
+    return client
+
+def test_manifest_parent_image(fake_build_context):
+    # Given: a spark image built from the scipy-notebook image of its python dev tag (c.f. build-spark-images-template.yml)
+    client = docker_client({
+        "ghcr.io/okdp/pyspark-notebook:spark3.5.6-python3.11-java17-scala2.12-main-latest-amd64": PYSPARK,
+        "ghcr.io/okdp/scipy-notebook:python3.11-main-latest-amd64": SCIPY,
+    })
+    manifest = Manifest("pyspark-notebook:spark3.5.6-python3.11-java17-scala2.12-main-latest", "ghcr.io", "okdp", "amd64",
+                        "OKDP/jupyterlab-docker", context=fake_build_context,
+                        parent_image="scipy-notebook:python3.11-main-latest")
+
+    with patch("okdp.extension.tagging.write_manifest.docker_client", return_value=client):
+        report = manifest.get_layer_report("ghcr.io/okdp/pyspark-notebook:spark3.5.6-python3.11-java17-scala2.12-main-latest-amd64")
+
+    assert report.parent_image == "ghcr.io/okdp/scipy-notebook:python3.11-main-latest-amd64"
+    assert [layer.shared for layer in report.layers] == [True, True, False]
+
+def test_layers_shared_with_the_parent_image():
+    client = docker_client({"okdp/pyspark-notebook:latest": PYSPARK, "okdp/scipy-notebook:latest": SCIPY})
+
+    report = image_layers("okdp/pyspark-notebook:latest", client, "okdp/scipy-notebook:latest", compressed_sizes=[30 * MB, 300 * MB, 200 * MB])
+
+    # Then: the empty ENV layer is skipped, the compressed sizes are the registry ones
+    assert [(layer.size, layer.compressed_size, layer.shared) for layer in report.layers] == [
+        (80 * MB, 30 * MB, True), (900 * MB, 300 * MB, True), (400 * MB, 200 * MB, False),
+    ]
+    assert report.size(shared=False) == 400 * MB
+    # 1.38 GB download + 1.38 GB extraction + 3 layers
+    assert report.pull_seconds() == round(530 / 125 + 1380 / 200 + 0.6, 1)
+    assert report.pull_seconds(parent_cached=True) == round(200 / 125 + 400 / 200 + 0.2, 1)
+    markdown = layers_manifest(report).get_str()
+    assert "- Shared with the parent image `okdp/scipy-notebook:latest`: 980.0 MB" in markdown
+    assert "| 400.0 MB | 200.0 MB | no | `RUN /bin/bash -o pipefail -c tar -xzf spark.tgz` |" in markdown
+
+def test_parent_image_not_available():
+    client = docker_client({"okdp/pyspark-notebook:latest": PYSPARK})
+
+    report = image_layers("okdp/pyspark-notebook:latest", client, "okdp/scipy-notebook:latest", compressed_sizes=[1])
+
+    assert report.parent_image is None
+    assert not any(layer.shared for layer in report.layers)
+    # The compressed sizes don't match the layers: estimated
+    assert report.layers[0].compressed_size is None
+    assert "compressed, estimated" in layers_manifest(report).get_str()
+
+def test_size_regressions(tmp_path: Path):
+    previous = LayerReport("okdp/pyspark-notebook:000000000001", None, [Layer("RUN scipy", 900 * MB), Layer("RUN spark", 400 * MB)])
+    previous.save(tmp_path / "previous.json")
+    current = LayerReport("okdp/pyspark-notebook:000000000002", None, [Layer("RUN scipy", 905 * MB), Layer("RUN spark", 480 * MB)])
+
+    regressions = size_regressions(LayerReport.load(tmp_path / "previous.json"), current)
+
+    # Then: the spark layer (+20%), the image (+6.5%), not the scipy layer (+0.5%)
+    assert regressions == ["1.30 GB -> 1.39 GB: image", "400.0 MB -> 480.0 MB: RUN spark"]
+
+def test_registry_compressed_sizes():
+    registry = FakeRegistry()
+    try:
+        registry.push_image("okdp/pyspark-notebook", "latest-amd64", [b"base", b"spark-amd64"])
+        client = RegistryClient(registry.registry, scheme="http")
+
+        assert registry_compressed_sizes(client, f"{registry.registry}/okdp/pyspark-notebook:latest-amd64", "amd64") == [4, 11]
+        assert registry_compressed_sizes(client, f"{registry.registry}/okdp/pyspark-notebook:latest-arm64", "arm64") is None
+    finally:
+        registry.close()
@@ -0,0 +1,136 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from pathlib import Path
+
+from okdp.extension.tagging.manifest_diff import diff_packages, history_summaries, parse_manifest, render_markdown, version_key
+from okdp.extension.tagging.package_inventory import packages_table
+
+# The raw command outputs of the upstream manifests
+UPSTREAM_MANIFEST = '''# Build manifest for image: datascience-notebook:0123456789ab
+
+## Build Info
+
+- Build timestamp: 2026-01-05T05:00:00Z
+
+## Python Packages
+
+Python 3.11.13
+
+`mamba list`:
+
+```text
+# packages in environment at /opt/conda:
+#
+# Name                    Version                   Build  Channel
+numpy                     2.3.1           py311h2e04523_0    conda-forge
+pandas                    2.3.0           py311h7db5c69_0    conda-forge
+```
+
+## Apt Packages
+
+`apt list --installed`:
+
+```text
+Listing...
+bash/noble,now 5.2.21-2ubuntu4 amd64 [installed]
+libc6/noble-updates,now 2.39-0ubuntu8.4 amd64 [installed,automatic]
+```
+
+## R Packages
+
+`R --silent -e 'installed.packages(.Library)[, c(1,3)]'`:
+
+```text
+> installed.packages(.Library)[, c(1,3)]
+           Package      Version
+base       "base"       "4.4.3"
+MASS       "MASS"       "7.3-61"
+```
+
+## Julia Packages
+
+`julia -E 'import Pkg; Pkg.status()'`:
+
+```text
+Status `/opt/julia/environments/v1.11/Project.toml`
+  [7073ff75] IJulia v1.26.0
+nothing
+```
+
+## Apache Spark
+
+`/usr/local/spark/bin/spark-submit --version`:
+
+```text
+   /___/ .__/\\_,_/_/ /_/\\_\\   version 3.5.6
+Using Scala version 2.13.8, OpenJDK 64-Bit Server VM, 17.0.16
+```
+'''
+
+def inventory_manifest(timestamp: str, conda: dict[str, str]) -> str:
+    """ A manifest with the package tables of the package inventory """
+    return "\n\n".join([
+        "# Build manifest for image: pyspark-notebook:0123456789ab",
+        f"## Build Info\n\n- Build timestamp: {timestamp}",
+        f"## Python Packages\n\n`conda info`:\n\n```text\nactive environment : base\n```\n\n{packages_table(conda)}",
+    ])
+
+def test_parse_upstream_manifest():
+    assert parse_manifest(UPSTREAM_MANIFEST) == {
+        "conda": {"numpy": "2.3.1", "pandas": "2.3.0"},
+        "apt": {"bash": "5.2.21-2ubuntu4", "libc6": "2.39-0ubuntu8.4"},
+        "r": {"base": "4.4.3", "MASS": "7.3-61"},
+        "julia": {"IJulia": "1.26.0"},
+        "spark": {"spark": "3.5.6", "scala": "2.13.8"},
+    }
+
+def test_diff_from_the_upstream_to_the_inventory_manifest():
+    old = parse_manifest(UPSTREAM_MANIFEST)
+    new = parse_manifest(inventory_manifest("2026-01-12T05:00:00Z", {"numpy": "2.10.0", "pandas": "2.2.3", "polars": "1.31.0"}))
+
+    diffs = diff_packages({"conda": old["conda"]}, new)
+
+    assert list(diffs) == ["conda"]
+    assert diffs["conda"].added == {"polars": "1.31.0"}
+    assert diffs["conda"].removed == {}
+    assert diffs["conda"].upgraded == {"numpy": ["2.3.1", "2.10.0"]}
+    assert diffs["conda"].downgraded == {"pandas": ["2.3.0", "2.2.3"]}
+    assert render_markdown(diffs).splitlines()[2] == "- conda: 1 added, 0 removed, 1 upgraded, 1 downgraded"
+
+def test_version_key():
+    assert version_key("1.10.0") > version_key("1.9.2")
+    assert version_key("2.39-0ubuntu8.4") > version_key("2.39-0ubuntu8")
+    assert version_key("7.3-61") > version_key("7.3-60")
+
+def test_history(tmp_path: Path):
+    # Given: 3 builds of pyspark-notebook (not in build order) and 1 build of another image
+    builds = {
+        "amd64-pyspark-notebook-000000000002.md": ("2026-01-12T05:00:00Z", {"numpy": "2.3.2"}),
+        "amd64-pyspark-notebook-000000000001.md": ("2026-01-05T05:00:00Z", {"numpy": "2.3.1"}),
+        "amd64-pyspark-notebook-000000000003.md": ("2026-01-19T05:00:00Z", {"numpy": "2.3.2"}),
+        "amd64-scipy-notebook-000000000001.md": ("2026-01-05T05:00:00Z", {"scipy": "1.16.0"}),
+    }
+    for name, (timestamp, conda) in builds.items():
+        (tmp_path / name).write_text(inventory_manifest(timestamp, conda))
+
+    summaries = history_summaries(sorted(tmp_path.iterdir()))
+
+    # Then: the changes of every build since the previous one of the same image
+    assert summaries == {
+        "amd64-pyspark-notebook-000000000002.md": "conda: 0 added, 0 removed, 1 upgraded, 0 downgraded",
+        "amd64-pyspark-notebook-000000000003.md": "No package change",
+    }
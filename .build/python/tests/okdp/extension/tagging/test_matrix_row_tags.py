@@ -0,0 +1,85 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from okdp.extension.tagging.taggers import commit_sha_tagger
+from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+from okdp.extension.tagging.matrix_row_tags import row_values, scala_version, verify_row
+from okdp.extension.tagging.tag_plan_compiler import CompiledTagPlan
+from okdp.extension.tagging.version_probe import ProbedContainer, probe_commands
+
+ROW = {"python_version": "3.11", "spark_version": "3.5.6", "java_version": "17", "scala_version": "2.13", "hadoop_version": "3"}
+
+@pytest.fixture
+def verified_container(fake_container):
+    """ Also answers the verification script with the installed versions """
+    def create(facts: dict):
+        container = fake_container()
+        exec_run = container.exec_run
+        def verify(cmd):
+            if isinstance(cmd, list) and cmd[1] == "-c" and len(cmd) == 3:
+                container.execs.append(cmd)
+                return SimpleNamespace(exit_code=0, output=json.dumps(facts).encode())
+            return exec_run(cmd)
+        container.exec_run = verify
+        return container
+    return create
+
+def pyspark_taggers():
+    taggers, _ = get_taggers_and_manifests("pyspark-notebook")
+    return [tagger for tagger in taggers if commit_sha_tagger not in tagger.taggers]
+
+def test_scala_version_of_the_default_dist():
+    assert scala_version({"spark_version": "3.5.6", "scala_version": ""}) == "2.12"
+    assert scala_version({"spark_version": "4.0.1", "scala_version": ""}) == "2.13"
+
+def test_row_tags_match_the_container_tags(fake_container, verified_container):
+    # Given:
+    taggers = pyspark_taggers()
+    container = verified_container({"python_version": "3.11", "spark_version": "3.5.6", "java_version": "17", "scala_version": "2.13"})
+
+    # When:
+    verify_row(container, ROW)
+    plan = CompiledTagPlan.compile(taggers)
+    values = row_values(ROW)
+    probed_container = ProbedContainer.probe(container, [primitive for primitive in plan.primitives if primitive not in values])
+    tag_values = plan.evaluate(probed_container, values)
+
+    # Then: the same tags, the short form ones without any tagger command
+    assert tag_values == list(dict.fromkeys(tagger.tag_value(fake_container()) for tagger in taggers))
+    assert "spark-3.5.6-python-3.11-java-17-scala-2.13" in tag_values
+    assert probe_commands([primitive for primitive in taggers[-4].taggers if primitive not in values]) == []
+
+def test_mismatch_fails_loudly(verified_container):
+    container = verified_container({"python_version": "3.11", "spark_version": "3.5.5", "java_version": "17", "scala_version": "2.12"})
+
+    with pytest.raises(ValueError, match="spark_version=3.5.6 \\(image: 3.5.5\\), scala_version=2.13 \\(image: 2.12\\)"):
+        verify_row(container, ROW)
+    assert len(container.execs) == 1
+
+def test_verify_script_on_the_host():
+    # Given: a container running the verification script on the host (no spark, no java)
+    container = SimpleNamespace(name="host", exec_run=lambda cmd: SimpleNamespace(exit_code=0, output=subprocess.run([sys.executable, *cmd[1:]], capture_output=True, env={}).stdout))
+
+    verify_row(container, {"python_version": "%d.%d" % sys.version_info[:2]})
+    with pytest.raises(ValueError, match="spark_version=3.5.6 \\(image: not found\\)"):
+        verify_row(container, {"spark_version": "3.5.6"})
@@ -0,0 +1,95 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+
+import pytest
+
+from okdp.extension.tagging.merge_manifests import merge_tags, merged_tags_of
+from okdp.extension.tagging.registry_client import DOCKER_MANIFEST_LIST, OCI_INDEX, OCI_MANIFEST, RegistryClient
+
+from extension.tagging.fake_registry import FakeRegistry
+
+@pytest.fixture
+def registry():
+    registry = FakeRegistry()
+    yield registry
+    registry.close()
+
+def test_merge_tags_without_pull(registry):
+    # Given: the platform images of two tags, the arm64 image of the second one is missing
+    amd64 = registry.push_image("okdp/pyspark-notebook", "spark-3.5.6-amd64", [b"base", b"spark-amd64"])
+    arm64 = registry.push_image("okdp/pyspark-notebook", "spark-3.5.6-arm64", [b"base", b"spark-arm64"])
+    registry.push_image("okdp/pyspark-notebook", "spark-4.0.1-amd64", [b"base", b"spark4-amd64"], media_type=OCI_MANIFEST)
+    tags = [f"{registry.registry}/okdp/pyspark-notebook:spark-3.5.6", f"{registry.registry}/okdp/pyspark-notebook:spark-4.0.1"]
+
+    # When:
+    digests = merge_tags(RegistryClient(registry.registry, scheme="http"), tags)
+
+    # Then: the manifest lists reference the platform manifests by digest, no blob was read
+    (media_type, body) = registry.manifests[("okdp/pyspark-notebook", "spark-3.5.6")]
+    assert media_type == DOCKER_MANIFEST_LIST
+    assert [(m["digest"], m["platform"]) for m in json.loads(body)["manifests"]] == [
+        (amd64, {"architecture": "amd64", "os": "linux"}),
+        (arm64, {"architecture": "arm64", "os": "linux", "variant": "v8"}),
+    ]
+    assert registry.manifests[("okdp/pyspark-notebook", "spark-4.0.1")][0] == OCI_INDEX
+    assert all(digests.values())
+    assert not any("/blobs/" in path for (_, path) in registry.requests)
+
+def test_merge_tag_of_a_buildx_index(registry):
+    # Given: the platform tag is an index (image + attestation manifest)
+    image = registry.push_image("okdp/scipy-notebook", "image-amd64", [b"base"])
+    index = json.dumps({"manifests": [
+        {"mediaType": OCI_MANIFEST, "digest": image, "size": 10, "platform": {"architecture": "amd64", "os": "linux"}},
+        {"mediaType": OCI_MANIFEST, "digest": "sha256:attestation", "size": 10, "platform": {"architecture": "unknown", "os": "unknown"}},
+    ]}).encode()
+    registry.put("okdp/scipy-notebook", "python-3.11-amd64", OCI_INDEX, index)
+
+    merge_tags(RegistryClient(registry.registry, scheme="http"), [f"{registry.registry}/okdp/scipy-notebook:python-3.11"])
+
+    (_, body) = registry.manifests[("okdp/scipy-notebook", "python-3.11")]
+    assert [m["digest"] for m in json.loads(body)["manifests"]] == [image]
+
+def test_missing_platform_images(registry):
+    assert merge_tags(RegistryClient(registry.registry, scheme="http"), [f"{registry.registry}/okdp/r-notebook:missing"]) == {f"{registry.registry}/okdp/r-notebook:missing": None}
+
+def test_expired_token_is_renewed(registry):
+    registry.push_image("okdp/pyspark-notebook", "spark-3.5.6-amd64", [b"base", b"spark-amd64"])
+    client = RegistryClient(registry.registry, scheme="http")
+    assert client.head_manifest("okdp/pyspark-notebook", "spark-3.5.6-amd64")
+
+    # When: the cached token expires
+    registry.token = "renewed-token"
+
+    # Then: the rejected token is replaced
+    assert client.head_manifest("okdp/pyspark-notebook", "spark-3.5.6-amd64")
+    assert registry.requests.count(("GET", "/token")) == 2
+
+def test_only_idempotent_requests_are_retried(registry):
+    retries = RegistryClient(registry.registry, scheme="http").session.get_adapter(f"http://{registry.registry}").max_retries
+
+    assert retries.is_retry("HEAD", 503) and retries.is_retry("PUT", 503)
+    # A retried POST would start a second blob upload
+    assert not retries.is_retry("POST", 503)
+
+def test_merged_tags_of_tags_files(tmp_path):
+    (tmp_path / "amd64-pyspark-notebook.txt").write_text("ghcr.io/okdp/pyspark-notebook:dev-amd64\nghcr.io/okdp/pyspark-notebook:spark-3.5.6-amd64")
+    (tmp_path / "arm64-pyspark-notebook.txt").write_text("ghcr.io/okdp/pyspark-notebook:dev-arm64\nghcr.io/okdp/pyspark-notebook:spark-3.5.6-arm64")
+
+    assert merged_tags_of([str(path) for path in sorted(tmp_path.iterdir())], ["amd64", "arm64"]) == [
+        "ghcr.io/okdp/pyspark-notebook:dev", "ghcr.io/okdp/pyspark-notebook:spark-3.5.6",
+    ]
@@ -0,0 +1,60 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import shlex
+from pathlib import Path
+from types import SimpleNamespace
+
+from okdp.extension.tagging.manifests import r_packages_manifest
+from okdp.extension.tagging.package_inventory import (
+    PACKAGE_COMMANDS,
+    PackageInventory,
+    parse_mamba_list_json,
+    parse_spark_jars,
+    parse_tab_separated,
+)
+
+def test_parsers():
+    assert parse_mamba_list_json('[{"name": "numpy", "version": "2.3.1", "channel": "conda-forge"}]') == {"numpy": "2.3.1"}
+    assert parse_tab_separated("bash\t5.2.21-2ubuntu4\nlibc6\t2.39-0ubuntu8.4\n\n") == {"bash": "5.2.21-2ubuntu4", "libc6": "2.39-0ubuntu8.4"}
+    assert parse_spark_jars("spark-core_2.13-3.5.6.jar\nzstd-jni-1.5.5-4.jar\nhadoop-client-api-3.3.4.jar\nREADME") == {
+        "spark-core_2.13": "3.5.6",
+        "zstd-jni": "1.5.5-4",
+        "hadoop-client-api": "3.3.4",
+    }
+
+def test_commands_are_exec_run_friendly():
+    # exec_run splits the commands without a shell: the scripts and format strings must reach the programs unchanged
+    assert {ecosystem: shlex.split(command) for ecosystem, (command, _) in PACKAGE_COMMANDS.items()} == {
+        "conda": ["mamba", "list", "--json"],
+        "apt": ["dpkg-query", "--show", "--showformat=${Package}\\t${Version}\\n"],
+        "r": ["Rscript", "-e", 'write.table(installed.packages(.Library)[, c(1,3)], sep="\\t", quote=FALSE, row.names=FALSE, col.names=FALSE)'],
+        "julia": ["julia", "-e",
+                  'import Pkg; for p in values(Pkg.dependencies()); p.is_direct_dep && println(p.name, "\\t", something(p.version, VERSION)); end'],
+        "spark": ["ls", "/usr/local/spark/jars"],
+    }
+
+def test_markdown_rendered_from_the_inventory(tmp_path: Path):
+    outputs = {"R --version": "R version 4.4.3", PACKAGE_COMMANDS["r"][0]: "base\t4.4.3\nMASS\t7.3-61\n"}
+    container = SimpleNamespace(name="r", exec_run=lambda cmd: SimpleNamespace(exit_code=0, output=outputs[cmd].encode()))
+
+    packages = r_packages_manifest.packages(container)
+    markdown = r_packages_manifest.render(container, packages).get_str()
+
+    assert markdown.endswith("| Package | Version |\n| ------- | ------- |\n| base | 4.4.3 |\n| MASS | 7.3-61 |")
+    inventory = PackageInventory("ghcr.io/okdp/r-notebook:0123456789ab-amd64", {"r": packages})
+    inventory.save(tmp_path / "packages.json")
+    assert PackageInventory.load(tmp_path / "packages.json").version("r", "MASS") == "7.3-61"
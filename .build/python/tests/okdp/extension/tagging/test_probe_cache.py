@@ -0,0 +1,92 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import docker
+
+from okdp.extension.tagging.taggers import commit_sha_tagger
+from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+from okdp.extension.tagging.probe_cache import CachedDockerRunner, ProbeCache
+from okdp.extension.tagging.version_probe import ProbedContainer
+
+def docker_client(container, digest: str = "sha256:0123") -> MagicMock:
+    client = MagicMock()
+    client.images.get.return_value.id = digest
+    client.containers.run.return_value = container
+    return client
+
+def test_probe_cache_lru(tmp_path: Path):
+    cache = ProbeCache(str(tmp_path / "probes.db"), max_bytes=10)
+
+    cache.put("sha256:1", {"python --version": {"exit_code": 0, "output": "Python 3"}})
+    cache.put("sha256:2", {"python --version": {"exit_code": 0, "output": "Python 3"}})
+
+    # Then: the least recently used entry is evicted
+    assert cache.get("sha256:1", "python --version") is None
+    assert cache.get("sha256:2", "python --version") == {"exit_code": 0, "output": "Python 3"}
+    assert ProbeCache(str(tmp_path / "probes.db")).get("sha256:2", "python --version")["output"] == "Python 3"
+
+def test_digest_hit_does_not_start_a_container(tmp_path: Path, fake_container):
+    taggers, _ = get_taggers_and_manifests("pyspark-notebook")
+    taggers = [tagger for tagger in taggers if commit_sha_tagger not in tagger.taggers]
+    cache = ProbeCache(str(tmp_path / "probes.db"))
+
+    # When: first run
+    client = docker_client(fake_container())
+    with CachedDockerRunner("pyspark-notebook", cache, client) as container:
+        container = ProbedContainer.probe(container, taggers)
+        tags = [tagger.tag_value(container) for tagger in taggers]
+    # Then: one container, one exec
+    assert client.containers.run.call_count == 1
+    assert len(client.containers.run.return_value.execs) == 1
+
+    # When: same image digest
+    client = docker_client(fake_container())
+    with CachedDockerRunner("pyspark-notebook", cache, client) as container:
+        container = ProbedContainer.probe(container, taggers)
+        assert [tagger.tag_value(container) for tagger in taggers] == tags
+    # Then: no container at all
+    assert client.containers.run.call_count == 0
+
+def test_unknown_digest_runs_on_the_container(tmp_path: Path, fake_container):
+    client = docker_client(fake_container())
+    client.images.get.side_effect = docker.errors.ImageNotFound("not found")
+
+    with CachedDockerRunner("pyspark-notebook", ProbeCache(str(tmp_path / "probes.db")), client) as container:
+        assert container.exec_run("python --version").output == b"Python 3.11.13"
+
+    assert client.containers.run.call_count == 1
+    assert client.containers.run.return_value.execs == ["python --version"]
+    assert client.containers.run.return_value.removed
+
+def test_failing_probe_is_run_again(tmp_path: Path, fake_container):
+    cache = ProbeCache(str(tmp_path / "probes.db"))
+
+    # When: the command fails on the first run
+    with CachedDockerRunner("pyspark-notebook", cache, docker_client(fake_container())) as container:
+        assert container.exec_run("java --version").exit_code == 127
+    # Then: the failure is not cached
+    assert cache.get("sha256:0123", "java --version") is None
+
+    # When: same image digest
+    client = docker_client(fake_container({"java --version": "openjdk 17.0.16"}))
+    with CachedDockerRunner("pyspark-notebook", cache, client) as container:
+        assert container.exec_run("java --version").output == b"openjdk 17.0.16"
+    # Then: the command is run again, its success cached
+    assert client.containers.run.return_value.execs == ["java --version"]
+    assert cache.get("sha256:0123", "java --version") == {"exit_code": 0, "output": "openjdk 17.0.16"}
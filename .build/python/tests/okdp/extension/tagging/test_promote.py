@@ -0,0 +1,71 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+from okdp.extension.tagging.merge_manifests import merge_tags
+from okdp.extension.tagging.promote import Promoter, promotion_plan
+from okdp.extension.tagging.registry_client import RegistryClient
+
+from extension.tagging.fake_registry import FakeRegistry
+
+DEV_TAG = "spark3.5.6-python3.11-java17-scala2.13-main-latest"
+RELEASE_TAG = "spark-3.5.6-python-3.11-java-17-scala-2.13"
+
+def dev_tag_plan(registry: str, owner: str) -> dict[str, list[str]]:
+    return {f"{registry}/{owner}/pyspark-notebook:{DEV_TAG}-{platform}": [f"{registry}/{owner}/pyspark-notebook:{RELEASE_TAG}-{platform}"]
+            for platform in ("amd64", "arm64")}
+
+def push_dev_images(registry: FakeRegistry) -> None:
+    for platform in ("amd64", "arm64"):
+        registry.push_image("okdp/pyspark-notebook", f"{DEV_TAG}-{platform}", [b"base", f"spark-{platform}".encode()])
+    merge_tags(RegistryClient(registry.registry, scheme="http"), [f"{registry.registry}/okdp/pyspark-notebook:{DEV_TAG}"])
+
+def test_promotion_plan():
+    plan = promotion_plan(dev_tag_plan("ghcr.io", "okdp"), target_owner="okdp/jupyter")
+
+    assert plan == {
+        f"ghcr.io/okdp/pyspark-notebook:{DEV_TAG}-amd64": [f"ghcr.io/okdp/jupyter/pyspark-notebook:{RELEASE_TAG}-amd64"],
+        f"ghcr.io/okdp/pyspark-notebook:{DEV_TAG}": [f"ghcr.io/okdp/jupyter/pyspark-notebook:{RELEASE_TAG}"],
+        f"ghcr.io/okdp/pyspark-notebook:{DEV_TAG}-arm64": [f"ghcr.io/okdp/jupyter/pyspark-notebook:{RELEASE_TAG}-arm64"],
+    }
+
+def test_promote_across_repositories():
+    # Given: the dev images (platform images + manifest list) in the CI repository
+    registry = FakeRegistry()
+    push_dev_images(registry)
+    registry.requests.clear()
+
+    # When: promoted to the release repository
+    plan = promotion_plan(dev_tag_plan(registry.registry, "okdp"), target_owner="okdp/jupyter")
+    Promoter(RegistryClient(registry.registry, scheme="http")).promote_all(plan)
+    registry.close()
+
+    # Then: same digests, the blobs mounted (shared base layer once), no blob read or uploaded
+    for suffix in ("-amd64", "-arm64", ""):
+        assert registry.manifests[("okdp/jupyter/pyspark-notebook", f"{RELEASE_TAG}{suffix}")] == registry.manifests[("okdp/pyspark-notebook", f"{DEV_TAG}{suffix}")]
+    assert not any(method in ("GET", "PUT", "PATCH") and "/blobs/" in path for (method, path) in registry.requests)
+    # 2 configs, the shared base layer and the 2 spark layers
+    assert len(registry.mounted) == len(set(registry.mounted)) == 5
+
+def test_promote_without_mount_support_fails():
+    registry = FakeRegistry(mounts=False)
+    push_dev_images(registry)
+
+    plan = promotion_plan(dev_tag_plan(registry.registry, "okdp"), target_owner="okdp/jupyter")
+    with pytest.raises(RuntimeError, match="does not support cross repository mounts"):
+        Promoter(RegistryClient(registry.registry, scheme="http")).promote_all(plan)
+    registry.close()
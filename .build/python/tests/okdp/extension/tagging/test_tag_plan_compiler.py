@@ -0,0 +1,49 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from unittest.mock import patch
+
+from tagging.taggers import versions
+from okdp.extension.tagging.taggers import date_tagger
+from okdp.extension.tagging.tag_plan_compiler import compile_tag_plan
+
+def test_duplicate_taggers_are_compiled_once():
+    plan = compile_tag_plan("docker-stacks-foundation")
+
+    # LongTagger(python_tagger, commit_sha_tagger) is listed twice in the hierarchy
+    assert plan.to_dict()["tags"] == [
+        ["ubuntu_version_tagger", "python_tagger"],
+        ["python_tagger", "commit_sha_tagger"],
+        ["python_tagger", "date_tagger"],
+        ["python_major_minor_tagger", "date_tagger"],
+    ]
+    assert plan.to_dict()["primitives"][1] == {"name": "python_tagger", "commands": ["python --version"]}
+
+def test_primitives_evaluated_once(fake_container, fake_build_context):
+    # Given: the pyspark-notebook taggers and their parents ones
+    plan = compile_tag_plan("pyspark-notebook")
+    container = fake_container()
+
+    # When:
+    with patch("okdp.extension.tagging.taggers.build_context", return_value=fake_build_context):
+        tags = plan.evaluate(container)
+
+    # Then: every primitive once, every tag once, with the cost of every primitive
+    assert len(plan.primitives) == len(set(plan.primitives))
+    assert len(tags) == len(set(tags)) == len(plan.tags)
+    assert [primitive for primitive in plan.primitives if primitive in (versions.python_tagger, date_tagger)] == [versions.python_tagger, date_tagger]
+    assert set(plan.costs) == {primitive.__name__ for primitive in plan.primitives}
+    assert "spark-3.5.6-python-3.11.13-java-17.0.16-scala-2.13.8-hub-5.3.0-lab-4.4.5" in tags
@@ -19,6 +19,7 @@ from unittest.mock import patch
 from tagging.manifests.spark_info import spark_info_manifest
 from tagging.taggers import versions
 from okdp.extension.tagging.apply_tags import Tagging
+from okdp.extension.tagging.write_tags_file import write_tags_file
 from okdp.extension.tagging.taggers import (
     LongTagger,
     scala_tagger,
@@ -94,8 +95,19 @@ def test_apply_tags(mock_apply_tags_docker, mock_apply_tags_docker_runner, mock_
     t = Tagging("pyspark-notebook:2025-09-22", "ghcr.io", "owner", "arm64")
     t.apply_tags()
 
-    # Check docker["tag", ...] was called with the right args
-    docker_calls = [str(args) for args, _ in mock_apply_tags_docker.__getitem__.call_args_list]
-    assert any("pyspark-notebook" in call for call in docker_calls)
-    assert any("tag1" in call for call in docker_calls)
+    # Check the image was tagged through the Docker API with the right args
+    mock_apply_tags_docker.images.get.assert_called_once_with("ghcr.io/owner/pyspark-notebook:2025-09-22-arm64")
+    mock_apply_tags_docker.images.get.return_value.tag.assert_called_once_with("ghcr.io/owner/pyspark-notebook", "tag1-arm64")
 
+
+def test_write_tags_file(tmp_path, mock_apply_tags_docker_runner, mock_get_taggers_and_manifests, mock_container):
+    """Test write_tags_file output."""
+    class FakeTagger:
+        def tag_value(self, container): return "tag1"
+
+    mock_get_taggers_and_manifests.return_value = ([FakeTagger()], [])
+
+    path = write_tags_file(Tagging("pyspark-notebook:2025-09-22", "ghcr.io", "owner", "arm64", version_probe=False), tmp_path)
+
+    assert path.name == "arm64-pyspark-notebook.txt"
+    assert path.read_text() == "ghcr.io/owner/pyspark-notebook:2025-09-22-arm64\nghcr.io/owner/pyspark-notebook:tag1-arm64"
@@ -0,0 +1,64 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from tagging.taggers import versions
+from okdp.extension.tagging.get_taggers_and_manifests import get_taggers_and_manifests
+from okdp.extension.tagging.taggers import LongTagger, commit_sha_tagger, date_tagger, java_tagger, scala_tagger, spark_tagger
+from okdp.extension.tagging.version_probe import ProbedContainer, probe, probe_commands
+
+def test_probe_commands():
+    taggers = [
+        LongTagger(spark_tagger, versions.python_tagger, java_tagger, scala_tagger),
+        LongTagger(spark_tagger, versions.python_major_minor_tagger, date_tagger, commit_sha_tagger),
+    ]
+
+    assert probe_commands(taggers) == [
+        "/bin/sh -c 'unset JDK_JAVA_OPTIONS && spark-submit --version'",
+        "python --version",
+        "/bin/sh -c 'unset JDK_JAVA_OPTIONS && java --version'",
+    ]
+
+def test_pyspark_taggers_in_a_single_exec(fake_container):
+    # Given: the pyspark-notebook taggers (the commit sha is not computed in the container)
+    taggers, _ = get_taggers_and_manifests("pyspark-notebook")
+    taggers = [tagger for tagger in taggers if commit_sha_tagger not in tagger.taggers]
+    container = fake_container()
+
+    # When:
+    probed_container = ProbedContainer.probe(container, taggers)
+    tag_values = [tagger.tag_value(probed_container) for tagger in taggers]
+
+    # Then: one exec for all the taggers, with the same tags as the one by one execs
+    assert len(container.execs) == 1
+    assert tag_values == [tagger.tag_value(fake_container()) for tagger in taggers]
+    assert "spark-3.5.6-python-3.11.13-java-17.0.16-scala-2.13.8-hub-5.3.0-lab-4.4.5" in tag_values
+
+def test_probe_script():
+    # Given: a container running the probe script on the host
+    container = SimpleNamespace(name="host", exec_run=lambda cmd: SimpleNamespace(exit_code=0, output=subprocess.run([sys.executable, *cmd[1:]], capture_output=True).stdout))
+
+    snapshot = probe(container, ["echo 3.11", "echo error >&2; exit 3"])
+
+    assert snapshot == {"echo 3.11": {"exit_code": 0, "output": "3.11\n"}, "echo error >&2; exit 3": {"exit_code": 3, "output": "error\n"}}
+
+def test_probe_failure_falls_back_to_exec():
+    container = SimpleNamespace(name="no-python", exec_run=lambda cmd: SimpleNamespace(exit_code=127, output=b"python: not found"))
+
+    assert probe(container, ["python --version"]) == {}
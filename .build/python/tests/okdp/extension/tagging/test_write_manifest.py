@@ -0,0 +1,47 @@
+#
+# Copyright 2026 The OKDP Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+from types import SimpleNamespace
+
+from tagging.manifests.manifest_interface import MarkdownPiece
+from okdp.extension.tagging.write_manifest import Manifest
+
+def slow_manifest(name: str, seconds: float):
+    def manifest(container) -> MarkdownPiece:
+        output = container.exec_run(f"sleep {seconds}; echo {name}").output.decode()
+        return MarkdownPiece(title=f"## {name}", sections=[output])
+    manifest.__name__ = f"{name}_manifest"
+    return manifest
+
+def test_sections_collected_concurrently_in_order():
+    # Given: a container whose commands take the given seconds
+    def exec_run(cmd):
+        time.sleep(float(cmd.split()[1].rstrip(";")))
+        return SimpleNamespace(exit_code=0, output=cmd.split()[-1].encode())
+    container = SimpleNamespace(name="slow", exec_run=exec_run)
+    manifests = [slow_manifest("julia", 0.3), slow_manifest("spark", 0.3), slow_manifest("apt", 0.0)]
+    manifest = Manifest("datascience-notebook:latest", "ghcr.io", "okdp", "amd64", "OKDP/jupyterlab-docker", max_workers=3)
+
+    # When:
+    start = time.perf_counter()
+    sections = manifest.get_sections(container, manifests)
+
+    # Then: the sections overlap, in the manifests order, each one timed
+    assert time.perf_counter() - start < 0.55
+    assert sections == ["## julia\n\njulia", "## spark\n\nspark", "## apt\n\napt"]
+    assert set(manifest.timings) == {"julia_manifest", "spark_manifest", "apt_manifest", "total"}
+    assert manifest.timings["julia_manifest"] >= 0.3